@@ -279,10 +279,20 @@ SETTINGS: dict[str, dict[str, list[dict]] | pulse.Impact | bool | str] = {
     # ----------------------------------------------------------------------------------------------
     # indicator
     #
-    # This parameter defines which lca indicator is used for the lca calculation.
+    # This parameter defines which lca indicator is used for the lca calculation. It can also be a
+    # list of indicators (e.g. list(pulse.Impact) for all of them), which are all calculated in one
+    # run. The first one is used for the graphs, all of them are put into the result table.
     # ----------------------------------------------------------------------------------------------
     'indicator': pulse.Impact.GWP100_FOSSIL,
     # ----------------------------------------------------------------------------------------------
+    # prospectives
+    #
+    # This parameter lists prospective LCA databases (e.g. ['SSP2-NDC', 'SSP2-PkBudg500']) the lca
+    # is calculated with in addition to the one of the scenario. The flows are only calculated once
+    # and characterized with every database, the result table names it in the prospective column.
+    # ----------------------------------------------------------------------------------------------
+    'prospectives' : None,
+    # ----------------------------------------------------------------------------------------------
     # reload
     #
     # This parameter can be set to true if you want to recompute all pre calculations (construction
@@ -297,14 +307,92 @@ SETTINGS: dict[str, dict[str, list[dict]] | pulse.Impact | bool | str] = {
     # ----------------------------------------------------------------------------------------------
     'clear_output' : True,
     # ----------------------------------------------------------------------------------------------
+    # workers
+    #
+    # This parameter sets the number of processes the scenarios are calculated on in parallel. If it
+    # isnt specified, the number of cpu cores (at most one per scenario) is used.
+    # ----------------------------------------------------------------------------------------------
+    'workers' : None,
+    # ----------------------------------------------------------------------------------------------
+    # output_folder
+    #
+    # This parameter sets the folder of the log, the model cache, the table, the streams and the
+    # checkpoints, the output folders below are then inside of it. Runs that are started at the
+    # same time need a folder each, otherwise they overwrite each other's files. The graphs are
+    # always stored in output. If it isnt specified, output is used.
+    # ----------------------------------------------------------------------------------------------
+    'output_folder' : None,
+    # ----------------------------------------------------------------------------------------------
+    # cache
+    #
+    # This parameter can be set to false if the compiled model (products, components, buildings and
+    # scenarios) should not be stored in and loaded from output/.cache. The cache gets rebuilt
+    # automatically as soon as one of the input files changes.
+    # ----------------------------------------------------------------------------------------------
+    'cache' : True,
+    # ----------------------------------------------------------------------------------------------
+    # table
+    #
+    # This parameter exports all results as one long format table to output/table. It can be set
+    # to 'parquet' (needs pyarrow), 'npz' or 'csv', or to True, which uses parquet if pyarrow is
+    # installed and npz otherwise. If it isnt specified, no table is exported.
+    # ----------------------------------------------------------------------------------------------
+    'table' : None,
+    # ----------------------------------------------------------------------------------------------
+    # stream
+    #
+    # This parameter can be set to true if the results of every simulated year should be written
+    # to output/stream as soon as the year is calculated, instead of keeping all years of all
+    # scenarios in memory. The outputs then read the scenarios back one after the other. This
+    # helps with long horizons and the product detail.
+    # ----------------------------------------------------------------------------------------------
+    'stream' : False,
+    # ----------------------------------------------------------------------------------------------
+    # checkpoint
+    #
+    # This parameter stores the complete simulation state (the building stock and the construction
+    # statistics) in output/checkpoints. If it is set to true, the state is stored after every year
+    # and only the latest checkpoint of a scenario is kept, so a crashed run can be resumed. If it
+    # is a list of years, e.g. [2030, 2040], the state is stored after each of them.
+    # ----------------------------------------------------------------------------------------------
+    'checkpoint' : None,
+    # ----------------------------------------------------------------------------------------------
+    # resume
+    #
+    # This parameter resumes the scenarios from a checkpoint instead of starting from the stock in
+    # Buildings_list.csv. If it is set to true, the latest checkpoint of every scenario is used. It
+    # can also be a dictionary of scenario names and checkpoint files, e.g.
+    # {'Policy 2030': 'output/checkpoints/Baseline-2040.ckpt'}. Only the years after the checkpoint
+    # are calculated and put out.
+    # ----------------------------------------------------------------------------------------------
+    'resume' : None,
+    # ----------------------------------------------------------------------------------------------
+    # fork
+    #
+    # This parameter can be set to false if every scenario should be calculated on its own. By
+    # default the years in which scenarios have the same parameters (e.g. until a policy starts in
+    # 2030) are calculated once and the building stock is then forked for every scenario.
+    # ----------------------------------------------------------------------------------------------
+    'fork' : True,
+    # ----------------------------------------------------------------------------------------------
+    # scenarios
+    #
+    # This parameter can be set to a list of scenario names if only these scenarios of the
+    # Scenarios_list.csv should be calculated. By default all scenarios are calculated.
+    # ----------------------------------------------------------------------------------------------
+    'scenarios' : None,
+    # ----------------------------------------------------------------------------------------------
     # version
     #
     # This parameter can be set to true if you want to remove all old outputs.
     # ----------------------------------------------------------------------------------------------
     'version' : 'AT - 1.0'
 }
-buildingStockCalculation = pulse.BuildingStockCalculations(
-    pulse.fileLocations,
-    **SETTINGS
-)
-buildingStockCalculation.run(multi_threaded_=False)
+# The worker processes import this file again when they are spawned (macOS and Windows), so the
+# calculation is only started when the file is run.
+if __name__ == "__main__":
+    buildingStockCalculation = pulse.BuildingStockCalculations(
+        pulse.fileLocations,
+        **SETTINGS
+    )
+    buildingStockCalculation.run(multi_threaded_=False)
@@ -7,6 +7,7 @@ Other contributors: See README.md
 License: See LICENSE.md
 """
 
-from .pulse import BuildingStockCalculations
+from .pulse import BuildingStockCalculations, compute
 from .pulse import fileLocations
 from .support import calculation, calc_historic_construction, calc_future_demolition, Impact
+from .support import load_result
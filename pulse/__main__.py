@@ -0,0 +1,144 @@
+"""
+__main__.py
+-----------
+
+Author: Benedict Schwark 
+Supervision: Nicolas Alaux
+Other contributors: See README.md
+License: See LICENSE.md
+
+Description:
+    This file is the non-interactive command line interface, e.g.
+    python -m pulse --scenario Baseline --output numbers energy --workers 4 --table csv
+    python -m pulse --scenarios-file /batch/7/Scenarios_list.csv --output-folder /batch/7/output
+    It runs the calculations headless, exports the results as one long format table and prints
+    the names of the written files, one per line. The exit status is 1 if a scenario failed.
+
+"""
+
+#---------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+#---------------------------------------------------------------------------------------------------
+import argparse
+import sys
+
+#---------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+#---------------------------------------------------------------------------------------------------
+from .pulse import BuildingStockCalculations, fileLocations
+from .support import Impact, FORMATS
+
+#---------------------------------------------------------------------------------------------------
+# Definitions
+#---------------------------------------------------------------------------------------------------
+OUTPUTS = ("numbers", "products", "energy", "lca", "compare")
+
+#---------------------------------------------------------------------------------------------------
+# Functions
+#---------------------------------------------------------------------------------------------------
+def parser() -> argparse.ArgumentParser:
+    """This function defines the arguments of the command line interface."""
+    parser_ = argparse.ArgumentParser(
+        prog="python -m pulse",
+        description="Runs the PULSE building stock calculations without any terminal output."
+    )
+    inputs = parser_.add_argument_group(
+        "input files", "Relative paths are taken from the input folder."
+    )
+    # The suffix keeps --scenarios-file apart from the scenario selection -s/--scenario
+    for kind, title in fileLocations.items():
+        inputs.add_argument(f"--{kind.lower()}-file", default=title, metavar="FILE", dest=kind)
+
+    parser_.add_argument(
+        "-s", "--scenario", action="append", dest="scenarios", metavar="NAME",
+        help="A scenario that gets calculated, can be repeated. Defaults to all scenarios."
+    )
+    parser_.add_argument(
+        "-o", "--output", nargs="+", choices=OUTPUTS, default=["numbers"],
+        help="The output types that get calculated. Defaults to numbers."
+    )
+    parser_.add_argument(
+        "--output-folder", default=None, metavar="DIR",
+        help="The folder of the log, the model cache, the table, the streams and the checkpoints. "
+             "Runs at the same time need a folder each. Defaults to output."
+    )
+    parser_.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="The number of worker processes. Defaults to the number of cpu cores."
+    )
+    parser_.add_argument(
+        "--sequential", action="store_true",
+        help="Calculates the scenarios one after the other in this process."
+    )
+    parser_.add_argument(
+        "--indicator", nargs="+", choices=[impact.name for impact in Impact] + ["all"],
+        default=[Impact.GWP100.name],
+        help="The lca indicators, 'all' calculates every indicator in one run. Defaults to GWP100."
+    )
+    parser_.add_argument(
+        "--prospective", nargs="+", default=None, dest="prospectives", metavar="NAME",
+        help="Prospective lca databases the flows are characterized with in the same run."
+    )
+    parser_.add_argument(
+        "--table", choices=FORMATS, default=None,
+        help="The format of the result table. Defaults to parquet if pyarrow is installed."
+    )
+    parser_.add_argument(
+        "--stream", action="store_true",
+        help="Streams the results of every year to the stream folder of the output folder instead "
+             "of keeping them in memory."
+    )
+    parser_.add_argument(
+        "--checkpoint", nargs="*", type=int, default=None, metavar="YEAR",
+        help="Stores the state after the given years, or after every year if none are given."
+    )
+    parser_.add_argument(
+        "--resume", action="store_true",
+        help="Resumes every scenario from its latest checkpoint."
+    )
+    parser_.add_argument(
+        "--no-fork", action="store_false", dest="fork",
+        help="Calculates every scenario on its own instead of forking the common years."
+    )
+    parser_.add_argument("--no-cache", action="store_false", dest="cache")
+    parser_.add_argument("--reload", action="store_true", help="Recalculates the statistics.")
+    parser_.add_argument("--debug", action="store_true", help="Logs debug information.")
+    return parser_
+
+def main(argv: list[str] | None = None) -> int:
+    """This function runs the command line interface and returns the exit status."""
+    args = parser().parse_args(argv)
+    # No years store a checkpoint after every year
+    checkpoint = args.checkpoint if args.checkpoint else args.checkpoint is not None
+    indicators = list(Impact) if "all" in args.indicator else [Impact[name] for name in args.indicator]
+    calculations = BuildingStockCalculations(
+        {kind: getattr(args, kind) for kind in fileLocations},
+        output=dict.fromkeys(args.output, True),
+        scenarios=args.scenarios,
+        output_folder=args.output_folder,
+        workers=args.workers,
+        indicator=indicators if len(indicators) > 1 else indicators[0],
+        prospectives=args.prospectives,
+        stream=args.stream,
+        checkpoint=checkpoint,
+        resume=args.resume,
+        fork=args.fork,
+        cache=args.cache,
+        reload=args.reload,
+        debug=args.debug,
+        headless=True
+    )
+    try:
+        calculations.run(multi_threaded_=not args.sequential)
+    except (KeyboardInterrupt, SystemExit):
+        sys.exit(-1)
+    print(calculations.export_table(args.table))
+    if args.stream:
+        # Forked scenarios share the streams of their common years
+        streams = [name for data in calculations.results.values() for name in data.get("stream", [])]
+        for file_name in dict.fromkeys(streams):
+            print(file_name)
+    return 1 if calculations.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
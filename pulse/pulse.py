@@ -16,20 +16,27 @@ Description:
 #---------------------------------------------------------------------------------------------------
 # Imports Global Libraries
 #---------------------------------------------------------------------------------------------------
-import copy
+import gc
 import logging
+import multiprocessing
 import os
+import signal
 import threading
 import time
 import sys
 import glob
+import copy
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 #---------------------------------------------------------------------------------------------------
 # Imports Local Libraries
 #---------------------------------------------------------------------------------------------------
-from .support import calculation, calc_historic_construction, calc_future_demolition, import_data
+from .support import calculation_branch, calc_historic_construction, calc_future_demolition
+from .support import import_data
+from .support import export_table, StreamSink, load_result, ScenarioNode, build_scenario_tree
+from .support import Checkpoints, latest_checkpoint, read_header, read_checkpoint
 
-from .support import Graph, Impact, Loading, Logo, Detail
+from .support import Impact, Loading, Logo, Detail, Catalog, terminal_width
 
 from .support import PROGRESS_BAR, GRAPH_OPTIONS
 
@@ -44,19 +51,25 @@ fileLocations = {
     "Scenarios" : "Scenarios_list.csv"
 }
 
+OUTPUT_FOLDER = "output"
+
 DEBUG_MSG = "Debug Information is deactivated. To activate it, write 'debug' in the cmd line args"
 
+CATALOGS: tuple[Catalog, Catalog] | None = None
+
 #---------------------------------------------------------------------------------------------------
 # Functions
 #---------------------------------------------------------------------------------------------------
-def init_logging(debug: bool = False) -> None:
-    """This function initiates the debugger."""
+def init_logging(debug: bool = False, filemode: str = 'w', folder: str = OUTPUT_FOLDER) -> None:
+    """This function initiates the debugger, which logs to the output folder. The handlers of an
+    earlier run are replaced, so every run logs to its own output folder."""
     logging.basicConfig(
         level=logging.DEBUG if debug else logging.INFO,
-        format='%(asctime)s - [Thread ID: %(thread)d] %(levelname)s - %(message)s',
+        format='%(asctime)s - [Process ID: %(process)d, Thread ID: %(thread)d] %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S',
-        filename='output/buildingStockModel.log',
-        filemode='w'
+        filename=f'{folder}/buildingStockModel.log',
+        filemode=filemode,
+        force=True
     )
 
     ignored = ["matplotlib"]
@@ -77,21 +90,88 @@ def init_logging(debug: bool = False) -> None:
 
     logging.Logger.thread = thread # type: ignore
 
+def init_worker(
+    debug: bool = False,
+    catalogs: tuple[Catalog, Catalog] | None = None,
+    folder: str = OUTPUT_FOLDER
+) -> None:
+    """This function initiates a worker process of the scenario calculations.\n
+    The workers ignore keyboard interrupts, those are handled by the main process, which then stops
+    the workers. The product and building catalogs are handed over once per worker and shared by
+    all the scenarios it calculates. Spawned workers log to the log file of the output folder."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if not logging.getLogger().handlers:
+        init_logging(debug, filemode='a', folder=folder)
+    global CATALOGS
+    CATALOGS = catalogs
+
+def calculate_node(catalogs, node: ScenarioNode, settings, state: bytes | None = None) -> tuple:
+    """This function calculates a node of the scenario tree and returns its results and the state
+    its children are forked from. If the results are streamed, only the file name is returned."""
+    result = {}
+    state = calculation_branch(
+        catalogs,
+        node,
+        result,
+        settings.detail,
+        settings.indicators if settings.indicators else settings.indicator,
+        state=state,
+        sink=StreamSink(result, f"{settings.folder}/stream") if settings.stream else None,
+        checkpoints=settings.checkpoints,
+        prospectives=settings.prospectives
+    )
+    return result, state
+
+def run_node(node: ScenarioNode, settings, state: bytes | None = None) -> tuple:
+    """This function calculates a node of the scenario tree in a worker process."""
+    assert CATALOGS is not None, "The worker was not initialized with the catalogs"
+    return calculate_node(CATALOGS, node, settings, state)
+
+def init_checkpoints(setting, folder: str = OUTPUT_FOLDER) -> Checkpoints | None:
+    """This function turns the checkpoint setting into the checkpoints of the calculation. True
+    stores the state after every year (only the latest one is kept), a list of years stores it
+    after each of them. The checkpoints are stored in the checkpoints folder of the output folder."""
+    if not setting:
+        return None
+    return Checkpoints(None if setting is True else setting, f"{folder}/checkpoints")
+
+def resume_file(setting, scenario, folder: str = OUTPUT_FOLDER) -> str | None:
+    """This function returns the checkpoint a scenario is resumed from. The setting is either
+    True, which uses the latest checkpoint of every scenario in the output folder, or a dictionary
+    of scenario names and checkpoint files."""
+    if not setting:
+        return None
+    if setting is not True:
+        return setting.get(scenario.name)
+    file_name = latest_checkpoint(scenario.name, f"{folder}/checkpoints")
+    if file_name is None or read_header(file_name)["year"] + 1 not in scenario.years:
+        logging.info("There is no checkpoint to resume scenario '%s' from", scenario.name)
+        return None
+    return file_name
+
+def select_scenarios(scenarios: dict, names: str | list[str] | None = None) -> dict:
+    """This function returns the scenarios that get calculated. If names are given, only these
+    scenarios are calculated, in the order of the scenario list."""
+    if not names:
+        return scenarios
+    names = [names] if isinstance(names, str) else list(names)
+    missing = [name for name in names if name not in scenarios]
+    assert not missing, f"The scenarios {missing} are not in the scenario list: {list(scenarios)}"
+    return {name: scenario for name, scenario in scenarios.items() if name in names}
+
 def init_statistics(reload: bool = False) -> None:
-    """This function initiates the statistics."""
-    reload_message = ' because they were not available' if not reload else ''
-    if(reload or not os.path.isfile("statistics/constructionStatistic.json")):
-        calc_historic_construction()
+    """This function initiates the statistics. They are recalculated if reload is set or if their
+    parameters or input files changed since they were generated."""
+    reload_message = ' because they were outdated or not available' if not reload else ''
+    if calc_historic_construction(reload=reload):
         logging.info("Reloaded the historic construction statistics%s.", reload_message)
-    if(reload or not os.path.isfile("statistics/weibull.json")):
-        calc_future_demolition()
-        logging.info("Reloaded the future deconstruction statistics %s.", reload_message)
+    if calc_future_demolition(reload=reload):
+        logging.info("Reloaded the future deconstruction statistics%s.", reload_message)
 
 def init_logo(version: str = "UNDEFINED") -> None:
     """This function initiates the logo."""
     Logo.home()
-    terminal_width, _ = os.get_terminal_size()
-    print(f"Version: {version}".center(terminal_width))
+    print(f"Version: {version}".center(terminal_width()))
     print()
 
 def create_folder(folder, subfolders):
@@ -107,8 +187,9 @@ def create_folder(folder, subfolders):
             else:
                 create_folder(subfolder, subsubfolders)
 
-def create_directory() -> None:
-    """This function creates the folder structure necessary for the outputs."""
+def create_directory(folder: str = OUTPUT_FOLDER) -> None:
+    """This function creates the folder structure necessary for the outputs. The graphs and their
+    csv files are always stored in the output folder of the working directory."""
     STRUCTURE = {
         'output' : {
             'csv' : None, 
@@ -117,6 +198,7 @@ def create_directory() -> None:
     }
 
     create_folder(None, STRUCTURE)
+    create_folder(folder, None)
 
 def remove_old_files(remove: bool = False) -> None:
     """This function clears the output folder."""
@@ -153,20 +235,20 @@ def wait_icon() -> None:
                 if b == 1 else Loading.DONE.value
                 if b == 2 else Loading.EMPTY.value
             }"
-        terminal_width, _ = os.get_terminal_size()
+        width = terminal_width()
         a = a.strip()
-        print(f"\r{a.center(terminal_width)}",end="", flush=True)
+        print(f"\r{a.center(width)}",end="", flush=True)
         time.sleep(0.5)
         t = t + 1 if t != 3 else 0
     if isinstance(PROGRESS_BAR, list):
         for x in Loading.LOADING.value:
             a = a.replace(x, Loading.DONE.value)
-        print(f"\r{a.center(terminal_width)}",end="\n", flush=True)
+        print(f"\r{a.center(width)}",end="\n", flush=True)
     if isinstance(PROGRESS_BAR, bool):
         print(f"\033[{1}A", end='')
         for x in Loading.LOADING.value:
             a = a.replace(x, Loading.FAILED.value)
-        print(f"\r{a.center(terminal_width)}",end="\n", flush=True)
+        print(f"\r{a.center(width)}",end="\n", flush=True)
 
 #---------------------------------------------------------------------------------------------------
 # Classes
@@ -177,12 +259,33 @@ class BuildingStockSettings:
             self,
             indicator,
             detail,
-            output
+            output,
+            workers = None,
+            table = None,
+            stream = False,
+            checkpoint = None,
+            resume = None,
+            fork = True,
+            prospectives = None,
+            folder = OUTPUT_FOLDER
         ):
         """This function initiates the BuildingStockSettings"""
-        self.indicator = indicator
+        # Several indicators are calculated in one run, the first one is used for the graphs
+        self.indicators = tuple(indicator) if isinstance(indicator, (list, tuple)) else None
+        self.indicator = self.indicators[0] if self.indicators else indicator
         self.detail = detail
         self.output = output
+        self.workers = workers
+        self.table = table
+        self.stream = stream
+        # The folder of the log, the model cache, the table, the streams and the checkpoints
+        self.folder = folder
+        self.checkpoints = init_checkpoints(checkpoint, folder)
+        self.resume = resume
+        self.fork = fork
+        # The flows are characterized with these prospective scenarios as well
+        prospectives = [prospectives] if isinstance(prospectives, str) else prospectives
+        self.prospectives = tuple(dict.fromkeys(prospectives)) if prospectives else ()
     def __repr__(self) -> str:
         return "BuildingStockSettings"
     def __bool__(self) -> bool:
@@ -202,6 +305,7 @@ class BuildingStockData:
         self.components = components
         self.buildings = buildings
         self.scenarios = scenarios
+        self.catalogs = (Catalog(products), Catalog(buildings))
     def __repr__(self) -> str:
         return "BuildingStockData"
     def __bool__(self) -> bool:
@@ -215,13 +319,19 @@ class BuildingStockCalculations:
             /,
             **kwargs
         ) -> None:
-        """This function initializes the calculations class."""
+        """This function initializes the calculations class. If the setting headless is set, nothing
+        is printed and no graphs are made, so it runs without a terminal (e.g. in cron jobs or
+        containers) and without the graphing libraries."""
 
         assert "output" in kwargs, "Output not in settings. Calculation stopped."
-        create_directory()
-        init_logging('debug' in sys.argv)
+        self.headless = kwargs['headless'] if 'headless' in kwargs else False
+        self.debug = kwargs['debug'] if 'debug' in kwargs else 'debug' in sys.argv
+        folder = kwargs['output_folder'] if kwargs.get('output_folder') else OUTPUT_FOLDER
+        create_directory(folder)
+        init_logging(self.debug, folder=folder)
         init_statistics(kwargs['reload'] if 'reload' in kwargs else False)
-        init_logo(kwargs['version'] if 'version' in kwargs else "UNDEFINED")
+        if not self.headless:
+            init_logo(kwargs['version'] if 'version' in kwargs else "UNDEFINED")
 
 
         remove_old_files(kwargs['clear_output'] if 'clear_output' in kwargs else False)
@@ -229,95 +339,248 @@ class BuildingStockCalculations:
         self.settings =     BuildingStockSettings(
             indicator = kwargs['indicator'] if 'indicator' in kwargs else Impact.GWP100,
             detail =    detail_requirement(kwargs['output']),
-            output =    kwargs['output']
+            output =    kwargs['output'],
+            workers =   kwargs['workers'] if 'workers' in kwargs else None,
+            table =     kwargs['table'] if 'table' in kwargs else None,
+            stream =    kwargs['stream'] if 'stream' in kwargs else False,
+            checkpoint = kwargs['checkpoint'] if 'checkpoint' in kwargs else None,
+            resume =    kwargs['resume'] if 'resume' in kwargs else None,
+            fork =      kwargs['fork'] if 'fork' in kwargs else True,
+            prospectives = kwargs['prospectives'] if 'prospectives' in kwargs else None,
+            folder =    folder
         )
 
         self.data =         BuildingStockData(
             *import_data(
                 **file_locations,
-                detail=self.settings.detail
+                detail=self.settings.detail,
+                cache=kwargs['cache'] if 'cache' in kwargs else True,
+                cache_location=f"{folder}/.cache"
             )
         )
 
+        self.data.scenarios = select_scenarios(
+            self.data.scenarios, kwargs['scenarios'] if 'scenarios' in kwargs else None
+        )
         self.results =      {scenario_name:{} for scenario_name in self.data.scenarios}
+        self.failed: list[str] = []
         self.loading_icon = threading.Thread(target=wait_icon)
-        self.threads =      {f'Thread {nr} - {scenario_name}':
-                                threading.Thread (
-                                target=calculation,
-                                args=(
-                                    (
-                                        copy.deepcopy(self.data.products),
-                                        copy.deepcopy(self.data.buildings)
-                                    ),
-                                    scenario,
-                                    self.results[scenario_name],
-                                    copy.deepcopy(self.settings.detail),
-                                    copy.deepcopy(self.settings.indicator)),
-                                name=f'{nr}'
-                            ) for nr, (scenario_name, scenario)
-                            in enumerate(self.data.scenarios.items())
-                            }
-        thread_message = 'Threads' if len(self.threads) > 1 else 'Thread'
-        logging.getLogger(__name__).thread("%d %s prepared for calculation", len(self.threads), thread_message)
-
-    def run(self, multi_threaded_: bool = True) -> None:
+        scenario_message = 'Scenarios' if len(self.results) > 1 else 'Scenario'
+        logging.getLogger(__name__).thread("%d %s prepared for calculation", len(self.results), scenario_message)
+
+    def run(self, multi_threaded_: bool = True, workers: int | None = None) -> None:
         """This functions runs the different scenarios for the Building Stock Calculation class. \n
         For debugging purposses: \n
-        multi_threaded_ (bool): Setting Variable that specifies weather the programm should run on 
-                                multiple threads. Defaults to True."""
+        multi_threaded_ (bool): Setting Variable that specifies weather the programm should run the
+                                scenarios in parallel worker processes. Otherwise they are
+                                calculated one after the other in this process. Defaults to True.
+        workers (int | None):   The number of worker processes. Defaults to the workers setting or
+                                the number of cpu cores."""
         global PROGRESS_BAR
-        PROGRESS_BAR = [0 for _ in range(len(self.threads) + 2)]
+        PROGRESS_BAR = [0 for _ in range(len(self.results) + 2)]
         PROGRESS_BAR[0] = 1
 
         try:
-            self.loading_icon.start()
+            if not self.headless:
+                self.loading_icon.start()
             PROGRESS_BAR[0] = 2
 
             if not multi_threaded_:
-                thread_message = 'Threads in a row' if len(self.threads) > 1 else 'Thread'
-                logging.getLogger(__name__).thread("Starting %d %s",len(self.threads), thread_message)
-                for nr,thread in  enumerate(self.threads.values()):
-                    PROGRESS_BAR[nr+1] = 1
-                    thread.start()
-                    logging.getLogger(__name__).thread("Started Thread %d", nr)
-                    thread.join()
-                    logging.getLogger(__name__).thread("Joined Thread %d", nr)
-                    PROGRESS_BAR[nr+1] = 2
+                self.run_sequential()
 
             if multi_threaded_:
-                thread_message = 'Threads in parallel' if len(self.threads) > 1 else 'Thread'
-                logging.getLogger(__name__).thread("Starting %d %s",len(self.threads), thread_message)
-                for nr,thread in  enumerate(self.threads.values()):
-                    PROGRESS_BAR[nr+1] = 1
-                    thread.start()
-                    logging.getLogger(__name__).thread("Started Thread %d", nr)
-                logging.info("%d THREADS STARTED", nr+1)
-                for nr, thread in enumerate(self.threads.values()):
-                    thread.join()
-                    PROGRESS_BAR[nr+1] = 2
-                    logging.getLogger(__name__).thread("Joined Thread %d", nr)
-                logging.getLogger(__name__).thread("%d THREADS JOINED", nr+1)
+                self.run_processes(workers if workers else self.settings.workers)
 
             logging.info("Calculations finished")
             PROGRESS_BAR[-1] = 1
-            self.output()
+            if not self.headless:
+                self.output()
+            if self.settings.table:
+                self.export_table(self.settings.table if isinstance(self.settings.table, str) else None)
             PROGRESS_BAR[-1] = 2
-            self.loading_icon.join()
-            Logo.done()
+            if not self.headless:
+                self.loading_icon.join()
+                Logo.done()
             logging.info("Programm terminated gracefully!")
 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, SystemExit):
             logging.critical("Got interrupted")
             PROGRESS_BAR = False
+            if self.headless:
+                # Library callers and the command line interface handle the interrupt themselves
+                raise
             self.loading_icon.join()
             Logo.error()
             sys.exit(-1)
 
+    def run_sequential(self) -> None:
+        """This function calculates the scenarios one after the other in this process. The results
+        get stored in self.results, failed scenarios are logged and keep an empty result."""
+        logging.getLogger(__name__).thread("Calculating %d scenarios in a row", len(self.results))
+        failed = []
+        todo = list(reversed(self.plan()))
+        while todo:
+            node, state = todo.pop()
+            self.start_node(node)
+            try:
+                result, state = calculate_node(self.data.catalogs, node, self.settings, state)
+            except Exception as error:
+                # The children of a failed node are skipped, they fail with it
+                self.fail_node(node, error, failed)
+                continue
+            self.finish_node(node, result)
+            todo += [(child, state) for child in reversed(node.children)]
+        self.report_failed(failed)
+
+    def run_processes(self, workers: int | None = None) -> None:
+        """This function calculates the scenarios in parallel worker processes. The results get
+        stored in self.results, failed scenarios are logged and keep an empty result."""
+        workers = min(workers if workers else os.cpu_count() or 1, len(self.results))
+        workers = max(workers, 1)
+        logging.getLogger(__name__).thread("Starting %d scenarios on %d processes", len(self.results), workers)
+
+        # The catalogs are passed once per worker. Freezing the garbage collector keeps it from
+        # touching the shared objects, so forked workers do not copy their memory pages.
+        gc.freeze()
+        failed = []
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_worker,
+                initargs=(self.debug, self.data.catalogs, self.settings.folder)
+            ) as executor:
+                # The children of a node of the scenario tree are submitted as soon as it is done,
+                # each of them with a copy of its final state
+                pending = {}
+                def submit(node: ScenarioNode, state: bytes | None) -> None:
+                    pending[executor.submit(run_node, node, self.settings, state)] = node
+                    self.start_node(node)
+
+                for node, state in self.plan():
+                    submit(node, state)
+
+                try:
+                    while pending:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            node = pending.pop(future)
+                            try:
+                                result, state = future.result()
+                            except (Exception, SystemExit) as error:
+                                self.fail_node(node, error, failed)
+                                continue
+                            self.finish_node(node, result)
+                            for child in node.children:
+                                submit(child, state)
+                except KeyboardInterrupt:
+                    logging.critical("Got interrupted, stopping %d worker processes", workers)
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    for process in multiprocessing.active_children():
+                        process.terminate()
+                    raise
+        finally:
+            # Also after errors and interrupts, so library callers keep a working collector
+            gc.unfreeze()
+
+        self.report_failed(failed)
+
+    def fail_node(self, node: ScenarioNode, error: BaseException, failed: list[str]) -> None:
+        """This function marks the scenarios of a failed node as failed and done. Their results
+        are cleared, so they keep an empty result."""
+        failed += node.names
+        for scenario_name in node.names:
+            self.results[scenario_name].clear()
+            PROGRESS_BAR[self.progress[scenario_name]] = 2
+        logging.error("%s failed: %s", node, repr(error), exc_info=error)
+
+    def report_failed(self, failed: list[str]) -> None:
+        """This function stores and logs the failed scenarios of a run."""
+        self.failed = failed
+        if failed:
+            logging.error("%d of %d scenarios failed: %s", len(failed), len(self.results), ", ".join(failed))
+
+    def plan(self) -> list[tuple[ScenarioNode, bytes | None]]:
+        """This function returns the nodes the calculation starts with, together with the state
+        they start from. The scenarios that start from the stock are arranged in a scenario tree,
+        so the years they have in common are only calculated once. A resumed scenario is a node
+        of its own that starts from its checkpoint."""
+        self.progress = {scenario_name: nr + 1 for nr, scenario_name in enumerate(self.results)}
+        nodes, scenarios = [], []
+        for scenario in self.data.scenarios.values():
+            file_name = resume_file(self.settings.resume, scenario, self.settings.folder)
+            if not file_name:
+                scenarios.append(scenario)
+                continue
+            header, state = read_checkpoint(file_name)
+            assert header["year"] + 1 in scenario.years, (
+                f"The checkpoint after {header['year']} does not fit the years of {scenario.name}"
+            )
+            years = [year for year in scenario.years if year > header["year"]]
+            nodes.append((ScenarioNode([scenario], years, root=False), state))
+
+        roots = (
+            build_scenario_tree(scenarios)
+            if self.settings.fork
+            else [ScenarioNode([scenario], list(scenario.years)) for scenario in scenarios]
+        )
+        total = sum(len(scenario.years) for scenario in scenarios)
+        calculated = sum(len(node.years) for root in roots for node in root.nodes())
+        if calculated < total:
+            logging.getLogger(__name__).thread(
+                "The scenarios share %d of %d years, they are calculated once",
+                total - calculated,
+                total
+            )
+        return [(root, None) for root in roots] + nodes
+
+    def start_node(self, node: ScenarioNode) -> None:
+        """This function marks the scenarios of a node as started."""
+        for scenario_name in node.names:
+            PROGRESS_BAR[self.progress[scenario_name]] = 1
+
+    def finish_node(self, node: ScenarioNode, result: dict) -> None:
+        """This function hands the results of a node to all of its scenarios. The first one gets
+        the results, the others a copy, so the scenarios never share any result objects."""
+        for nr, scenario_name in enumerate(node.names):
+            if "stream" in result:
+                self.results[scenario_name].setdefault("stream", []).append(result["stream"])
+            else:
+                for kind, years in result.items():
+                    self.results[scenario_name].setdefault(kind, {}).update(
+                        years if nr == 0 else copy.deepcopy(years)
+                    )
+        for scenario_name in set(node.names).difference(*(child.names for child in node.children)):
+            PROGRESS_BAR[self.progress[scenario_name]] = 2
+            logging.getLogger(__name__).thread("Finished scenario '%s'", scenario_name)
+
+    def export_table(self, format_: str | None = None) -> str:
+        """This function exports the results of all scenarios as one long format table (scenario,
+        year, result, stage, country, typology, component, product, index, impact, prospective,
+        value) to the table folder of the output folder and returns the file name.\n
+        format_ (str | None): 'parquet', 'npz' or 'csv'. Defaults to parquet if pyarrow is
+                              installed and to a compressed npz otherwise."""
+        indicators = self.settings.indicators if self.settings.indicators else ()
+        return export_table(
+            self.scenario_results(),
+            impact=self.settings.indicator.name,
+            impacts=[impact.name for impact in indicators],
+            location=f"{self.settings.folder}/table",
+            format_=format_
+        )
+
+    def scenario_results(self):
+        """This function yields the results of the scenarios one after the other. Streamed
+        scenarios are read back from their stream files, so only one of them is held in memory
+        at a time."""
+        for scenario, data in self.results.items():
+            yield scenario, load_result(data) if data else data
+
     def output(self) -> None:
         """This function deals with the output of the information, so the graphing and the csv 
         exporting."""
+        from .support import Graph # The graphing libraries are only imported for the output
         logging.info("Output started")
-        for scenario, data in self.results.items():
+        for scenario, data in self.scenario_results():
             if not data:
                 continue
             for type_ in self.settings.output:
@@ -336,7 +599,7 @@ class BuildingStockCalculations:
         if 'compare' in self.settings.output:
             if self.results[list(self.results.keys())[0]]:
                 temp_= Graph(
-                    self.results,
+                    dict(self.scenario_results()),
                     kind = 4,
                     buildings=self.data.buildings,
                     scenario="",
@@ -347,7 +610,8 @@ class BuildingStockCalculations:
         logging.info("Output finished")
 
 def detail_requirement(settings: dict) -> dict:
-    """This function calculates the detail requirement"""
+    """This function calculates the detail requirement. Output types that are missing in the
+    settings are not required."""
 
     requirements = {
         "numbers" : Detail.NO_CALC,
@@ -357,34 +621,67 @@ def detail_requirement(settings: dict) -> dict:
         "lca" : Detail.NO_CALC
     }
     
-    if settings['compare']:
+    if settings.get('compare'):
         logging.debug("Detail requirement: Compare")
         requirements["numbers"] = Detail.TYPOLOGY
         requirements["products"] = Detail.COMPONENT
         requirements["energy"] = Detail.PRODUCT
         requirements["lca"] = Detail.PRODUCT
 
-    elif settings['lca']:
+    elif settings.get('lca'):
         logging.debug("Detail requirement: LCA")
         requirements["numbers"] = Detail.TYPOLOGY
         requirements["products"] = Detail.COMPONENT
         requirements["energy"] = Detail.PRODUCT
         requirements["lca"] = Detail.PRODUCT
 
-    elif settings['energy']:
+    elif settings.get('energy'):
         logging.debug("Detail requirement: Energy")
         requirements["numbers"] = Detail.TYPOLOGY
-        if settings['products']:
+        if settings.get('products'):
             requirements["products"] = Detail.COMPONENT
         requirements["energy"] = Detail.PRODUCT
 
-    elif settings['products']:
+    elif settings.get('products'):
         logging.debug("Detail requirement: Products")
         requirements["numbers"] = Detail.TYPOLOGY
         requirements["products"] = Detail.COMPONENT
 
-    elif settings['numbers']:
+    elif settings.get('numbers'):
         logging.debug("Detail requirement: Numbers")
         requirements["numbers"] = Detail.TYPOLOGY
     
     return requirements
+
+def compute(file_locations: dict[str, str] | None = None, /, **kwargs) -> dict[str, dict]:
+    """This function is the library entry point for batch runs. It runs the calculations headless,
+    without the logo, the progress bar and the graphs, and returns the results of the scenarios.\n
+    file_locations (dict): The input files that differ from fileLocations. Relative paths are
+                           taken from the input folder, absolute paths are used as they are.\n
+    The settings are the same as in main.py, with a few additions:\n
+    scenarios (str | list[str]): The scenarios that get calculated. Defaults to all of them.
+    output (dict | list[str]): The output types, either as in main.py or just their names.
+                               Defaults to the numbers only.
+    output_folder (str): The folder of the log, the model cache, the table, the streams and the
+                         checkpoints. Defaults to output. Batches that run at the same time need
+                         a folder each, otherwise they overwrite each other's files.
+    multi_threaded (bool): If the scenarios are calculated in worker processes. Defaults to True.
+                           The workers import the calling script again if they are spawned
+                           (macOS, Windows), so scripts need an if __name__ == "__main__": guard
+                           around the call.\n
+    Scenarios that failed have empty results, interrupts are raised to the caller. If the results
+    are streamed, they stay in their files and every scenario only holds their names (see
+    load_result), e.g.
+    compute({'Scenarios': '/batch/7/Scenarios_list.csv'}, scenarios=['Baseline'], workers=4,
+            output_folder='/batch/7/output')"""
+    output = kwargs['output'] if 'output' in kwargs else ['numbers']
+    kwargs['output'] = output if isinstance(output, dict) else dict.fromkeys(output, True)
+    kwargs['headless'] = True
+    multi_threaded = kwargs.pop('multi_threaded', True)
+    calculations = BuildingStockCalculations(
+        {**fileLocations, **(file_locations if file_locations else {})}, **kwargs
+    )
+    calculations.run(multi_threaded_=multi_threaded)
+    if calculations.settings.stream:
+        return calculations.results
+    return dict(calculations.scenario_results())
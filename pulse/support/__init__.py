@@ -12,11 +12,21 @@ License: See LICENSE.md
 
 from .variables import PROGRESS_BAR, GRAPH_OPTIONS
 
-from .file_handling import export_csv, import_data
+from .file_handling import export_csv, export_table, import_data, FORMATS
+from .file_handling import StreamSink, load_result, Checkpoints, latest_checkpoint, read_header
+from .file_handling import read_checkpoint
 
 from .distributions import calc_historic_construction, calc_future_demolition
 
-from .calculation import calculation
-from .data_types import code
-from .file_handling import Graph
-from .variables import Impact, Loading, Logo, Detail
+from .calculation import calculation, calculation_branch
+from .data_types import code, Catalog, ScenarioNode, build_scenario_tree
+from .variables import Impact, Loading, Logo, Detail, terminal_width
+
+
+def __getattr__(name: str):
+    """This function imports the grapher the first time it is asked for."""
+    if name == "Graph":
+        from .file_handling.grapher import Graph
+
+        return Graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
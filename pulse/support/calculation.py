@@ -6,18 +6,20 @@ Supervision: Nicolas Alaux
 Other contributors: See README.md
 License: See LICENSE.md
 
+Description: This file groups the calculations of a scenario. Every simulated year flows through
+the numbers, products, recycling, energy and lca calculations and is then handed to a result sink,
+so only the stock and the results of one year need to be held by the calculation.
 """
 
 # --------------------------------------------------------------------------------------------------
 # Imports Global Libraries
 # --------------------------------------------------------------------------------------------------
 import logging
-import sys
 
 # --------------------------------------------------------------------------------------------------
 # Imports Local Libraries
 # --------------------------------------------------------------------------------------------------
-from .data_types import StockItem
+from .data_types import StockItem, CalculationContext
 from .variables import Detail, Impact
 from .calculations.total import total_buildings, calc_volume
 from .calculations.demolitions import calc_demolitions
@@ -32,8 +34,11 @@ from .calculations.energy import (
     calc_water,
     calc_electricity,
 )
-from .calculations.life_cycle_assessment import calc_lca
+from .calculations.life_cycle_assessment import calc_lca, select_impact
 from .data_types.scenario import Scenario
+from .data_types.scenario_tree import ScenarioNode
+from .file_handling.result_sink import ResultSink, MemorySink
+from .file_handling.checkpoint import Checkpoints, read_checkpoint, dump_state, load_state
 
 # --------------------------------------------------------------------------------------------------
 # Definitions
@@ -46,157 +51,235 @@ TYPE_ERROR_MESSAGE = "Wrong type in function {}. Is {} but should be {}!"
 # --------------------------------------------------------------------------------------------------
 
 
-def calc_all_numbers(
-    stock: dict, scenario: Scenario, detail: Detail
+def calc_year_numbers(
+    stock: dict, scenario: Scenario, year: int, detail: Detail, context: CalculationContext
 ) -> tuple[dict, dict]:
-    """This function computes all the number related calculations."""
-    logging.info("Calculation of the numbers for scenario '%s'", scenario.name)
+    """This function computes all the number related calculations of one year."""
     return_num, return_vol = {}, {}
-    for year in scenario.years:
-        return_num[year] = {}
-        return_vol[year] = {}
-        for country in stock.values():
-            for building in country.values():
-                building.newYear(year)
-        return_num[year]["total"] = total_buildings(stock, year, detail=detail)
-        return_num[year]["demolition"] = calc_demolitions(stock, year, detail=detail)
-        return_num[year]["refurbishment"] = calc_refurbishments(
-            stock, scenario.getYear(year), year, detail=detail
-        )
-        return_num[year]["construction"] = calc_constructions(
-            stock, scenario.getYear(year), year, detail=detail
-        )
-        return_num[year]["heating system"] = calc_heating_replacement(
-            stock, scenario.getYear(year), year, detail=detail
-        )
-        return_vol[year]["construction"], return_vol[year]["demolition"] = calc_volume(
-            return_num[year]["construction"],
-            return_num[year]["demolition"],
-            stock,
-            detail=detail,
-        )
+    for country in stock.values():
+        for building in country.values():
+            building.newYear(year)
+    return_num["total"] = total_buildings(stock, year, detail=detail)
+    return_num["demolition"] = calc_demolitions(stock, year, detail=detail)
+    return_num["refurbishment"] = calc_refurbishments(
+        stock, scenario.getYear(year), year, detail=detail
+    )
+    return_num["construction"] = calc_constructions(
+        stock, scenario.getYear(year), year, detail=detail, context=context
+    )
+    return_num["heating system"] = calc_heating_replacement(
+        stock, scenario.getYear(year), year, detail=detail
+    )
+    return_vol["construction"], return_vol["demolition"] = calc_volume(
+        return_num["construction"],
+        return_num["demolition"],
+        stock,
+        detail=detail,
+    )
     return return_num, return_vol
 
 
-def calc_all_products(
+def calc_year_products(
     stock: dict,
     scenario: Scenario,
+    year: int,
     nums: dict,
     products: dict,
     detail: Detail,
 ) -> dict:
-    """This function computes all product calculations"""
-    logging.info(
-        "Calculation of the products for scenario '%s' with detail level %s",
-        scenario.name,
-        str(detail),
+    """This function computes all product calculations of one year."""
+    return calc_products(
+        stock,
+        nums,
+        products=products,
+        scenario=scenario.getYear(year),
+        year=year,
+        detail=detail,
     )
 
-    return_pro = {}
-    for year in scenario.years:
-        return_pro[year] = calc_products(
-            stock,
-            nums[year],
-            products=products,
-            scenario=scenario.getYear(year),
-            year=year,
-            detail=detail,
-        )
-    return return_pro
-
-
-def calc_all_recycled(products: dict, scenario: Scenario, detail: Detail) -> dict:
-    """This function computes all recycling related calculations."""
-    return_ = {}
-    for year in scenario.years:
-        temp_ = {}
-        return_[year] = {}
-        temp_["demolition"], return_[year]["demolition"] = calcDemoRecycling(
-            products[year]["demolition"], scenario=scenario.getYear(year), detail=detail
-        )
-        temp_["refurbishment out"], return_[year]["refurbishment out"] = (
-            calcDemoRecycling(
-                products[year]["refurbishment out"],
-                scenario=scenario.getYear(year),
-                detail=detail,
-            )
-        )
-        temp_["replacement out"], return_[year]["replacement out"] = calcDemoRecycling(
-            products[year]["replacement"],
-            scenario=scenario.getYear(year),
-            detail=detail,
-        )
 
-        return_[year]["construction"] = calcConstructionRecycling(
-            products[year]["construction"], temp_["demolition"], detail=detail
-        )
-        return_[year]["refurbishment in"] = calcConstructionRecycling(
-            products[year]["refurbishment in"],
-            temp_["refurbishment out"],
-            detail=detail,
-        )
-        return_[year]["replacement in"] = calcConstructionRecycling(
-            products[year]["replacement"], temp_["replacement out"], detail=detail
-        )
+def calc_year_recycled(products: dict, scenario: Scenario, year: int, detail: Detail) -> dict:
+    """This function computes all recycling related calculations of one year."""
+    temp_, return_ = {}, {}
+    temp_["demolition"], return_["demolition"] = calcDemoRecycling(
+        products["demolition"], scenario=scenario.getYear(year), detail=detail
+    )
+    temp_["refurbishment out"], return_["refurbishment out"] = calcDemoRecycling(
+        products["refurbishment out"],
+        scenario=scenario.getYear(year),
+        detail=detail,
+    )
+    temp_["replacement out"], return_["replacement out"] = calcDemoRecycling(
+        products["replacement"],
+        scenario=scenario.getYear(year),
+        detail=detail,
+    )
 
+    return_["construction"] = calcConstructionRecycling(
+        products["construction"], temp_["demolition"], detail=detail
+    )
+    return_["refurbishment in"] = calcConstructionRecycling(
+        products["refurbishment in"],
+        temp_["refurbishment out"],
+        detail=detail,
+    )
+    return_["replacement in"] = calcConstructionRecycling(
+        products["replacement"], temp_["replacement out"], detail=detail
+    )
     return return_
 
 
-def calc_all_energy(stock: dict, scenario: Scenario, detail: Detail) -> dict:
-    """This function computes all calculations related to the energy demand."""
-    logging.info(
-        "Calculation of the energy demand for scenario '%s' with detail %s",
-        scenario.name,
-        detail,
-    )
+def calc_year_energy(stock: dict, scenario: Scenario, year: int, detail: Detail) -> dict:
+    """This function computes all calculations related to the energy demand of one year."""
     return_ene = {}
-    for year in scenario.years:
-        return_ene[year] = {}
-        return_ene[year]["heating"] = calc_heating(
-            stock, year, scenario.getYear(year), detail=detail
-        )
-        return_ene[year]["cooling"] = calc_cooling(
-            stock, year, scenario.getYear(year), detail=detail
-        )
-        return_ene[year]["water"] = calc_water(
-            stock, year, scenario.getYear(year), detail=detail
-        )
-        return_ene[year]["electricity"] = calc_electricity(
-            stock, year, scenario.getYear(year), detail=detail
-        )
+    return_ene["heating"] = calc_heating(stock, year, scenario.getYear(year), detail=detail)
+    return_ene["cooling"] = calc_cooling(stock, year, scenario.getYear(year), detail=detail)
+    return_ene["water"] = calc_water(stock, year, scenario.getYear(year), detail=detail)
+    return_ene["electricity"] = calc_electricity(
+        stock, year, scenario.getYear(year), detail=detail
+    )
     return return_ene
 
 
-def calc_all_lca(
-    scenario: Scenario,
+def calc_year_lca(
+    prospective: str | None,
+    year: int,
     products: dict,
     computed_data: tuple[dict | None, dict | None, dict],
     detail: Detail,
-    impact: Impact,
+    impact: Impact | tuple[Impact, ...],
+    context: CalculationContext,
 ) -> dict:
-    """This function computes all calculations in relation to the lca."""
-    logging.info(
-        "Calculation of the lca for scenario '%s' with detail %s", scenario.name, detail
+    """This function computes all calculations in relation to the lca of one year."""
+    recycling, energy, volume = computed_data
+    return calc_lca(
+        data=(products, recycling, energy, volume),
+        detail=detail,
+        year=year,
+        prospective=prospective,
+        impact=impact,
+        context=context,
     )
 
-    recycling, energy, volume = computed_data
 
-    return_lca = {}
-    for year in scenario.years:
-        return_lca[year] = calc_lca(
-            data=(
-                products[year],
-                recycling[year] if recycling else None,
-                energy[year] if energy else None,
-                volume[year],
-            ),
-            detail=detail,
+def calc_year(
+    stock: dict,
+    scenario: Scenario,
+    year: int,
+    products: dict,
+    detail: dict,
+    impact: Impact | tuple[Impact, ...],
+    context: CalculationContext,
+    prospectives: tuple[str, ...] = (),
+) -> dict:
+    """This function runs one year through all the required calculations and returns its
+    results (numbers, volume, products, recycling, energy and lca). If several impact categories
+    are given, impacts holds the lca of all of them (a list per value) and lca the first one.\n
+    prospectives (tuple): Prospective scenarios the flows of the year are characterized with in
+                          addition to the one of the scenario. Their lca is stored as prospectives
+                          (prospective -> lca), the flows are only calculated once."""
+    result = {}
+    result["numbers"], result["volume"] = calc_year_numbers(
+        stock=stock, scenario=scenario, year=year, detail=detail["numbers"], context=context
+    )
+
+    if detail["products"] != Detail.NO_CALC:
+        result["products"] = calc_year_products(
+            stock=stock,
+            scenario=scenario,
+            year=year,
+            nums=result["numbers"],
+            products=products,
+            detail=detail["products"],
+        )
+
+    if detail["recycling"] != Detail.NO_CALC:
+        result["recycling"] = calc_year_recycled(
+            products=result["products"],
+            scenario=scenario,
             year=year,
-            prospective=scenario.prospective,
-            impact=impact,
+            detail=detail["recycling"],
+        )
+
+    if detail["energy"] != Detail.NO_CALC:
+        result["energy"] = calc_year_energy(
+            stock=stock, scenario=scenario, year=year, detail=detail["energy"]
         )
 
-    return return_lca
+    if detail["lca"] != Detail.NO_CALC:
+        computed_data = (
+            result["recycling"] if "recycling" in result else None,
+            result["energy"] if "energy" in result else None,
+            result["volume"],
+        )
+        lcas = {}
+        for prospective in (scenario.prospective,) + tuple(prospectives):
+            if prospective not in lcas:
+                lcas[prospective] = calc_year_lca(
+                    prospective=prospective,
+                    year=year,
+                    products=result["products"],
+                    computed_data=computed_data,
+                    detail=detail["lca"],
+                    impact=impact,
+                    context=context,
+                )
+        if prospectives:
+            result["prospectives"] = {
+                prospective: lcas[prospective] for prospective in prospectives
+            }
+        lca = lcas[scenario.prospective]
+        # With several impact categories, lca holds the first one and impacts all of them
+        if isinstance(impact, Impact):
+            result["lca"] = lca
+        else:
+            result["impacts"], result["lca"] = lca, select_impact(lca, 0)
+    return result
+
+
+def init_stock(buildings, scenario: Scenario) -> dict:
+    """This function creates the stock items of the buildings (country -> building -> item)."""
+    stock = {}
+    for building, building_data in buildings.items():
+        if building_data.country not in stock:
+            stock[building_data.country] = {}
+        stock[building_data.country][building] = StockItem(
+            building_data,
+            building_data.use,
+            building_data.years,
+            building_data.number,
+            horizon=len(scenario.years),
+        )
+    return stock
+
+
+def calc_years(
+    objects: tuple[dict, dict],
+    scenario: Scenario,
+    years,
+    state: tuple[dict, CalculationContext],
+    sink: ResultSink,
+    detail: dict,
+    impact: Impact | tuple[Impact, ...],
+    checkpoints: Checkpoints | None = None,
+    names: list[str] | None = None,
+    prospectives: tuple[str, ...] = (),
+) -> None:
+    """This function calculates the years one after the other, starting from the state (the
+    stock and the calculation context), and hands every year to the sink.\n
+    names (list | None): The scenarios the checkpoints are stored for, defaults to the scenario.
+    prospectives (tuple): Additional prospective scenarios the lca is calculated for."""
+    products, buildings = objects
+    stock, context = state
+    for year in years:
+        sink.add(
+            year, calc_year(stock, scenario, year, products, detail, impact, context, prospectives)
+        )
+        logging.debug("Calculated the year %d of scenario '%s'", year, scenario.name)
+        if checkpoints is not None and checkpoints.due(year):
+            checkpoints.save(
+                names if names else [scenario.name], year, dump_state(stock, context, buildings)
+            )
 
 
 def calculation(
@@ -205,67 +288,87 @@ def calculation(
     result,
     detail,
     impact,
+    sink: ResultSink | None = None,
+    checkpoints: Checkpoints | None = None,
+    resume: str | None = None,
+    prospectives: tuple[str, ...] = (),
 ):
-    """This function groups all calculations"""
-
-    products, buildings = objects
-
-    try:
-        stock = {}
-        for building, building_data in buildings.items():
-            if building_data.country not in stock:
-                stock[building_data.country] = {}
-            stock[building_data.country][building] = StockItem(
-                building_data,
-                building_data.use,
-                building_data.years,
-                building_data.number,
-            )
-
-        if detail["numbers"] == Detail.NO_CALC:
-            raise NameError("There is no output specified... calculation aborted")
-
-        result["numbers"], result["volume"] = calc_all_numbers(
-            stock=stock, scenario=scenario, detail=detail["numbers"]
+    """This function calculates a single scenario. It is the scenario tree of one scenario, so it
+    is calculated as a single root node by calculation_branch, see there for the arguments.\n
+    resume (str | None): A checkpoint file the scenario is resumed from. Only the years after it
+                         are calculated and handed to the sink."""
+    if not resume:
+        node = ScenarioNode([scenario], list(scenario.years))
+        return calculation_branch(
+            objects, node, result, detail, impact,
+            sink=sink, checkpoints=checkpoints, prospectives=prospectives,
         )
 
-        if detail["products"] != Detail.NO_CALC:
-            result["products"] = calc_all_products(
-                stock=stock,
-                scenario=scenario,
-                nums=result["numbers"],
-                products=products,
-                detail=detail["products"],
-            )
-
-        if detail["recycling"] != Detail.NO_CALC:
-            result["recycling"] = calc_all_recycled(
-                products=result["products"],
-                scenario=scenario,
-                detail=detail["recycling"],
-            )
-
-        if detail["energy"] != Detail.NO_CALC:
-            result["energy"] = calc_all_energy(
-                stock=stock, scenario=scenario, detail=detail["energy"]
-            )
+    header, state = read_checkpoint(resume)
+    assert header["year"] + 1 in scenario.years, (
+        f"The checkpoint after {header['year']} does not fit the years of {scenario.name}"
+    )
+    if header["scenario"] != scenario.name:
+        logging.info(
+            "Scenario '%s' is resumed from a checkpoint of '%s'", scenario.name, header["scenario"]
+        )
+    node = ScenarioNode(
+        [scenario], [year for year in scenario.years if year > header["year"]], root=False
+    )
+    return calculation_branch(
+        objects, node, result, detail, impact,
+        state=state, sink=sink, checkpoints=checkpoints, prospectives=prospectives,
+    )
 
-        if detail["lca"] != Detail.NO_CALC:
-            result["lca"] = calc_all_lca(
-                scenario=scenario,
-                products=result["products"],
-                computed_data=(
-                    result["recycling"] if "recycling" in result else None,
-                    result["energy"] if "energy" in result else None,
-                    result["volume"],
-                ),
-                detail=detail["lca"],
-                impact=impact,
-            )
 
-    except KeyboardInterrupt:
-        result["valid"] = False
-        logging.critical(
-            "Got interrupted during runtime. Programm terminated ungracefully!"
+def calculation_branch(
+    objects: tuple[dict, dict],
+    node: ScenarioNode,
+    result: dict,
+    detail: dict,
+    impact: Impact | tuple[Impact, ...],
+    *,
+    state: bytes | None = None,
+    sink: ResultSink | None = None,
+    checkpoints: Checkpoints | None = None,
+    prospectives: tuple[str, ...] = (),
+) -> bytes | None:
+    """This function calculates the years of a node of the scenario tree, which are the same
+    for all scenarios of the node, so they are only calculated once.\n
+    state (bytes | None): The state the node is forked from, None for the roots, which start from
+                          the initial stock.
+    It returns the state after the last year if the node has children, which each get a copy."""
+    _, buildings = objects
+    scenario = node.scenario
+    if detail["numbers"] == Detail.NO_CALC:
+        raise NameError("There is no output specified... calculation aborted")
+
+    if state is None:
+        stock, context = init_stock(buildings, scenario), CalculationContext(scenario.name)
+    else:
+        stock, context = load_state(state, buildings)
+        context.name = scenario.name
+    logging.info(
+        "Calculation of %s for the scenarios %s", node, ", ".join(f"'{n}'" for n in node.names)
+    )
+    sink = sink if sink is not None else MemorySink(result)
+    sink.open(node.label)
+    try:
+        calc_years(
+            objects,
+            scenario,
+            node.years,
+            (stock, context),
+            sink,
+            detail,
+            impact,
+            checkpoints,
+            node.names,
+            prospectives,
         )
-        sys.exit()
+    except BaseException:
+        # Also on interrupts, so no temporary stream files are left behind
+        sink.abort()
+        raise
+    sink.close()
+    return dump_state(stock, context, buildings) if node.children else None
@@ -24,24 +24,18 @@ from ..variables import TYPOLOGIES
 
 # FUNCTIONS
 from ..variables import (
-    adapt_detail,
     remove_empty,
     get_share_of_used,
     distribute_fully,
 )
 
 # CLASSES
-from ..data_types import StockItem
+from ..data_types import StockItem, CalculationContext, adapt_output
 from ..variables import Use, Detail
 
 # --------------------------------------------------------------------------------------------------
 # Global Variables
 # --------------------------------------------------------------------------------------------------
-NEW_CONSTRUCTION_STATISTIC_RES = {}
-NEW_CONSTRUCTION_STATISTIC_NR = {}
-
-INITIAL_SM = 0
-INITIAL_POP = 0
 NON_RESIDENTIAL_ADJUST = 0.5
 
 # --------------------------------------------------------------------------------------------------
@@ -158,7 +152,7 @@ def calc_initial_pop(stock: dict) -> int:
     return return_
 
 
-def calc_initial_sm(stock: dict) -> float:
+def calc_initial_sm(stock: dict, initial_pop: int) -> float:
     """This function calculates the initial squaremeters in the stock."""
     return_ = (
         sum(
@@ -171,7 +165,7 @@ def calc_initial_sm(stock: dict) -> float:
             )
             for s in stock["AT"].values()
         )
-        / INITIAL_POP
+        / initial_pop
     )
     # return_ = 45.3
     logging.info(
@@ -182,40 +176,46 @@ def calc_initial_sm(stock: dict) -> float:
 
 
 def calc_constructions(
-    stock: dict, scenario: dict, year: int, detail: Detail
+    stock: dict,
+    scenario: dict,
+    year: int,
+    detail: Detail,
+    *,
+    context: CalculationContext,
 ) -> dict | int:
-    """This function calculates the construction for a given year"""
+    """This function calculates the construction for a given year. The initial population and
+    the construction statistics are derived from the stock once and kept in the context."""
     # return_ = OutputMatrix(detail)
     return_ = {}
-    global INITIAL_POP
-    if not INITIAL_POP:
-        INITIAL_POP = calc_initial_pop(stock)
+    if not context.initial_pop:
+        context.initial_pop = calc_initial_pop(stock)
 
-    global INITIAL_SM
-    if not INITIAL_SM:
-        INITIAL_SM = calc_initial_sm(stock)
+    if not context.initial_sm:
+        context.initial_sm = calc_initial_sm(stock, context.initial_pop)
 
     for country, countryData in stock.items():
         if country not in return_:
             return_[country] = {}
 
-        calc_construction_statistic(Use.RESIDENTIAL, countryData, scenario)
-        calc_construction_statistic(Use.NON_RESIDENTIAL, countryData, scenario)
+        calc_construction_statistic(Use.RESIDENTIAL, countryData, scenario, context)
+        calc_construction_statistic(Use.NON_RESIDENTIAL, countryData, scenario, context)
+        statistic_res = context.construction_statistic[Use.RESIDENTIAL]
+        statistic_nr = context.construction_statistic[Use.NON_RESIDENTIAL]
 
         pop_capacity = sum(get_capacity(countryData, year, scenario))
         pop_demand = int(
-            scenario["population"] / INITIAL_SM * scenario["floorArea"] + 0.5
+            scenario["population"] / context.initial_sm * scenario["floorArea"] + 0.5
         )
         new_pop = pop_demand - pop_capacity if pop_demand - pop_capacity >= 0 else 0
         pop_distr = distribute_fully(
             new_pop,
             {
-                t: NEW_CONSTRUCTION_STATISTIC_RES[t][0]
+                t: statistic_res[t][0]
                 for t in TYPOLOGIES["Residential"]
             },
         )
         TEMP_CONSTRUCTION_STATISTIC_RES = solve_statistic(
-            NEW_CONSTRUCTION_STATISTIC_RES,
+            statistic_res,
             scenario["new Constr 1"],
             kind=Use.RESIDENTIAL,
         )
@@ -243,7 +243,7 @@ def calc_constructions(
                     )
 
         TEMP_CONSTRUCTION_STATISTIC_NR = solve_statistic(
-            NEW_CONSTRUCTION_STATISTIC_NR,
+            statistic_nr,
             scenario["new Constr 2"],
             kind=Use.NON_RESIDENTIAL,
         )
@@ -254,7 +254,7 @@ def calc_constructions(
                 * scenario["population"]
                 * (
                     1
-                    + ((scenario["floorArea"] / INITIAL_SM) - 1)
+                    + ((scenario["floorArea"] / context.initial_sm) - 1)
                     * NON_RESIDENTIAL_ADJUST
                 )
                 + 0.5
@@ -294,19 +294,20 @@ def calc_constructions(
                         )
                     )
 
-    return remove_empty(adapt_detail(return_, detail))
+    return remove_empty(adapt_output(return_, detail))
 
 
-def calc_construction_statistic(kind: Use, stock: dict, scenario: dict) -> None:
+def calc_construction_statistic(
+    kind: Use, stock: dict, scenario: dict, context: CalculationContext
+) -> None:
     """This function calculates the construction statistic that is used to
-    predict the future development."""
-    if kind == Use.RESIDENTIAL:
-        global NEW_CONSTRUCTION_STATISTIC_RES
-        if NEW_CONSTRUCTION_STATISTIC_RES:
-            return None
+    predict the future development. It is stored in the context of the scenario."""
+    if context.construction_statistic[kind]:
+        return None
 
+    if kind == Use.RESIDENTIAL:
         options = get_capacity(stock, None, scenario)
-        NEW_CONSTRUCTION_STATISTIC_RES = {}
+        statistic_res = context.construction_statistic[kind]
         temp = {}
 
         assert isinstance(options, dict)
@@ -321,12 +322,12 @@ def calc_construction_statistic(kind: Use, stock: dict, scenario: dict) -> None:
 
         for key, data in temp.items():
 
-            NEW_CONSTRUCTION_STATISTIC_RES[key] = [0, {}]
-            NEW_CONSTRUCTION_STATISTIC_RES[key][0] = data[0] / total if total else 0
+            statistic_res[key] = [0, {}]
+            statistic_res[key][0] = data[0] / total if total else 0
             assert isinstance(options, dict)
             relevant = list(filter(lambda a: key in a, options.keys()))
-            if not NEW_CONSTRUCTION_STATISTIC_RES[key][1]:
-                NEW_CONSTRUCTION_STATISTIC_RES[key][1] = {
+            if not statistic_res[key][1]:
+                statistic_res[key][1] = {
                     "energy": {},
                     "construction": {},
                 }
@@ -335,93 +336,89 @@ def calc_construction_statistic(kind: Use, stock: dict, scenario: dict) -> None:
                     continue
                 if (
                     int(r[17])
-                    not in NEW_CONSTRUCTION_STATISTIC_RES[key][1]["construction"]
+                    not in statistic_res[key][1]["construction"]
                 ):
-                    NEW_CONSTRUCTION_STATISTIC_RES[key][1]["construction"][
+                    statistic_res[key][1]["construction"][
                         int(r[17])
                     ] = 0
-                if int(r[18]) not in NEW_CONSTRUCTION_STATISTIC_RES[key][1]["energy"]:
-                    NEW_CONSTRUCTION_STATISTIC_RES[key][1]["energy"][int(r[18])] = 0
-                NEW_CONSTRUCTION_STATISTIC_RES[key][1]["construction"][
+                if int(r[18]) not in statistic_res[key][1]["energy"]:
+                    statistic_res[key][1]["energy"][int(r[18])] = 0
+                statistic_res[key][1]["construction"][
                     int(r[17])
                 ] += options[r]
-                NEW_CONSTRUCTION_STATISTIC_RES[key][1]["energy"][int(r[18])] += options[
+                statistic_res[key][1]["energy"][int(r[18])] += options[
                     r
                 ]
 
-            total2 = sum(NEW_CONSTRUCTION_STATISTIC_RES[key][1]["energy"].values())
+            total2 = sum(statistic_res[key][1]["energy"].values())
 
-            for e in NEW_CONSTRUCTION_STATISTIC_RES[key][1]["energy"]:
-                NEW_CONSTRUCTION_STATISTIC_RES[key][1]["energy"][int(e)] = (
-                    NEW_CONSTRUCTION_STATISTIC_RES[key][1]["energy"][e] / total2
+            for e in statistic_res[key][1]["energy"]:
+                statistic_res[key][1]["energy"][int(e)] = (
+                    statistic_res[key][1]["energy"][e] / total2
                     if total2
                     else 0
                 )
 
-            for e in NEW_CONSTRUCTION_STATISTIC_RES[key][1]["construction"]:
-                NEW_CONSTRUCTION_STATISTIC_RES[key][1]["construction"][int(e)] = (
-                    NEW_CONSTRUCTION_STATISTIC_RES[key][1]["construction"][e] / total2
+            for e in statistic_res[key][1]["construction"]:
+                statistic_res[key][1]["construction"][int(e)] = (
+                    statistic_res[key][1]["construction"][e] / total2
                     if total2
                     else 0
                 )
         return
 
     if kind == Use.NON_RESIDENTIAL:
-
-        global NEW_CONSTRUCTION_STATISTIC_NR
-        if NEW_CONSTRUCTION_STATISTIC_NR:
-            return None
-
-        NEW_CONSTRUCTION_STATISTIC_NR = {
-            k: a / INITIAL_POP
+        statistic_nr = {
+            k: a / context.initial_pop
             for k, a in getNumber(
                 stock, detail=False, selection=[0, 1], sm=True, scenario=scenario
             ).items()
         }
 
-        NEW_CONSTRUCTION_STATISTIC_NR = {
-            k: [data] for k, data in NEW_CONSTRUCTION_STATISTIC_NR.items()
+        statistic_nr = {
+            k: [data] for k, data in statistic_nr.items()
         }
 
         options = getNumber(
             stock, detail=True, selection=[0, 1], sm=True, scenario=scenario
         )
 
-        for key in NEW_CONSTRUCTION_STATISTIC_NR:
-            NEW_CONSTRUCTION_STATISTIC_NR[key].append(
+        for key in statistic_nr:
+            statistic_nr[key].append(
                 {"energy": {}, "construction": {}}
             )
             relevant = list(filter(lambda a: key in a, stock.keys()))
             for r in relevant:
                 if int(r[7:11]) <= 2001:
                     continue
-                if int(r[18]) not in NEW_CONSTRUCTION_STATISTIC_NR[key][1]["energy"]:
-                    NEW_CONSTRUCTION_STATISTIC_NR[key][1]["energy"][int(r[18])] = 0
+                if int(r[18]) not in statistic_nr[key][1]["energy"]:
+                    statistic_nr[key][1]["energy"][int(r[18])] = 0
                 if (
                     int(r[17])
-                    not in NEW_CONSTRUCTION_STATISTIC_NR[key][1]["construction"]
+                    not in statistic_nr[key][1]["construction"]
                 ):
-                    NEW_CONSTRUCTION_STATISTIC_NR[key][1]["construction"][
+                    statistic_nr[key][1]["construction"][
                         int(r[17])
                     ] = 0
-                NEW_CONSTRUCTION_STATISTIC_NR[key][1]["construction"][
+                statistic_nr[key][1]["construction"][
                     int(r[17])
                 ] += options[r]
-                NEW_CONSTRUCTION_STATISTIC_NR[key][1]["energy"][int(r[18])] += options[
+                statistic_nr[key][1]["energy"][int(r[18])] += options[
                     r
                 ]
 
-            NEW_CONSTRUCTION_STATISTIC_NR[key][1]["energy"] = {
-                k: a / sum(NEW_CONSTRUCTION_STATISTIC_NR[key][1]["energy"].values())
-                for k, a in NEW_CONSTRUCTION_STATISTIC_NR[key][1]["energy"].items()
+            statistic_nr[key][1]["energy"] = {
+                k: a / sum(statistic_nr[key][1]["energy"].values())
+                for k, a in statistic_nr[key][1]["energy"].items()
             }
-            NEW_CONSTRUCTION_STATISTIC_NR[key][1]["construction"] = {
+            statistic_nr[key][1]["construction"] = {
                 k: a
-                / sum(NEW_CONSTRUCTION_STATISTIC_NR[key][1]["construction"].values())
-                for k, a in NEW_CONSTRUCTION_STATISTIC_NR[key][1][
+                / sum(statistic_nr[key][1]["construction"].values())
+                for k, a in statistic_nr[key][1][
                     "construction"
                 ].items()
             }
+        context.construction_statistic[kind] = statistic_nr
         return
 
 
@@ -440,7 +437,7 @@ def get_capacity(stock: dict[str, StockItem], year: int | None, scenario: dict):
                 item.building.code,
             )
             return_[str(item.building.code)] = int(
-                item.building.residents * sum(item.number.total.values()) * multiplier
+                item.building.residents * item.number.get_total() * multiplier
                 + 0.5
             )
         return return_
@@ -457,7 +454,7 @@ def get_capacity(stock: dict[str, StockItem], year: int | None, scenario: dict):
         return_.append(
             int(
                 item.development[year].building.residents
-                * sum(item.development[year].number.total.values())
+                * item.development[year].number.get_total()
                 * multiplier
                 + 0.5
             )
@@ -498,17 +495,17 @@ def getNumber(
 
         if year:
             output[key_] += (
-                sum(data.development[year].number.total.values())
+                data.development[year].number.get_total()
                 if not sm
-                else sum(data.development[year].number.total.values())
+                else data.development[year].number.get_total()
                 * data.building.floor_area["Net Heated"]
                 * multiplier
             )
         else:
             output[key_] += (
-                sum(data.number.total.values())
+                data.number.get_total()
                 if not sm
-                else sum(data.number.total.values())
+                else data.number.get_total()
                 * data.building.floor_area["Net Heated"]
                 * multiplier
             )
@@ -14,7 +14,9 @@ License: See LICENSE.md
 # --------------------------------------------------------------------------------------------------
 
 # FUNCTIONS
-from ..variables import adapt_detail, remove_empty
+from ..variables import remove_empty
+from ..data_types import adapt_output
+from ..data_types.building_number import demolish
 
 # CLASSES
 from ..variables import Detail
@@ -29,18 +31,28 @@ NR_RENO_OPTIONS = 4
 # Definitions
 # --------------------------------------------------------------------------------------------------
 def calc_demolitions(stock: dict, year: int, detail: Detail) -> dict | list:
-    """This function demolishes the necessary buildings."""
-    temp_ = remove_empty(
-        adapt_detail(
-            {
-                country: {
-                    code: b.development[year].calcDemolition(year)
-                    for code, b in countryData.items()
-                }
-                for country, countryData in stock.items()
-            },
-            detail,
-        )
+    """This function demolishes the necessary buildings. All typologies are demolished together
+    in one call of the demolition kernel."""
+    demolished = {country: {} for country in stock}
+    items = []
+    for country, countryData in stock.items():
+        for code, b in countryData.items():
+            item = b.development[year]
+            if item.years[-1] == 2022:
+                # NOTE: Immediately removes new buildings from the equation
+                demolished[country][code] = [0, 0, 0, 0]
+                continue
+            demolished[country][code] = None  # keeps the order of the typologies
+            items.append((country, code, item))
+
+    totals = demolish(
+        [item.number for _, _, item in items],
+        [item.getDemolitionRates(year) for _, _, item in items],
     )
+    for (country, code, item), total in zip(items, totals):
+        assert item.number.check(throw_error=True), "NOO"
+        demolished[country][code] = total
+
+    temp_ = remove_empty(adapt_output(demolished, detail))
     assert isinstance(temp_, dict)
     return temp_
@@ -22,7 +22,8 @@ Description: This file is regarding all the energy calculations
 from ..variables import NO_B8
 
 # FUNCTIONS
-from ..variables import adapt_detail, get_share_of_used
+from ..variables import get_share_of_used
+from ..data_types import adapt_output
 
 # CLASSES
 from ..variables import Detail
@@ -120,7 +121,7 @@ def calc_heating(
                             / EFFICIENCY[0 if old_ < 1 else 1][heating_system]
                             * share_of_used
                         )
-    return adapt_detail(return_, detail)
+    return adapt_output(return_, detail)
 
 
 def calc_cooling(
@@ -134,7 +135,7 @@ def calc_cooling(
         return_[country] = {}
         for typology_, stock_item in country_data.items():
             return_[country][typology_] = {}
-            number_ = sum(stock_item.development[year].number.total.values())
+            number_ = stock_item.development[year].number.get_total()
             share_of_used = get_share_of_used(
                 stock_item.building.shared_of_used,
                 scenario["use of empty"],
@@ -149,7 +150,7 @@ def calc_cooling(
             return_[country][typology_] = {
                 "cooling": house_cooling_demand * share_of_used * number_
             }
-    return adapt_detail(return_, detail)
+    return adapt_output(return_, detail)
 
 
 def calc_water(
@@ -160,7 +161,7 @@ def calc_water(
     for country, country_data in stock.items():
         return_[country] = {}
         for typology_, stock_item in country_data.items():
-            number_ = sum(stock_item.development[year].number.total.values())
+            number_ = stock_item.development[year].number.get_total()
             share_of_used = get_share_of_used(
                 stock_item.building.shared_of_used,
                 scenario["use of empty"],
@@ -171,7 +172,7 @@ def calc_water(
             return_[country][typology_] = {
                 "water": house_water_demand * share_of_used * number_
             }
-    return adapt_detail(return_, detail)
+    return adapt_output(return_, detail)
 
 
 def calc_electricity(
@@ -209,7 +210,7 @@ def calc_electricity(
                     * stock_item.get_total(year)
                 )
 
-    return adapt_detail(return_, detail)
+    return adapt_output(return_, detail)
 
 
 def combine(a: list, b: list) -> list[list]:
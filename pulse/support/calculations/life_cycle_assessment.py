@@ -15,24 +15,22 @@ Description: This file includes all things related to lca calculations
 import logging
 from enum import Enum
 
+import numpy as np
+
 # --------------------------------------------------------------------------------------------------
 # Imports Local Libraries
 # --------------------------------------------------------------------------------------------------
 
-from ..file_handling import import_json
-from ..variables import adapt_detail
-
-from ..data_types import GroupedProducts
+from ..data_types import GroupedProducts, OutputMatrix, CalculationContext, CharacterizationMatrix
+from ..data_types import adapt_output
 from ..variables import Detail, Impact
 
 # --------------------------------------------------------------------------------------------------
 # Global Variables
 # --------------------------------------------------------------------------------------------------
-A1, A4, A5, B6, C2, C3 = ({} for _ in range(6))
 REPORT = {"A1-A3": [], "A4": [], "A5": [], 'C2': []}
 
 KW_MJ = 3.6
-CURRENT_PROSPECTIVE = None
 
 
 class LCAStage(Enum):
@@ -56,92 +54,121 @@ class LCAStage(Enum):
 CONSTRUCTION = 0
 DEMOLITION = 1
 
+# The tables a product needs to get impacts in a stage and the terms (table, constant, loss factor)
+# of the stage. The impacts of a term are multiplied with constant + loss factor * the A5 loss
+# multiplier of the product, which is the same as calc_product_lca does for a single product.
+STAGE_TERMS = {
+    LCAStage.A1: (("A1", "A5"), (("A1", 1, 1),)),
+    LCAStage.A4: (("A4", "A5"), (("A4", 1, 1),)),
+    LCAStage.A5: (("A5", "C2", "C3"), (("C2", 0, 1), ("C3", 0, 1))),
+    LCAStage.B4: (
+        ("A1", "A4", "A5", "C2", "C3"),
+        (("A1", 1, 1), ("A4", 1, 1), ("C2", 1, 1), ("C3", 1, 1)),
+    ),
+    LCAStage.B5_IN: (
+        ("A1", "A4", "A5", "C2", "C3"),
+        (("A1", 1, 1), ("A4", 1, 1), ("C2", 0, 1), ("C3", 0, 1)),
+    ),
+    LCAStage.B5_OUT: (("C2", "C3"), (("C2", 1, 0), ("C3", 1, 0))),
+    LCAStage.C2: (("C2", "C3"), (("C2", 1, 0),)),
+    LCAStage.C3_C4: (("C2", "C3"), (("C3", 1, 0),)),
+}
+REPORT_NAMES = {"A1": "A1-A3", "A4": "A4", "A5": "A5", "C2": "C2", "C3": "C3"}
+# The energy stages with the energy demand they are calculated from, its keys together with the
+# energy carrier and the key of the result, and the factor of the demand. Without keys, every
+# carrier of the demand is its own key.
+ENERGY_STAGES = (
+    ("B6.1", "electricity", {"B6.1": ("B6.1", "B6.1")}, KW_MJ),
+    ("B6.2 & B6.3", "electricity", {"B6.2": ("B6.2 & B6.3", "B6.2 & B6.3")}, KW_MJ),
+    ("B6 - Heat", "heating", None, KW_MJ),
+    ("B6 - Cool", "cooling", {"cooling": ("Final Space Cooling", "Cooling")}, KW_MJ),
+    ("B7", "water", {"water": ("Water Use", "Water User")}, 1),
+)
+
 
 # --------------------------------------------------------------------------------------------------
 # Definitions
 # --------------------------------------------------------------------------------------------------
-def import_lca(prospective) -> None:
-    """This function imports lca files."""
-    logging.debug(
-        "Importing LCA data. Old prospect: '%s' new prospect: '%s'",
-        CURRENT_PROSPECTIVE,
-        prospective
-    )
-    std = "SSP2-NDC"
-    s = prospective if prospective else std
-    global A1
-    A1 = import_json(title=f"{s}_A1A3", location="data/lca")
-    global A4
-    A4 = import_json(title=f"{s}_A4", location="data/lca")
-    global A5
-    A5 = import_json(title=f"{s}_A5C1", location="data/lca")
-    global B6
-    B6 = import_json(title=f"{s}_B6B7B8", location="data/lca")
-    global C2
-    C2 = import_json(title=f"{s}_C2", location="data/lca")
-    global C3
-    C3 = import_json(title=f"{s}_C3C4", location="data/lca")
-
-
 def calc_lca(
     data: tuple[dict,dict|None,dict|None,dict],
     detail: Detail,
     year: int = 2023,
     prospective: str | None = None,
-    impact: Impact = Impact.GWP100,
+    impact: Impact | tuple[Impact, ...] = Impact.GWP100,
+    context: CalculationContext | None = None,
 ) -> dict:
-    """This function calculates the LCA."""
+    """This function calculates the LCA. The lca tables of the prospective scenario are taken
+    from the context of the scenario run.\n
+    impact (Impact | tuple): The impact category, or several of them. Every value of the result
+                             is a list with one entry per impact category then."""
     year_ = str(year) if prospective else str(2023)
 
     products, recycling, energy, volume = data
 
-    global CURRENT_PROSPECTIVE
-    if CURRENT_PROSPECTIVE != prospective or not A1:
-        import_lca(prospective=prospective)
-    CURRENT_PROSPECTIVE = prospective
+    context = context if context else CalculationContext()
+    tables = context.lca(prospective)
+    characterization = context.characterization(prospective, year_)
 
     return_ = {}
     if not recycling:
-        return_["A1-A3"] = adapt_detail(
-            recursive_lca(
-                products["construction"], kind=LCAStage.A1, year=year_, impact=impact
-            ),
-            goal_detail=detail,
+        return_["A1-A3"] = stage_lca(
+            products["construction"],
+            kind=LCAStage.A1,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["A4"] = adapt_detail(
-            recursive_lca(
-                products["construction"], kind=LCAStage.A4, year=year_, impact=impact
-            ),
-            goal_detail=detail,
+        return_["A4"] = stage_lca(
+            products["construction"],
+            kind=LCAStage.A4,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["A5"] = adapt_detail(
-            recursive_lca(
-                products["construction"], kind=LCAStage.A5, year=year_, impact=impact
-            ),
-            goal_detail=detail,
+        return_["A5"] = stage_lca(
+            products["construction"],
+            kind=LCAStage.A5,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
     else:
-        return_["A1-A3"] = adapt_detail(
-            recursive_lca(
-                recycling["construction"], kind=LCAStage.A1, year=year_, impact=impact
-            ),
-            goal_detail=detail,
+        return_["A1-A3"] = stage_lca(
+            recycling["construction"],
+            kind=LCAStage.A1,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["A4"] = adapt_detail(
-            recursive_lca(
-                recycling["construction"], kind=LCAStage.A4, year=year_, impact=impact
-            ),
-            goal_detail=detail,
+        return_["A4"] = stage_lca(
+            recycling["construction"],
+            kind=LCAStage.A4,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["A5"] = adapt_detail(
-            recursive_lca(
-                recycling["construction"], kind=LCAStage.A5, year=year_, impact=impact
-            ),
-            goal_detail=detail,
+        return_["A5"] = stage_lca(
+            recycling["construction"],
+            kind=LCAStage.A5,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
 
     return_["A5 - Volume"] = volume_lca(
-        volume["construction"], year, CONSTRUCTION, detail, impact=impact
+        volume["construction"], year, CONSTRUCTION, detail, impact=impact, tables=tables
     )
     return_["A5"] = merge_dicts(return_["A5"], return_["A5 - Volume"])
     del return_["A5 - Volume"]
@@ -150,119 +177,115 @@ def calc_lca(
     return_["B3"] = {}
 
     if not recycling:
-        return_["B4"] = adapt_detail(
-            recursive_lca(
-                products["replacement"], kind=LCAStage.B4, year=year_, impact=impact
-            ),
-            goal_detail=detail,
+        return_["B4"] = stage_lca(
+            products["replacement"],
+            kind=LCAStage.B4,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["B5 - In"] = adapt_detail(
-            recursive_lca(
-                products["refurbishment in"],
-                kind=LCAStage.B5_IN,
-                year=year_,
-                impact=impact,
-            ),
-            goal_detail=detail,
+        return_["B5 - In"] = stage_lca(
+            products["refurbishment in"],
+            kind=LCAStage.B5_IN,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["B5 - Out"] = adapt_detail(
-            recursive_lca(
-                products["refurbishment out"],
-                kind=LCAStage.B5_OUT,
-                year=year_,
-                impact=impact,
-            ),
-            goal_detail=detail,
+        return_["B5 - Out"] = stage_lca(
+            products["refurbishment out"],
+            kind=LCAStage.B5_OUT,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
     else:
-        return_["B4"] = adapt_detail(
-            recursive_lca(
-                recycling["replacement in"], kind=LCAStage.B4, year=year_, impact=impact
-            ),
-            goal_detail=detail,
+        return_["B4"] = stage_lca(
+            recycling["replacement in"],
+            kind=LCAStage.B4,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["B5 - In"] = adapt_detail(
-            recursive_lca(
-                recycling["refurbishment in"],
-                kind=LCAStage.B5_IN,
-                year=year_,
-                impact=impact,
-            ),
-            goal_detail=detail,
+        return_["B5 - In"] = stage_lca(
+            recycling["refurbishment in"],
+            kind=LCAStage.B5_IN,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["B5 - Out"] = adapt_detail(
-            recursive_lca(
-                recycling["refurbishment out"],
-                kind=LCAStage.B5_OUT,
-                year=year_,
-                impact=impact,
-            ),
-            goal_detail=detail,
+        return_["B5 - Out"] = stage_lca(
+            recycling["refurbishment out"],
+            kind=LCAStage.B5_OUT,
+            year=year_,
+            detail=detail,
+            impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
 
     return_["B5"] = merge_dicts(return_["B5 - In"], return_["B5 - Out"])
     del return_["B5 - In"]
     del return_["B5 - Out"]
     if energy:
-        return_["B6.1"] = energy_lca(
-            energy["electricity"],
-            kind=LCAStage.B6_1,
+        return_.update(
+            energy_lca(
+                energy,
+                year=year_,
+                detail=detail,
+                impact=impact,
+                characterization=characterization,
+            )
+        )
+    return_["C1"] = volume_lca(
+        volume["demolition"], year_, DEMOLITION, detail, impact=impact, tables=tables
+    )
+    if not recycling:
+        return_["C2"] = stage_lca(
+            products["demolition"],
+            kind=LCAStage.C2,
             year=year_,
             detail=detail,
             impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["B6.2 & B6.3"] = energy_lca(
-            energy["electricity"],
-            kind=LCAStage.B6_2,
+        return_["C3-C4"] = stage_lca(
+            products["demolition"],
+            kind=LCAStage.C3_C4,
             year=year_,
             detail=detail,
             impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["B6 - Heat"] = energy_lca(
-            energy["heating"],
-            kind=LCAStage.B6_HEATING,
+    else:
+        return_["C2"] = stage_lca(
+            recycling["demolition"],
+            kind=LCAStage.C2,
             year=year_,
             detail=detail,
             impact=impact,
+            tables=tables,
+            characterization=characterization,
         )
-        return_["B6 - Cool"] = energy_lca(
-            energy["cooling"],
-            kind=LCAStage.B6_COOLING,
+        return_["C3-C4"] = stage_lca(
+            recycling["demolition"],
+            kind=LCAStage.C3_C4,
             year=year_,
             detail=detail,
             impact=impact,
-        )
-        return_["B7"] = energy_lca(
-            energy["water"], kind=LCAStage.B7, year=year_, detail=detail, impact=impact
-        )
-    return_["C1"] = volume_lca(
-        volume["demolition"], year_, DEMOLITION, detail, impact=impact
-    )
-    if not recycling:
-        return_["C2"] = adapt_detail(
-            recursive_lca(
-                products["demolition"], kind=LCAStage.C2, year=year_, impact=impact
-            ),
-            goal_detail=detail,
-        )
-        return_["C3-C4"] = adapt_detail(
-            recursive_lca(
-                products["demolition"], kind=LCAStage.C3_C4, year=year_, impact=impact
-            ),
-            goal_detail=detail,
-        )
-    else:
-        return_["C2"] = adapt_detail(
-            recursive_lca(
-                recycling["demolition"], kind=LCAStage.C2, year=year_, impact=impact
-            ),
-            goal_detail=detail,
-        )
-        return_["C3-C4"] = adapt_detail(
-            recursive_lca(
-                recycling["demolition"], kind=LCAStage.C3_C4, year=year_, impact=impact
-            ),
-            goal_detail=detail,
+            tables=tables,
+            characterization=characterization,
         )
     temp_ = truncate_dictionary(return_)
     assert isinstance(temp_, dict)
@@ -273,13 +296,18 @@ def not_in(product: str, cat: dict, cat_d: str) -> bool:
     """This function checks if there is a certain product in a category"""
     if product in cat:
         return False
-    if product not in REPORT[cat_d]:
+    report_missing(product, cat_d)
+    return True
+
+def report_missing(product: str, cat_d: str) -> None:
+    """This function reports a product without lca data in a category, once per process."""
+    if product not in REPORT.setdefault(cat_d, []):
         REPORT[cat_d].append(product)
         logging.warning("'%s' not available for '%s'", product, cat_d)
-    return True
 
-def check_lca_data(kind, product, year) -> bool:
+def check_lca_data(kind, product, year, tables: dict) -> bool:
     """This function checks if all the necessary data is initialized."""
+    A1, A4, A5, C2, C3 = (tables[s] for s in ("A1", "A4", "A5", "C2", "C3"))
     if kind in [LCAStage.A1, LCAStage.B4, LCAStage.B5_IN]:
         if not_in(product, A1[year], "A1-A3"):
             return False
@@ -317,12 +345,14 @@ def calc_product_lca(
     year: str,
     kind: LCAStage,
     impact: Impact,
+    tables: dict,
 ) -> float:
     """This function calculates the lca for on product"""
     return_ = 0
 
-    if not check_lca_data(kind, product, year):
+    if not check_lca_data(kind, product, year, tables):
         return 0
+    A1, A4, A5, C2, C3 = (tables[s] for s in ("A1", "A4", "A5", "C2", "C3"))
 
     in_multiplier_ = 0
     out_multiplier_ = 0
@@ -356,24 +386,66 @@ def calc_product_lca(
     return return_
 
 
-def recursive_lca(group: dict, kind: LCAStage, year: str, impact: Impact) -> dict:
+def recursive_lca(
+    group: dict, kind: LCAStage, year: str, impact: Impact, tables: dict
+) -> dict:
     """This function recusively calculates the lca of a dict."""
     r = {}
     for key, data in group.items():
         if isinstance(data, dict):
-            r[key] = recursive_lca(data, kind, year, impact)
+            r[key] = recursive_lca(data, kind, year, impact, tables)
         elif isinstance(data, (int, float)):
-            r[key] = calc_product_lca(key, data, year, kind, impact)
+            r[key] = calc_product_lca(key, data, year, kind, impact, tables)
         elif isinstance(data, GroupedProducts):
             r[key] = {}
             for product, amount in data.dictify().items():
-                r[key][product] = calc_product_lca(product, amount, year, kind, impact)
+                r[key][product] = calc_product_lca(product, amount, year, kind, impact, tables)
         else:
             raise TypeError(f"Wrong type in recursiceLCA: {type(data)}")
     return r
 
 
-def volume_lca(volume, year, kind: int, detail: Detail, impact: Impact) -> float | dict:
+def stage_lca(
+    group: dict,
+    kind: LCAStage,
+    year: str,
+    detail: Detail,
+    impact: Impact,
+    tables: dict,
+    characterization: CharacterizationMatrix | None = None,
+) -> dict:
+    """This function calculates the lca of a product dictionary in an output matrix and reduces it
+    to the requested detail. With a characterization matrix, the product flows of all leaves are
+    characterized at once with the coefficients of the stage, otherwise every product is looked up
+    in the lca tables. Both ways agree to floating point tolerance (about 1e-12 relative), not
+    exactly, because the coefficients of a stage are multiplied and added up in another order."""
+    matrix = None
+    if characterization is not None:
+        coefficients, missing = characterization.stage(kind, *STAGE_TERMS[kind])
+        matrix = OutputMatrix.fromFlows(group, coefficients[:, impact_columns(impact)])
+    if matrix is None:
+        matrices = [
+            OutputMatrix.fromDict(
+                group,
+                lambda product, amount, impact_=impact_: calc_product_lca(
+                    product, amount, year, kind, impact_, tables
+                ),
+            )
+            for impact_ in ((impact,) if isinstance(impact, Impact) else impact)
+        ]
+        matrix = matrices[0]
+        if not isinstance(impact, Impact):
+            matrix.data = np.stack([matrix_.data for matrix_ in matrices], axis=-1)
+    elif missing and "product" in matrix.axes:
+        for product in matrix.getLabels("product"):
+            if product in missing:
+                report_missing(product, REPORT_NAMES[missing[product]])
+    return matrix.reduce(detail).toDict()
+
+
+def volume_lca(
+    volume, year, kind: int, detail: Detail, impact: Impact, tables: dict
+) -> float | dict:
     """This function calculates the volume of a dict."""
     if kind == CONSTRUCTION:
         key_ = "Construction"
@@ -388,11 +460,11 @@ def volume_lca(volume, year, kind: int, detail: Detail, impact: Impact) -> float
         return_[country] = {}
         for typology, typo_data in country_data.items():
             return_[country][typology] = {
-                key_: A5[str(year)][key_][impact.value] * typo_data
+                key_: characterize(tables["A5"][str(year)][key_], impact, typo_data)
             }
     if detail == Detail.PRODUCT:
         return return_
-    return adapt_detail(return_, detail)
+    return adapt_output(return_, detail)
 
 
 def merge_dicts(dict1: float | int | dict, dict2: float | int | dict):
@@ -401,6 +473,8 @@ def merge_dicts(dict1: float | int | dict, dict2: float | int | dict):
         isinstance(dict2, (float, int)))
     ):
         return dict1 + dict2
+    if isinstance(dict1, list) and isinstance(dict2, list):
+        return add_values(dict1, dict2)
     if not dict1:
         return dict2
     if not isinstance(dict1, dict):
@@ -419,60 +493,100 @@ def merge_dicts(dict1: float | int | dict, dict2: float | int | dict):
 def truncate_dictionary(data):
     """This function truncates a dictionary."""
     if isinstance(data, dict):
-        return {
-            k: truncate_dictionary(v)
-            for k, v in data.items()
-            if v and truncate_dictionary(v)
-        }
+        output = {}
+        for k, v in data.items():
+            if not v:
+                continue
+            truncated = truncate_dictionary(v)
+            if truncated:
+                output[k] = truncated
+        return output
+    if isinstance(data, list) and all(isinstance(v, (int, float)) for v in data):
+        # The values of several impact categories are kept together
+        return data if any(data) else []
     if isinstance(data, list):
-        return [truncate_dictionary(v) for v in data if v and truncate_dictionary(v)]
+        output = []
+        for v in data:
+            if not v:
+                continue
+            truncated = truncate_dictionary(v)
+            if truncated:
+                output.append(truncated)
+        return output
     return data
 
 
 def energy_lca(
     energy: dict,
-    kind: LCAStage,
     year: int | str,
     detail: Detail,
-    impact: Impact,
-) -> dict:
-    """This function calculates the lca of an energy dictionary."""
-    return_ = {}
+    impact: Impact | tuple[Impact, ...],
+    characterization: CharacterizationMatrix,
+) -> dict[str, dict]:
+    """This function calculates the lca of all energy stages (B6.1, B6.2 & B6.3, heating, cooling
+    and B7) at once. The demands of every typology and carrier are collected into one array and
+    multiplied with the carrier x impact coefficients of the year."""
+    return_, places, carriers, demands, factors = {}, [], [], [], []
+    for stage, kind, keys, factor in ENERGY_STAGES:
+        return_[stage] = {}
+        for country, country_data in energy[kind].items():
+            return_[stage][country] = {}
+            for typology, typo_data in country_data.items():
+                leaf = return_[stage][country][typology] = {}
+                pairs = keys.items() if keys else ((key, (key, key)) for key in typo_data)
+                for key, (carrier, label) in pairs:
+                    places.append((leaf, label))
+                    carriers.append(carrier)
+                    demands.append(typo_data[key])
+                    factors.append(factor)
+
+    coefficients = characterization.carriers(carriers)[:, impact_columns(impact)]
+    demands_, factors_ = np.array(demands, dtype=float), np.array(factors, dtype=float)
+    if coefficients.ndim == 2:
+        demands_, factors_ = demands_[:, None], factors_[:, None]
+    for (leaf, label), value in zip(places, (coefficients * demands_ * factors_).tolist()):
+        leaf[label] = value
 
-    for country, country_data in energy.items():
-        return_[country] = {}
-        for typology, typo_data in country_data.items():
-            return_[country][typology] = {}
-            if kind == LCAStage.B6_1:
-                return_[country][typology] = {
-                    "B6.1": B6[str(year)]["B6.1"][impact.value]
-                    * typo_data["B6.1"]
-                    * KW_MJ
-                }
-            if kind == LCAStage.B6_2:
-                return_[country][typology] = {
-                    "B6.2 & B6.3": B6[str(year)]["B6.2 & B6.3"][impact.value]
-                    * typo_data["B6.2"]
-                    * KW_MJ
-                }
-            if kind == LCAStage.B6_COOLING:
-                return_[country][typology] = {
-                    "Cooling": B6[str(year)]["Final Space Cooling"][impact.value]
-                    * typo_data["cooling"]
-                    * KW_MJ
-                }
-            if kind == LCAStage.B6_HEATING:
-                return_[country][typology] = {
-                    key_: B6[str(year)][key_][impact.value] * data_ * KW_MJ
-                    for key_, data_ in typo_data.items()
-                }
-            if kind == LCAStage.B7:
-                return_[country][typology] = {
-                    "Water User": B6[str(year)]["Water Use"][impact.value]
-                    * typo_data["water"]
-                }
     if detail in (Detail.PRODUCT, Detail.COMPONENT):
         return return_
-    temp_ = adapt_detail(return_, detail)
-    assert isinstance(temp_,dict)
-    return temp_
+    for stage, data in return_.items():
+        temp_ = adapt_output(data, detail)
+        assert isinstance(temp_, dict)
+        return_[stage] = temp_
+    return return_
+
+
+def impact_columns(impact: Impact | tuple[Impact, ...]) -> int | list[int]:
+    """This function returns the position of the impact category in the lca tables, or the
+    positions of several of them."""
+    if isinstance(impact, Impact):
+        return impact.value
+    return [impact_.value for impact_ in impact]
+
+
+def characterize(values: list, impact: Impact | tuple[Impact, ...], *factors) -> float | list:
+    """This function multiplies the impacts of an entry of a lca table with the factors. For
+    several impact categories it returns a list with one value per category."""
+    if not isinstance(impact, Impact):
+        return [characterize(values, impact_, *factors) for impact_ in impact]
+    value = values[impact.value]
+    for factor in factors:
+        value = value * factor
+    return value
+
+
+def add_values(values1: list, values2: list) -> list:
+    """This function adds the values of several impact categories."""
+    return [value1 + value2 for value1, value2 in zip(values1, values2)]
+
+
+def select_impact(data: dict, position: int) -> dict:
+    """This function takes the values of one impact category out of a result that was calculated
+    for several of them. The result is the same as calculating the category on its own."""
+
+    def select(data_):
+        if isinstance(data_, dict):
+            return {key: select(value) for key, value in data_.items()}
+        return data_[position] if isinstance(data_, list) else data_
+
+    return truncate_dictionary(select(data))
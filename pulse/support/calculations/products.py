@@ -14,7 +14,7 @@ License: See LICENSE.md
 
 from ..variables import adapt_detail, remove_empty, distribute_fully
 
-from ..data_types import GroupedProducts
+from ..data_types import DenseProducts, MaterialFlow, INTENSITY_MATRIX
 from ..variables import Detail
 
 MULTIPLIER = 0.15
@@ -69,6 +69,7 @@ def calc_products_total(
     if detail.value > Detail.COMPONENT.value:
         detail = Detail.COMPONENT
 
+    flow = MaterialFlow(INTENSITY_MATRIX)
     return_ = {}
 
     for country, countryData in stock.items():
@@ -76,10 +77,10 @@ def calc_products_total(
             return_[country] = {}
         for building in countryData.values():
             options = (
-                sum(building[year].number.bare.values()),
-                sum(building[year].number.light.values()),
-                sum(building[year].number.medium.values()),
-                sum(building[year].number.deep.values()),
+                building[year].number.bare.sum(),
+                building[year].number.light.sum(),
+                building[year].number.medium.sum(),
+                building[year].number.deep.sum(),
             )
             building_ = building.building
             building_code = str(building_.code)
@@ -95,7 +96,7 @@ def calc_products_total(
                 print(building_.products.get(reno="deep"))
                 input()
 
-                return_[country][building_code] = GroupedProducts("temp", "t")
+                return_[country][building_code] = DenseProducts("temp", "t")
                 return_[country][building_code] += building_.products.get()
 
             elif detail == Detail.COMPONENT:
@@ -105,11 +106,11 @@ def calc_products_total(
                     if building_code not in return_[country]:
                         return_[country][building_code] = {}
                     if component not in return_[country][building_code]:
-                        return_[country][building_code][component] = GroupedProducts(
-                            "temp", "t"
-                        )
-                    return_[country][building_code][component] += (
-                        grouped_products * sum(options) if grouped_products else None
+                        return_[country][building_code][component] = flow.target()
+                    flow.add(
+                        return_[country][building_code][component],
+                        grouped_products,
+                        sum(options),
                     )
 
                 for quantities, reno in zip(options[1:], ["light", "medium", "deep"]):
@@ -121,12 +122,12 @@ def calc_products_total(
                         detail=Detail.COMPONENT, reno=reno
                     ).items():
                         if component not in return_[country][building_code]:
-                            return_[country][building_code][component] = (
-                                GroupedProducts("temp", "t")
-                            )
+                            return_[country][building_code][component] = flow.target()
 
-                        return_[country][building_code][component] += (
-                            grouped_products * quantities if grouped_products else None
+                        flow.add(
+                            return_[country][building_code][component],
+                            grouped_products,
+                            quantities,
                         )
 
                 for component, grouped_products in building_.products.get(
@@ -135,53 +136,41 @@ def calc_products_total(
                     if building_code not in return_[country]:
                         return_[country][building_code] = {}
                     if component not in return_[country][building_code]:
-                        return_[country][building_code][component] = GroupedProducts(
-                            "temp", "t"
-                        )
-                    return_[country][building_code][component] -= (
-                        grouped_products * sum(options[1:])
-                        if grouped_products
-                        else None
+                        return_[country][building_code][component] = flow.target()
+                    flow.sub(
+                        return_[country][building_code][component],
+                        grouped_products,
+                        sum(options[1:]),
                     )
-                
+
                 for hss_, amount_ in building_.hs.getHeatingsystems(
-                    [sum(building.number.hs_old.values()), 0]
+                    [building.number.hs_old.sum(), 0]
                 )[0].items():
                     if "Heating System" not in return_[country][building_code]:
-                        return_[country][building_code]["Heating System"] = (
-                            GroupedProducts("temp", "t")
-                        )
-                    return_[country][building_code]["Heating System"] += (
-                        building_.hs.currentMap[hss_].grouped_products
-                        * amount_
-                        * building_.floor_area["Net Heated"]
-                        * (
-                            1 + scenario["NFA"]["heated"]
-                            if scenario["NFA"]["heated"]
-                            else 1
-                        )
+                        return_[country][building_code]["Heating System"] = flow.target()
+                    flow.add(
+                        return_[country][building_code]["Heating System"],
+                        building_.hs.currentMap[hss_].grouped_products,
+                        amount_,
+                        building_.floor_area["Net Heated"],
+                        nfa_factor(scenario),
                     )
                 for hss_, amount_ in building_.hs.getHeatingsystems(
-                    [0, sum(building.number.hs_new.values())]
+                    [0, building.number.hs_new.sum()]
                 )[1].items():
                     if "Heating System" not in return_[country][building_code]:
-                        return_[country][building_code]["Heating System"] = (
-                            GroupedProducts("temp", "t")
-                        )
-                    return_[country][building_code]["Heating System"] += (
-                        building_.hs.exchangeMap[hss_].grouped_products
-                        * amount_
-                        * building_.floor_area["Net Heated"]
-                        * (
-                            1 + scenario["NFA"]["heated"]
-                            if scenario["NFA"]["heated"]
-                            else 1
-                        )
+                        return_[country][building_code]["Heating System"] = flow.target()
+                    flow.add(
+                        return_[country][building_code]["Heating System"],
+                        building_.hs.exchangeMap[hss_].grouped_products,
+                        amount_,
+                        building_.floor_area["Net Heated"],
+                        nfa_factor(scenario),
                     )
 
     # temp_ = remove_empty(adapt_detail(return_, detail))
     # assert isinstance(temp_, dict)
-    return return_
+    return flow.fill(return_)
 
 
 def calc_products_construction(
@@ -191,16 +180,17 @@ def calc_products_construction(
     if detail.value > Detail.COMPONENT.value:
         detail = Detail.COMPONENT
 
+    flow = MaterialFlow(INTENSITY_MATRIX)
     DISTRIBUTION = productDistribution(scenario["alt comp"], scenario["no basement"])
     if detail == Detail.GROUPED:
-        temp_ = GroupedProducts("Temp", "t")
+        temp_ = flow.target()
     if detail.value > Detail.GROUPED.value:
         temp_ = {}
 
     for country, countryData in stock.items():
 
         if detail == Detail.COUNTRY:
-            temp_[country] = GroupedProducts("Temp", "t")
+            temp_[country] = flow.target()
         if detail.value > Detail.COUNTRY.value:
             temp_[country] = {}
         for building in countryData.values():
@@ -210,7 +200,7 @@ def calc_products_construction(
                 continue
 
             if detail == Detail.TYPOLOGY:
-                temp_[country][building_code] = GroupedProducts("Temp", "t")
+                temp_[country][building_code] = flow.target()
             if detail.value > Detail.TYPOLOGY.value:
                 temp_[country][building_code] = {}
 
@@ -218,25 +208,22 @@ def calc_products_construction(
                 building[year].number.total[year], DISTRIBUTION
             ).items():
                 if detail == Detail.GROUPED:
-                    temp_ += (
-                        building_.products.get(
-                            basement=subTypo_[1] == "b", altComp=subTypo_[0]
-                        )
-                        * amount_
+                    flow.add(
+                        temp_,
+                        building_.products.get(basement=subTypo_[1] == "b", altComp=subTypo_[0]),
+                        amount_,
                     )
                 if detail == Detail.COUNTRY:
-                    temp_[country] += (
-                        building_.products.get(
-                            basement=subTypo_[1] == "b", altComp=subTypo_[0]
-                        )
-                        * amount_
+                    flow.add(
+                        temp_[country],
+                        building_.products.get(basement=subTypo_[1] == "b", altComp=subTypo_[0]),
+                        amount_,
                     )
                 if detail == Detail.TYPOLOGY:
-                    temp_[country][building_code] += (
-                        building_.products.get(
-                            basement=subTypo_[1] == "b", altComp=subTypo_[0]
-                        )
-                        * amount_
+                    flow.add(
+                        temp_[country][building_code],
+                        building_.products.get(basement=subTypo_[1] == "b", altComp=subTypo_[0]),
+                        amount_,
                     )
                 if detail == Detail.COMPONENT:
                     for component_, products_ in building_.products.get(
@@ -245,63 +232,30 @@ def calc_products_construction(
                         detail=Detail.COMPONENT,
                     ).items():
                         if component_ not in temp_[country][building_code]:
-                            temp_[country][building_code][component_] = GroupedProducts(
-                                "temp", "t"
-                            )
-                        temp_[country][building_code][component_] += products_ * amount_
+                            temp_[country][building_code][component_] = flow.target()
+                        flow.add(temp_[country][building_code][component_], products_, amount_)
 
             for hss_, amount_ in building_.hs.getHeatingsystems(
                 [building[year].number.total[year], 0]
             )[0].items():
                 if detail == Detail.GROUPED:
-                    temp_ += (
-                        building_.hs.currentMap[hss_].grouped_products
-                        * amount_
-                        * building_.floor_area["Net Heated"]
-                        * (
-                            1 + scenario["NFA"]["heated"]
-                            if scenario["NFA"]["heated"]
-                            else 1
-                        )
-                    )
+                    target_ = temp_
                 if detail == Detail.COUNTRY:
-                    temp_[country] += (
-                        building_.hs.currentMap[hss_].grouped_products
-                        * amount_
-                        * building_.floor_area["Net Heated"]
-                        * (
-                            1 + scenario["NFA"]["heated"]
-                            if scenario["NFA"]["heated"]
-                            else 1
-                        )
-                    )
+                    target_ = temp_[country]
                 if detail == Detail.TYPOLOGY:
-                    temp_[country][building_code] += (
-                        building_.hs.currentMap[hss_].grouped_products
-                        * amount_
-                        * building_.floor_area["Net Heated"]
-                        * (
-                            1 + scenario["NFA"]["heated"]
-                            if scenario["NFA"]["heated"]
-                            else 1
-                        )
-                    )
+                    target_ = temp_[country][building_code]
                 if detail == Detail.COMPONENT:
                     if "Heating System" not in temp_[country][building_code]:
-                        temp_[country][building_code]["Heating System"] = (
-                            GroupedProducts("temp", "t")
-                        )
-                    temp_[country][building_code]["Heating System"] += (
-                        building_.hs.currentMap[hss_].grouped_products
-                        * amount_
-                        * building_.floor_area["Net Heated"]
-                        * (
-                            1 + scenario["NFA"]["heated"]
-                            if scenario["NFA"]["heated"]
-                            else 1
-                        )
-                    )
-    return remove_empty(temp_)
+                        temp_[country][building_code]["Heating System"] = flow.target()
+                    target_ = temp_[country][building_code]["Heating System"]
+                flow.add(
+                    target_,
+                    building_.hs.currentMap[hss_].grouped_products,
+                    amount_,
+                    building_.floor_area["Net Heated"],
+                    nfa_factor(scenario),
+                )
+    return remove_empty(flow.fill(temp_))
 
 
 def calc_products_demolition(stock: dict, numbers: dict, *, detail: Detail) -> dict:
@@ -309,22 +263,23 @@ def calc_products_demolition(stock: dict, numbers: dict, *, detail: Detail) -> d
     if detail.value > Detail.COMPONENT.value:
         detail = Detail.COMPONENT
 
+    flow = MaterialFlow(INTENSITY_MATRIX)
     if detail == Detail.GROUPED:
-        temp_ = GroupedProducts("Temp", "t")
+        temp_ = flow.target()
     if detail.value > Detail.GROUPED.value:
         temp_ = {}
 
     for country, countryData in numbers.items():
 
         if detail == Detail.COUNTRY:
-            temp_[country] = GroupedProducts("Temp", "t")
+            temp_[country] = flow.target()
         if detail.value > Detail.COUNTRY.value:
             temp_[country] = {}
 
         for building_code, demoNr in countryData.items():
             building_ = stock[country][building_code].building
             if detail == Detail.TYPOLOGY:
-                temp_[country][building_code] = GroupedProducts("Temp", "t")
+                temp_[country][building_code] = flow.target()
             if detail.value > Detail.TYPOLOGY.value:
                 temp_[country][building_code] = {}
 
@@ -332,20 +287,20 @@ def calc_products_demolition(stock: dict, numbers: dict, *, detail: Detail) -> d
                 continue
 
             if detail != Detail.COMPONENT:
-                bld_temp_ = GroupedProducts("Temp", "t")
-                bld_temp_ += building_.products.get() * sum(demoNr)
+                bld_temp_ = flow.target()
+                flow.add(bld_temp_, building_.products.get(), sum(demoNr))
                 if any(demoNr[1:]):
-                    bld_temp_ -= building_.products.get(reno="out") * sum(demoNr[1:])
-                    bld_temp_ += building_.products.get(reno="light") * demoNr[1]
-                    bld_temp_ += building_.products.get(reno="medium") * demoNr[2]
-                    bld_temp_ += building_.products.get(reno="deep") * demoNr[3]
+                    flow.sub(bld_temp_, building_.products.get(reno="out"), sum(demoNr[1:]))
+                    flow.add(bld_temp_, building_.products.get(reno="light"), demoNr[1])
+                    flow.add(bld_temp_, building_.products.get(reno="medium"), demoNr[2])
+                    flow.add(bld_temp_, building_.products.get(reno="deep"), demoNr[3])
 
             if detail == Detail.GROUPED:
-                temp_ += bld_temp_
+                flow.merge(temp_, bld_temp_)
             if detail == Detail.COUNTRY:
-                temp_[country] += bld_temp_
+                flow.merge(temp_[country], bld_temp_)
             if detail == Detail.TYPOLOGY:
-                temp_[country][building_code] += bld_temp_
+                flow.merge(temp_[country][building_code], bld_temp_)
             if detail == Detail.COMPONENT:
                 temp_out = building_.products.get(reno="out", detail=Detail.COMPONENT)
                 temp_light = building_.products.get(
@@ -359,31 +314,14 @@ def calc_products_demolition(stock: dict, numbers: dict, *, detail: Detail) -> d
                     detail=Detail.COMPONENT
                 ).items():
                     assert isinstance(temp_, dict)
-                    temp_[country][building_code][comp] = GroupedProducts("Temp", "t")
-                    temp_[country][building_code][comp] += (products * sum(demoNr)) if products else None
-                    temp_[country][building_code][comp] += (
-                        temp_out[comp] * sum(demoNr[1:])
-                        if comp in temp_out and temp_out[comp]
-                        else None
-
-                    )
-                    temp_[country][building_code][comp] += (
-                        temp_light[comp] * demoNr[1]
-                        if comp in temp_light and temp_light[comp]
-                        else None
-                    )
-                    temp_[country][building_code][comp] += (
-                        temp_medium[comp] * demoNr[2]
-                        if comp in temp_medium and temp_medium[comp]
-                        else None
-                    )
-                    temp_[country][building_code][comp] += (
-                        temp_deep[comp] * demoNr[3]
-                        if comp in temp_deep and temp_deep[comp]
-                        else None
-                    )
+                    target_ = temp_[country][building_code][comp] = flow.target()
+                    flow.add(target_, products, sum(demoNr))
+                    flow.add(target_, temp_out.get(comp), sum(demoNr[1:]))
+                    flow.add(target_, temp_light.get(comp), demoNr[1])
+                    flow.add(target_, temp_medium.get(comp), demoNr[2])
+                    flow.add(target_, temp_deep.get(comp), demoNr[3])
 
-    return remove_empty(temp_)
+    return remove_empty(flow.fill(temp_))
 
 
 def calc_products_replacements(
@@ -394,13 +332,13 @@ def calc_products_replacements(
         detail = Detail.COMPONENT
 
     if detail == Detail.GROUPED:
-        temp_ = GroupedProducts("Temp", "t")
+        temp_ = DenseProducts("Temp", "t")
     if detail.value > Detail.GROUPED.value:
         temp_ = {}
 
     for country, countryData in stock.items():
         if detail == Detail.COUNTRY:
-            temp_[country] = GroupedProducts("Temp", "t")
+            temp_[country] = DenseProducts("Temp", "t")
         if detail.value > Detail.COUNTRY.value:
             temp_[country] = {}
         for (code_, building), hss_info in zip(
@@ -409,12 +347,12 @@ def calc_products_replacements(
             building_ = building.building
             hss_ = hss[country][code_] if code_ in hss[country] else None
             if detail == Detail.TYPOLOGY:
-                temp_[country][code_] = GroupedProducts("Temp", "t")
+                temp_[country][code_] = DenseProducts("Temp", "t")
             if detail.value > Detail.TYPOLOGY.value:
                 temp_[country][code_] = {}
 
             if detail != Detail.COMPONENT:
-                replaceable = building_.products.get(replace=True).dictify()
+                replaceable = building_.products.dictify(replace=True)
 
                 for year_, amount_ in building.number.total.items():
                     age_ = year - int(year_)
@@ -439,12 +377,9 @@ def calc_products_replacements(
                             )
 
             if detail == Detail.COMPONENT:
-                replaceable = {
-                    comp: compData.dictify() if compData else None
-                    for comp, compData in building_.products.get(
-                        replace=True, detail=Detail.COMPONENT
-                    ).items()
-                }
+                replaceable = building_.products.dictify(
+                    replace=True, detail=Detail.COMPONENT
+                )
                 for year_, amount_ in building.number.total.items():
                     age_ = year - int(year_)
                     for comp, compReplace in replaceable.items():
@@ -457,7 +392,7 @@ def calc_products_replacements(
                             if age_ % products[product].serviceLife:
                                 continue
                             if comp not in temp_[country][code_]:
-                                temp_[country][code_][comp] = GroupedProducts(
+                                temp_[country][code_][comp] = DenseProducts(
                                     "Temp", "t"
                                 )
                             temp_[country][code_][comp] += (
@@ -489,7 +424,7 @@ def calc_products_replacements(
 
                 if detail == Detail.COMPONENT:
                     if "Heating System" not in temp_[country][code_]:
-                        temp_[country][code_]["Heating System"] = GroupedProducts(
+                        temp_[country][code_]["Heating System"] = DenseProducts(
                             "Temp", "t"
                         )
                     temp_[country][code_]["Heating System"] += temp__
@@ -517,7 +452,7 @@ def calc_products_replacements(
                     temp_[country][code_] += temp__
                 if detail == Detail.COMPONENT:
                     if "Heating System" not in temp_[country][code_]:
-                        temp_[country][code_]["Heating System"] = GroupedProducts(
+                        temp_[country][code_]["Heating System"] = DenseProducts(
                             "Temp", "t"
                         )
                     temp_[country][code_]["Heating System"] += temp__
@@ -532,16 +467,15 @@ def calc_products_refurbishment(
     if detail.value > Detail.COMPONENT.value:
         detail = Detail.COMPONENT
 
+    flow = MaterialFlow(INTENSITY_MATRIX)
     if detail == Detail.GROUPED:
-        temp_in, temp_out = GroupedProducts("Temp", "t"), GroupedProducts("Temp", "t")
+        temp_in, temp_out = flow.target(), flow.target()
     if detail.value > Detail.GROUPED.value:
         temp_in, temp_out = {}, {}
 
     for country, countryData in stock.items():
         if detail == Detail.COUNTRY:
-            temp_in[country], temp_out[country] = GroupedProducts(
-                "Temp", "t"
-            ), GroupedProducts("Temp", "t")
+            temp_in[country], temp_out[country] = flow.target(), flow.target()
         if detail.value > Detail.COUNTRY.value:
             temp_in[country], temp_out[country] = {}, {}
 
@@ -552,36 +486,34 @@ def calc_products_refurbishment(
             if not any(number):
                 continue
             if detail == Detail.TYPOLOGY:
-                temp_in[country][code_], temp_out[country][code_] = GroupedProducts(
-                    "Temp", "t"
-                ), GroupedProducts("Temp", "t")
+                temp_in[country][code_], temp_out[country][code_] = flow.target(), flow.target()
             if detail.value > Detail.TYPOLOGY.value:
                 temp_in[country][code_], temp_out[country][code_] = {}, {}
 
             building_ = building.building
             if detail != Detail.COMPONENT:
-                temp_1_ = GroupedProducts("Temp", "t")
-                temp_2_ = GroupedProducts("Temp", "t")
-                temp_1_ -= building_.products.get(reno="out") * number[0]
-                temp_2_ += building_.products.get(reno="light") * number[1]
-                temp_2_ += building_.products.get(reno="medium") * number[2]
-                temp_2_ += building_.products.get(reno="deep") * number[3]
+                temp_1_ = flow.target()
+                temp_2_ = flow.target()
+                flow.sub(temp_1_, building_.products.get(reno="out"), number[0])
+                flow.add(temp_2_, building_.products.get(reno="light"), number[1])
+                flow.add(temp_2_, building_.products.get(reno="medium"), number[2])
+                flow.add(temp_2_, building_.products.get(reno="deep"), number[3])
 
             if detail == Detail.GROUPED:
-                assert isinstance(temp_in, GroupedProducts)
-                assert isinstance(temp_out, GroupedProducts)
-                temp_in += temp_2_
-                temp_out += temp_1_
+                assert isinstance(temp_in, int)
+                assert isinstance(temp_out, int)
+                flow.merge(temp_in, temp_2_)
+                flow.merge(temp_out, temp_1_)
             if detail == Detail.COUNTRY:
                 assert isinstance(temp_in, dict)
                 assert isinstance(temp_out, dict)
-                temp_in[country] += temp_2_
-                temp_out[country] += temp_1_
+                flow.merge(temp_in[country], temp_2_)
+                flow.merge(temp_out[country], temp_1_)
             if detail == Detail.TYPOLOGY:
                 assert isinstance(temp_in, dict)
                 assert isinstance(temp_out, dict)
-                temp_in[country][code_] += temp_2_
-                temp_out[country][code_] += temp_1_
+                flow.merge(temp_in[country][code_], temp_2_)
+                flow.merge(temp_out[country][code_], temp_1_)
             if detail == Detail.COMPONENT:
 
                 for letter, multiplier in zip(
@@ -618,44 +550,44 @@ def calc_products_refurbishment(
                         assert isinstance(temp_in, dict)
                         assert isinstance(temp_out, dict)
 
-
-                        temp_in[country][code_][comp] = GroupedProducts("Temp", "t")
-                        temp_out[country][code_][comp] = GroupedProducts("Temp", "t")
-                        temp_out[country][code_][comp] += products * (number[0] * -1) * multiplier if products else None
-                        temp_in[country][code_][comp] += (
-                            temp_light[comp] * number[1] * multiplier if comp in temp_light and temp_light[comp] else None
-                        )
-                        temp_in[country][code_][comp] += (
-                            temp_medium[comp] * number[2] * multiplier if comp in temp_medium and temp_medium[comp] else None
-                        )
-                        temp_in[country][code_][comp] += (
-                            temp_deep[comp] * number[3] * multiplier if comp in temp_deep and temp_deep[comp] else None
-                        )
+                        temp_in[country][code_][comp] = flow.target()
+                        temp_out[country][code_][comp] = flow.target()
+                        flow.add(temp_out[country][code_][comp], products, number[0] * -1, multiplier)
+                        flow.add(temp_in[country][code_][comp], temp_light.get(comp), number[1], multiplier)
+                        flow.add(temp_in[country][code_][comp], temp_medium.get(comp), number[2], multiplier)
+                        flow.add(temp_in[country][code_][comp], temp_deep.get(comp), number[3], multiplier)
             if "Heating System" not in temp_out[country][code_]:
-                temp_out[country][code_]["Heating System"] = GroupedProducts(
-                    "Temp", "t"
-                )
+                temp_out[country][code_]["Heating System"] = flow.target()
 
             if "Heating System" not in temp_in[country][code_]:
-                temp_in[country][code_]["Heating System"] = GroupedProducts(
-                    "Temp", "t"
-                )
+                temp_in[country][code_]["Heating System"] = flow.target()
             
             if str(building_.code) not in hss['AT']: continue
             for hss_, amount_ in building_.hs.getHeatingsystems([hss['AT'][str(building_.code)][1],0])[0].items():
                 if not amount_: continue
-                temp_out[country][code_]["Heating System"] += building_.hs.currentMap[hss_].grouped_products * amount_ * building_.floor_area['Net Heated'] * (1 + scenario["NFA"]['heated'] if scenario["NFA"]['heated'] else 1)
+                flow.add(
+                    temp_out[country][code_]["Heating System"],
+                    building_.hs.currentMap[hss_].grouped_products,
+                    amount_,
+                    building_.floor_area['Net Heated'],
+                    nfa_factor(scenario),
+                )
         
             for hss_, amount_ in building_.hs.getHeatingsystems([0,hss['AT'][str(building_.code)][1]])[1].items():
                 if not amount_: continue
-                temp_in[country][code_]["Heating System"] += (
-                    building_.hs.exchangeMap[hss_].grouped_products * 
-                    (amount_ * 
-                    building_.floor_area['Net Heated'] * 
-                    (1 + scenario["NFA"]['heated'] if scenario["NFA"]['heated'] else 1))
+                flow.add(
+                    temp_in[country][code_]["Heating System"],
+                    building_.hs.exchangeMap[hss_].grouped_products,
+                    amount_ * building_.floor_area['Net Heated'] * nfa_factor(scenario),
                 )
 
-    return remove_empty(temp_in), remove_empty(temp_out)
+    temp_ = flow.fill({"in": temp_in, "out": temp_out})
+    return remove_empty(temp_["in"]), remove_empty(temp_["out"])
+
+
+def nfa_factor(scenario: dict) -> float:
+    """This function returns the factor for the heated net floor area of the scenario."""
+    return 1 + scenario["NFA"]["heated"] if scenario["NFA"]["heated"] else 1
 
 
 def productDistribution(altComp: dict, basement: float) -> dict:
@@ -9,10 +9,10 @@ License: See LICENSE.md
 
 """
 
-from ..data_types import GroupedProducts
-from ..variables import adapt_detail, Detail
+import numpy as np
 
-import copy
+from ..data_types import DenseProducts, RecyclingMatrix
+from ..variables import Detail
 
 RECYCLING_FACTORS = {
     'HO' : {
@@ -52,11 +52,34 @@ RECYCLING_FACTORS = {
     }
 }
 
+RECYCLING_MATRIX = RecyclingMatrix(RECYCLING_FACTORS)
+
+def total_vector(data) -> np.ndarray | None:
+    """This function adds up the product vectors of a nested dictionary, level by level like the
+    reduction to the grouped detail, without changing any of the products."""
+    if isinstance(data, DenseProducts):
+        data._fit()
+        return data.vector
+    if not isinstance(data, dict):
+        if not data:
+            return None
+        products = DenseProducts("Temp", "t")
+        products += data
+        return products.vector
+    total = None
+    for value in data.values():
+        vector = total_vector(value)
+        if vector is not None:
+            total = vector if total is None else total + vector
+    return total
+
 def calcDemoRecycling(products: dict, scenario: dict, detail: Detail) -> dict:
-    """This function calculates the recycling."""
+    """This function calculates the recycling. The recycled share of the recyclable products of
+    all components is split off at once with the recycling matrix."""
 
     return_rec = {}
     return_out = {}
+    keys, leaves = [], []
 
     for country, countryData in products.items():
         return_out[country], return_rec[country] = {}, {}
@@ -66,40 +89,28 @@ def calcDemoRecycling(products: dict, scenario: dict, detail: Detail) -> dict:
             for component, compData in typoData.items():
                 if compData.empty(): continue
                 if not compData: continue
-                return_out[country][typology][component], return_rec[country][typology][component] = GroupedProducts("Temp", "t"), GroupedProducts("Temp", "t")
-                for product, quantity in compData.dictify().items():
-                    
-                    if product[:2] in RECYCLING_FACTORS or product[:4] in RECYCLING_FACTORS or product in RECYCLING_FACTORS:
-                        return_rec[country][typology][component] += (product, quantity * scenario['recycling'])
-                        return_out[country][typology][component] += (product, quantity * (1-scenario['recycling']))
-                    else:
-                        return_out[country][typology][component] += (product, quantity)
+                keys.append((country, typology, component))
+                leaves.append(compData)
+
+    recycled, remaining = RECYCLING_MATRIX.split(leaves, scenario['recycling'])
+    for (country, typology, component), rec, out in zip(keys, recycled, remaining):
+        return_rec[country][typology][component], return_out[country][typology][component] = rec, out
 
     return return_rec, return_out
 
 def calcConstructionRecycling(construction, demolition, detail) -> dict:
-    """"""
+    """This function substitutes the share of the construction products that is covered by the
+    recycled demolition products with their recycled products. The share of every recycled group
+    is taken from the totals, so the products do not need to be copied and reduced."""
     return_con = {}
+    keys, leaves = [], []
 
-    con_prods = adapt_detail(copy.deepcopy(construction), Detail.GROUPED)
-    decon_prods = adapt_detail(copy.deepcopy(demolition), Detail.GROUPED)
-
-    reducers = {}
-    for recycledProd, goalProd in RECYCLING_FACTORS.items():
-        currentConValue = 0
-
-
-        for prod in goalProd:
-            currentConValue += sum(con_prods.getProducts(prod).values())
-
-        currentDecon = decon_prods.getProducts(recycledProd)
-        currentDeconValue = sum(currentDecon.values())
-
-        if currentConValue == 0:
-            reducers[recycledProd] = 0
-        else:
-            reducers[recycledProd] = (currentDeconValue/currentConValue if currentDeconValue/currentConValue < 1 else 1)
-
+    con_total = total_vector(construction)
+    decon_total = total_vector(demolition)
+    reducers = RECYCLING_MATRIX.reducers(
+        con_total if con_total is not None else np.zeros(0),
+        decon_total if decon_total is not None else np.zeros(0),
+    )
 
     for country, countryData in construction.items():
         return_con[country] = {}
@@ -107,17 +118,12 @@ def calcConstructionRecycling(construction, demolition, detail) -> dict:
             if not typoData: continue
             return_con[country][typology] = {}
             for component, compData in typoData.items():
-                return_con[country][typology][component] = GroupedProducts("Temp", "t")
-                for product, quantity in compData.dictify().items():
-                    found = False  
-                    for recycledProd, goalProd in RECYCLING_FACTORS.items():
-                        if found: break
-                        if product in goalProd:
-                            found = True
-                            return_con[country][typology][component] += (product, quantity * (1 - reducers[recycledProd]))
-                            return_con[country][typology][component] += (goalProd[product][0], quantity * reducers[recycledProd]) if goalProd[product][0] else (product, quantity * reducers[recycledProd])
-                            break
-                    if not found:   return_con[country][typology][component] += (product, quantity)
-
-
-    return return_con
\ No newline at end of file
+                keys.append((country, typology, component))
+                leaves.append(compData)
+
+    for (country, typology, component), products in zip(
+        keys, RECYCLING_MATRIX.substitute(leaves, reducers)
+    ):
+        return_con[country][typology][component] = products
+
+    return return_con
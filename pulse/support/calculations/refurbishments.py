@@ -23,8 +23,9 @@ import logging
 from ..variables import TYPOLOGIES
 
 # FUNCTIONS
-from ..variables import remove_empty, adapt_detail
-from ..file_handling import import_json
+from ..variables import remove_empty
+from ..data_types import adapt_output
+from ..file_handling import import_shared_json
 
 # CLASSES
 from ..variables import Detail
@@ -36,7 +37,6 @@ REFURBISHMENT = (0.009, 0.005, 0.001)
 
 REFURBISHMENT1 = np.array([0.009, 0.005, 0.001])
 
-REFURBISHMENT_STATISTIC = None
 NR_RENO_OPTIONS = 4
 
 
@@ -48,9 +48,7 @@ def calc_refurbishments(stock: dict, scenario: dict, year: int, detail: Detail):
 
     return_ = {}
 
-    global REFURBISHMENT_STATISTIC
-    if not REFURBISHMENT_STATISTIC:
-        REFURBISHMENT_STATISTIC = import_json(title="renovation", location="statistics")
+    refurbishment_statistic = import_shared_json(title="renovation", location="statistics")
 
     for country, countryData in stock.items():
         if country not in return_:
@@ -60,7 +58,7 @@ def calc_refurbishments(stock: dict, scenario: dict, year: int, detail: Detail):
             relevant = list(filter(lambda a: typology in a, countryData.keys()))
             total = sum(
                 [
-                    sum(s.number.total.values())
+                    s.number.get_total()
                     for name, s in countryData.items()
                     if name in relevant
                 ]
@@ -88,7 +86,7 @@ def calc_refurbishments(stock: dict, scenario: dict, year: int, detail: Detail):
             for r in relevant:
                 multiplier = 0
                 if r[7:11] not in ["2001", "2010"]:
-                    multiplier = REFURBISHMENT_STATISTIC[typology][r[7:11]]
+                    multiplier = refurbishment_statistic[typology][r[7:11]]
                 l, m, d = (
                     int(light * multiplier + 0.5),
                     int(medium * multiplier + 0.5),
@@ -110,7 +108,7 @@ def calc_refurbishments(stock: dict, scenario: dict, year: int, detail: Detail):
             relevant = list(filter(lambda a: typology in a, countryData.keys()))
             total = sum(
                 [
-                    sum(s.number.total.values())
+                    s.number.get_total()
                     for name, s in countryData.items()
                     if name in relevant
                 ]
@@ -120,9 +118,9 @@ def calc_refurbishments(stock: dict, scenario: dict, year: int, detail: Detail):
                 multiplier = 0
                 if r[7:11] not in ["2000", "2011"]:
                     multiplier = (
-                        REFURBISHMENT_STATISTIC[typology][r[7:11]]
+                        refurbishment_statistic[typology][r[7:11]]
                         if typology != "OTH"
-                        else REFURBISHMENT_STATISTIC["TRA"][r[7:11]]
+                        else refurbishment_statistic["TRA"][r[7:11]]
                     )
                 l, m, d = (
                     int(light * multiplier + 0.5),
@@ -133,5 +131,5 @@ def calc_refurbishments(stock: dict, scenario: dict, year: int, detail: Detail):
                     countryData[r].development[year].calcRefurbishment(l, m, d)
                 )
 
-    return remove_empty(adapt_detail(return_, detail))
+    return remove_empty(adapt_output(return_, detail))
 
@@ -16,11 +16,10 @@ import logging
 # --------------------------------------------------------------------------------------------------
 # Imports Local Libraries
 # --------------------------------------------------------------------------------------------------
-from ..data_types import GroupedProducts
-from ..variables import Detail, adapt_detail, remove_empty, prime
+from ..data_types import GroupedProducts, DenseProducts, CalculationContext, adapt_output
+from ..variables import Detail, remove_empty, prime
 
 MULTIPLIER = 0.17
-LIFETIMES = None
 HSS_OPTIONS = 3
 # --------------------------------------------------------------------------------------------------
 # Global Variables
@@ -46,7 +45,7 @@ def calc_one_replacement(
     if prime(age):
         return None
 
-    return_ = GroupedProducts("Repair Products", "t")
+    return_ = DenseProducts("Repair Products", "t")
 
     for product, amount in possibleProducts.dictify().items():
         assert (
@@ -72,7 +71,7 @@ def clean(input_: dict | GroupedProducts) -> dict:
             if clean_:
                 output_[key] = clean_
         return output_
-    if type(input_) is GroupedProducts:
+    if isinstance(input_, GroupedProducts):
         output_ = {}
         for product, amount in input_.dictify().items():
             output_[product] = amount
@@ -80,13 +79,21 @@ def clean(input_: dict | GroupedProducts) -> dict:
     raise TypeError
 
 
-def calc_year_replacement(stock: dict, year: int, products: dict, detail: Detail) -> dict:
-    """This function calculates the replaced products in one year."""
+def calc_year_replacement(
+    stock: dict,
+    year: int,
+    products: dict,
+    detail: Detail,
+    context: CalculationContext | None = None,
+) -> dict:
+    """This function calculates the replaced products in one year. The service lifes are taken
+    from the context, if one is given, so they are only collected once per scenario."""
     output_ = {}
 
-    global LIFETIMES
-    if not LIFETIMES:
-        LIFETIMES = {key: product.serviceLife for key, product in products.items()}
+    context = context if context else CalculationContext()
+    if not context.lifetimes:
+        context.lifetimes = {key: product.serviceLife for key, product in products.items()}
+    lifetimes = context.lifetimes
 
     if detail == Detail.GROUPED:
         raise TypeError("Not Supported")
@@ -99,12 +106,12 @@ def calc_year_replacement(stock: dict, year: int, products: dict, detail: Detail
             for year_, amount_ in stockItem.development[year].number.total.items():
                 for component in stock[typology].building.components:
                     if component[0] not in output_[typology]:
-                        output_[typology][component[0]] = GroupedProducts("temp:", "t")
+                        output_[typology][component[0]] = DenseProducts("temp:", "t")
                     if not component[2]:
                         continue
                     if type(component[4]) is not list:
                         temp_ = calc_one_replacement(
-                            component[2].replaceable, LIFETIMES, year - int(year_)
+                            component[2].replaceable, lifetimes, year - int(year_)
                         )
                         if temp_ != None:
                             output_[typology][component[0]] += temp_ * amount_
@@ -134,4 +141,4 @@ def calc_heating_replacement(
                 # Replacements of new heating systems with new heating systems
                 return_[country][typology_][2] += amount_[2]
 
-    return remove_empty(adapt_detail(return_, detail))
+    return remove_empty(adapt_output(return_, detail))
@@ -14,7 +14,8 @@ License: See LICENSE.md
 # --------------------------------------------------------------------------------------------------
 
 # FUNCTIONS
-from ..variables import Detail, adapt_detail, remove_empty
+from ..variables import Detail, remove_empty
+from ..data_types import adapt_output
 
 # --------------------------------------------------------------------------------------------------
 # Global Variables
@@ -73,6 +74,6 @@ def calc_volume(construction: dict, demolition: dict, stock: dict, detail: Detai
                 if demolition
                 else 0
             )
-    return remove_empty(adapt_detail(return_cons, detail)), remove_empty(
-        adapt_detail(return_demo, detail)
+    return remove_empty(adapt_output(return_cons, detail)), remove_empty(
+        adapt_output(return_demo, detail)
     )
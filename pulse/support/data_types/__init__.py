@@ -14,6 +14,16 @@ from .component import Component
 from .building import Building
 from .scenario import Scenario
 from .layered_products import LayeredProducts
-from .stock_item import StockItem
+from .stock_item import StockItem, StockYear
+from .stock_history import StockHistory
 from .grouped_products import GroupedProducts
-from .output_matrix import OutputMatrix
+from .product_registry import ProductRegistry, PRODUCT_REGISTRY
+from .dense_products import DenseProducts
+from .intensity_matrix import IntensityMatrix, MaterialFlow, INTENSITY_MATRIX
+from .output_matrix import OutputMatrix, adapt_output
+from .calculation_context import CalculationContext
+from .catalog import Catalog, freeze_arrays
+from .lca_table import LCATable
+from .characterization_matrix import CharacterizationMatrix
+from .recycling_matrix import RecyclingMatrix
+from .scenario_tree import ScenarioNode, build_scenario_tree
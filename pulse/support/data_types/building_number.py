@@ -10,8 +10,9 @@ License: See LICENSE.md
 Description: This file deals with the data type building components
 """
 # --------------------------------------------------------------------------------------------------
-
-
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import numpy as np
 
 # --------------------------------------------------------------------------------------------------
 # Imports Local Libraries
@@ -36,11 +37,177 @@ DEMO_LEVEL = (
     0,
 )
 
+# The columns of the cohort x state matrix of a building number
+STATES = (
+    "total",
+    "bare",
+    "light",
+    "medium",
+    "deep",
+    "protected",
+    "hs_old",
+    "hs_mid",
+    "hs_new",
+)
+TOTAL, BARE, LIGHT, MEDIUM, DEEP, PROTECTED, HS_OLD, HS_MID, HS_NEW = range(len(STATES))
+
+# The refurbishment states, in the order in which they get demolished
+RENOVATION_STATES = (BARE, LIGHT, MEDIUM, DEEP)
+
+# Rows that get allocated at once, when a new cohort does not fit into the matrix anymore
+GROWTH = 8
+
+
+# --------------------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------------------
+def state_property(state: int) -> property:
+    """This function creates the property exposing one state column as a dictionary like view,
+    keyed by the construction year."""
+
+    def getter(self) -> "CohortView":
+        return CohortView(self, state)
+
+    def setter(self, values: dict) -> None:
+        view = CohortView(self, state)
+        for cohort, value in values.items():
+            view[cohort] = value
+
+    return property(getter, setter)
+
+
+def demolish(numbers: list, rates: list[np.ndarray]) -> list[list[int]]:
+    """This function demolishes the buildings of many building numbers at once. It gives the same
+    results as calling BuildingNumber.demo for every cohort one after the other.\n
+    numbers (list[BuildingNumber]): The building numbers that get demolished.
+    rates (list[np.ndarray]): The demolition rate of every cohort of each building number.\n
+    Returns the demolished bare, light, medium and deep buildings for every building number."""
+    if not numbers:
+        return []
+    cohorts = max(len(number.cohorts) for number in numbers)
+
+    # All building numbers are padded with empty cohorts to form one typology x cohort x state array
+    state = np.zeros((len(numbers), cohorts, len(STATES)), dtype=np.int64)
+    rate = np.zeros((len(numbers), cohorts))
+    for nr, (number, rate_) in enumerate(zip(numbers, rates)):
+        state[nr, : len(number.cohorts)] = number.matrix
+        rate[nr, : len(number.cohorts)] = rate_
+
+    # The fractions of buildings that are not demolished are carried over to the next cohort
+    exact = np.maximum(state[:, :, TOTAL] - state[:, :, PROTECTED], 0) * rate
+    amount = np.zeros((len(numbers), cohorts), dtype=np.int64)
+    overhang = np.zeros(len(numbers))
+    for cohort in range(cohorts):
+        value = exact[:, cohort] + overhang
+        amount[:, cohort] = value.astype(np.int64)
+        overhang = value % 1
+
+    # Cascading from the bare to the refurbished buildings as defined in DEMO_LEVEL
+    before = state[:, :, TOTAL].copy()
+    added = np.zeros((len(numbers), cohorts, len(RENOVATION_STATES)), dtype=np.int64)
+    emptied = np.zeros(added.shape, dtype=np.int64)
+    is_emptied = np.zeros(added.shape, dtype=bool)
+    open_ = np.ones(amount.shape, dtype=bool)
+    net_amount = (amount * DEMO_LEVEL[0] + 0.5).astype(np.int64)
+    for level, state_ in enumerate(RENOVATION_STATES):
+        if level:
+            if not DEMO_LEVEL[level]:
+                break
+            net_amount = np.where(
+                open_,
+                (net_amount / DEMO_LEVEL[level - 1] * DEMO_LEVEL[level] + 0.5).astype(np.int64),
+                net_amount,
+            )
+        available = state[:, :, state_]
+        enough = open_ & (available >= net_amount)
+        empty = open_ & ~enough
+        removed = np.where(enough, net_amount, np.where(empty, available, 0))
+
+        state[:, :, TOTAL] -= removed
+        state[:, :, state_] -= removed
+        added[:, :, level] = np.where(enough, net_amount, 0)
+        emptied[:, :, level] = np.where(empty, removed, 0)
+        is_emptied[:, :, level] = empty
+        net_amount = np.where(empty, net_amount - removed, net_amount)
+        open_ = empty
+
+    # The heating systems are demolished old first, then new
+    demolished = before - state[:, :, TOTAL]
+    hs_old, hs_new = state[:, :, HS_OLD], state[:, :, HS_NEW]
+    sufficient = hs_old >= demolished
+    state[:, :, HS_NEW] = np.where(
+        sufficient, hs_new, np.maximum(hs_new - (demolished - hs_old), 0)
+    )
+    state[:, :, HS_OLD] = np.where(sufficient, hs_old - demolished, 0)
+
+    # An emptied state overwrites the running total of its level instead of adding to it, so only
+    # the last emptied cohort and the cohorts after it count
+    position = np.arange(cohorts)
+    last = np.where(is_emptied, position[None, :, None], -1).max(axis=1)
+    overwritten = np.take_along_axis(emptied, np.maximum(last, 0)[:, None, :], axis=1)[:, 0]
+    after_last = position[None, :, None] > last[:, None, :]
+    totals = np.where(last >= 0, overwritten, 0) + (added * after_last).sum(axis=1)
+
+    for nr, number in enumerate(numbers):
+        number.matrix[:] = state[nr, : len(number.cohorts)]
+    return totals.tolist()
+
+
 # --------------------------------------------------------------------------------------------------
 # Classes
 # --------------------------------------------------------------------------------------------------
+class CohortView:
+    """This is a dictionary like view on one state column of a building number. The keys are the
+    construction years of the cohorts."""
+
+    __slots__ = ("_number", "_state")
+
+    def __init__(self, number, state: int) -> None:
+        """This function initializes the cohort view."""
+        self._number = number
+        self._state = state
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __getitem__(self, cohort) -> int:
+        return int(self._number.matrix[self._number.index[cohort], self._state])
+
+    def __setitem__(self, cohort, value: int) -> None:
+        if cohort not in self._number.index:
+            self._number.add_cohort(cohort)
+        self._number.matrix[self._number.index[cohort], self._state] = value
+
+    def __contains__(self, cohort) -> bool:
+        return cohort in self._number.index
+
+    def __iter__(self):
+        return iter(self._number.cohorts)
+
+    def __len__(self) -> int:
+        return len(self._number.cohorts)
+
+    @property
+    def array(self) -> np.ndarray:
+        """The state column as a writeable array view, ordered like the cohorts."""
+        return self._number.matrix[:, self._state]
+
+    def keys(self) -> list:
+        return list(self._number.cohorts)
+
+    def values(self) -> list[int]:
+        return self.array.tolist()
+
+    def items(self) -> list[tuple]:
+        return list(zip(self._number.cohorts, self.values()))
+
+    def sum(self) -> int:
+        return int(self.array.sum())
+
+
 class BuildingNumber:
-    """This is a class to deal with building number"""
+    """This is a class to deal with building number. The numbers are stored in a single integer
+    matrix, with the cohorts as rows and the states (see STATES) as columns."""
 
     def __init__(self, numbers: dict, years: range, use: str) -> None:
         """This function initializes the building number."""
@@ -55,158 +222,140 @@ class BuildingNumber:
             round(sum(construction.values()), 10) == 1
         ), f"Check the construction statistics. They should add up to 1, but are adding to: {sum(construction.values())}"
 
-        self.total = distribute_fully(numbers["total"], construction)
-        self.bare: dict = distribute_fully(
-            numbers["total"] - numbers["light"] - numbers["medium"] - numbers["deep"],
-            construction,
-        )
-        self.light = distribute_fully(numbers["light"], construction)
-        self.medium = distribute_fully(numbers["medium"], construction)
-        self.deep = distribute_fully(numbers["deep"], construction)
-        self.protected = distribute_fully(numbers["protected"], construction)
-        self.hs_old = distribute_fully(numbers["total"], construction)
-        self.hs_mid = {k: 0 for k in self.hs_old}
-        self.hs_new = {k: 0 for k in self.hs_old}
-
-        # self.demolition =   {k:0 for k in self.total}
-        # self.newRefurb =    {k:[0,0,0] for k in self.total}
+        self.cohorts: list = list(construction)
+        # Cohorts added later on by new constructions are not part of the heating system exchange
+        self.initial_cohorts: int = len(self.cohorts)
+        self.index: dict = {cohort: row for row, cohort in enumerate(self.cohorts)}
+        self._data = np.zeros((len(self.cohorts) + GROWTH, len(STATES)), dtype=np.int64)
+
+        initial = {
+            TOTAL: numbers["total"],
+            BARE: numbers["total"] - numbers["light"] - numbers["medium"] - numbers["deep"],
+            LIGHT: numbers["light"],
+            MEDIUM: numbers["medium"],
+            DEEP: numbers["deep"],
+            PROTECTED: numbers["protected"],
+            HS_OLD: numbers["total"],
+        }
+        for state, number in initial.items():
+            self.matrix[:, state] = list(distribute_fully(number, construction).values())
 
         self.check(throw_error=True)
 
     def __repr__(self) -> str:
+        sums = self.sums()
         return f"{
-            sum(self.total.values()):7,
+            sums[TOTAL]:7,
         } │ {
-            sum(self.bare.values()):7,
-        } │ {sum(self.light.values()):7,} │ {sum(self.medium.values()):7,} │ {sum(self.deep.values()):7,} │ {sum(self.hs_new.values())/sum(self.total.values()) * 100 :3.0f}%"
+            sums[BARE]:7,
+        } │ {sums[LIGHT]:7,} │ {sums[MEDIUM]:7,} │ {sums[DEEP]:7,} │ {sums[HS_NEW]/sums[TOTAL] * 100 :3.0f}%"
+
+    def __deepcopy__(self, memo):
+        new = self.bind(self._data.copy())
+        memo[id(self)] = new
+        return new
+
+    def bind(self, data: np.ndarray) -> "BuildingNumber":
+        """This function returns a building number with the same cohorts as this one, whose matrix
+        is stored in data. data must have at least as many rows as there are cohorts."""
+        new = BuildingNumber.__new__(BuildingNumber)
+        new.cohorts = list(self.cohorts)
+        new.initial_cohorts = self.initial_cohorts
+        new.index = dict(self.index)
+        new._data = data
+        return new
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The cohort x state matrix of the building number."""
+        return self._data[: len(self.cohorts)]
+
+    total = state_property(TOTAL)
+    bare = state_property(BARE)
+    light = state_property(LIGHT)
+    medium = state_property(MEDIUM)
+    deep = state_property(DEEP)
+    protected = state_property(PROTECTED)
+    hs_old = state_property(HS_OLD)
+    hs_mid = state_property(HS_MID)
+    hs_new = state_property(HS_NEW)
+
+    def add_cohort(self, cohort, number: int = 0) -> None:
+        """This function adds a new cohort of bare buildings with an old heating system."""
+        assert cohort not in self.index, f"The cohort {cohort} already exists"
+        if len(self.cohorts) == len(self._data):
+            self._data = np.concatenate(
+                (self._data, np.zeros((GROWTH, len(STATES)), dtype=np.int64))
+            )
+        self.index[cohort] = len(self.cohorts)
+        self.cohorts.append(cohort)
+        self.matrix[-1] = 0
+        self.matrix[-1, [TOTAL, BARE, HS_OLD]] = number
+
+    def sums(self) -> list[int]:
+        """This function returns the sums of all states over the cohorts."""
+        return self.matrix.sum(axis=0).tolist()
 
     def check(self, throw_error=True):
         """This function is checking if everything is valid"""
+        sums = self.sums()
+        valid = sums[BARE] + sums[LIGHT] + sums[MEDIUM] + sums[DEEP] == sums[TOTAL]
         if not throw_error:
-            return sum(
-                [
-                    sum(self.bare.values()),
-                    sum(self.light.values()),
-                    sum(self.medium.values()),
-                    sum(self.deep.values()),
-                ]
-            ) == sum(self.total.values())
-        assert sum(
-            [
-                sum(self.bare.values()),
-                sum(self.light.values()),
-                sum(self.medium.values()),
-                sum(self.deep.values()),
-            ]
-        ) == sum(self.total.values()), "The building numbers dont add up"
-        assert sum(self.hs_old.values()) + sum(self.hs_new.values()) == sum(
-            self.total.values()
-        )
+            return valid
+        assert valid, "The building numbers dont add up"
+        assert sums[HS_OLD] + sums[HS_NEW] == sums[TOTAL]
         return True
 
     def demoHSS(self, year, amount):
         """This function demolishes the heating system adjacent things."""
-        if self.hs_old[year] >= amount:
-            self.hs_old[year] -= amount
-        else:
-            net_amount_ = amount - self.hs_old[year]
-            self.hs_old[year] = 0
-            self.hs_new[year] -= net_amount_
-
-            if self.hs_new[year] < 0:
-                self.hs_new[year] = 0
-
-        # Making sure it doesnt become lower than old
-        if self.hs_new[year] < self.hs_old[year]:
-            self.hs_old[year] = self.hs_old[year]
+        row = self.matrix[self.index[year]]
+        if row[HS_OLD] >= amount:
+            row[HS_OLD] -= amount
+            return
+        row[HS_NEW] = max(row[HS_NEW] - (amount - row[HS_OLD]), 0)
+        row[HS_OLD] = 0
 
     def demo(self, year, amount, total):
-        """Thus function demolishes the buildings"""
-        # DEMOLISH BARE
+        """Thus function demolishes the buildings, starting with the bare ones and cascading to the
+        refurbished ones as defined in DEMO_LEVEL."""
+        row = self.matrix[self.index[year]]
         net_amount = int(amount * DEMO_LEVEL[0] + 0.5)
 
-        if self.bare[year] >= net_amount:
-            self.total[year] -= net_amount
-            self.bare[year] -= net_amount
-            total[0] += net_amount
-            self.demoHSS(year, net_amount)
-            return total
-
-        total[0] = self.bare[year]
-        self.total[year] -= self.bare[year]
-        net_amount -= self.bare[year]
-        self.demoHSS(year, self.bare[year])
-        self.bare[year] = 0
-
-        if not DEMO_LEVEL[1]:
-            return total
-        net_amount = int(net_amount / DEMO_LEVEL[0] * DEMO_LEVEL[1] + 0.5)
-
-        if self.light[year] >= net_amount:
-            self.total[year] -= net_amount
-            self.light[year] -= net_amount
-            total[1] += net_amount
-            self.demoHSS(year, net_amount)
-            return total
-
-        total[1] = self.light[year]
-        self.total[year] -= self.light[year]
-        net_amount -= self.light[year]
-        self.demoHSS(year, self.light[year])
-        self.light[year] = 0
-
-        if not DEMO_LEVEL[2]:
-            return total
-        net_amount = int(net_amount / DEMO_LEVEL[1] * DEMO_LEVEL[2] + 0.5)
-
-        if self.medium[year] >= net_amount:
-            self.total[year] -= net_amount
-            self.medium[year] -= net_amount
-            total[2] += net_amount
-            self.demoHSS(year, net_amount)
-            return total
-
-        total[2] = self.medium[year]
-        self.total[year] -= self.medium[year]
-        net_amount -= self.medium[year]
-        self.demoHSS(year, self.medium[year])
-        self.medium[year] = 0
-
-        if not DEMO_LEVEL[3]:
-            return total
-        net_amount = int(net_amount / DEMO_LEVEL[2] * DEMO_LEVEL[3] + 0.5)
-
-        if self.deep[year] >= net_amount:
-            self.total[year] -= net_amount
-            self.deep[year] -= net_amount
-            total[3] += net_amount
-            self.demoHSS(year, net_amount)
-            return total
-
-        total[3] = self.deep[year]
-        self.total[year] -= self.deep[year]
-        net_amount -= self.deep[year]
-        self.demoHSS(year, self.deep[year])
-        self.deep[year] = 0
+        for level, state in enumerate(RENOVATION_STATES):
+            if level:
+                if not DEMO_LEVEL[level]:
+                    return total
+                net_amount = int(
+                    net_amount / DEMO_LEVEL[level - 1] * DEMO_LEVEL[level] + 0.5
+                )
+
+            available = int(row[state])
+            if available >= net_amount:
+                row[TOTAL] -= net_amount
+                row[state] -= net_amount
+                total[level] += net_amount
+                self.demoHSS(year, net_amount)
+                return total
+
+            total[level] = available
+            row[TOTAL] -= available
+            net_amount -= available
+            self.demoHSS(year, available)
+            row[state] = 0
 
         return total
 
     def listify(self) -> list:
         self.check()
-        return [
-            sum(self.bare.values()),
-            sum(self.light.values()),
-            sum(self.medium.values()),
-            sum(self.deep.values()),
-        ]
+        return self.sums()[BARE : DEEP + 1]
 
     def listify_hss(self) -> list:
-
+        sums = self.sums()
         return [
-            max(sum(self.hs_old.values()) - sum(self.hs_old.values()), 0),
-            min(sum(self.hs_old.values()), sum(self.hs_old.values())),
-            max(sum(self.hs_new.values()), 0),
+            0,
+            sums[HS_OLD],
+            max(sums[HS_NEW], 0),
         ]
 
     def get_total(self) -> int:
-        return sum(self.total.values())
+        return int(self.matrix[:, TOTAL].sum())
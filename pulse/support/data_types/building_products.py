@@ -13,14 +13,22 @@
 # Imports Global Libraries
 # --------------------------------------------------------------------------------------------------
 import logging
+from weakref import WeakKeyDictionary
 
 # --------------------------------------------------------------------------------------------------
 # Imports Local Libraries
 # --------------------------------------------------------------------------------------------------
 from .grouped_products import GroupedProducts
+from .dense_products import DenseProducts
 from .building_components import BuildingComponents
 from ..variables import Detail
 
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+# The results of get and dictify per building products. They are kept per process and outside of
+# the objects, as the building products are part of the read only catalog.
+SELECTIONS: WeakKeyDictionary = WeakKeyDictionary()
 
 # --------------------------------------------------------------------------------------------------
 # Classes
@@ -61,10 +69,10 @@ class BuildingProducts:
             for _b_ in temp_basement:
                 self.products[f"{_c_}{_b_}"] = {}
                 self.products[f"{_c_}{_b_}"]["all"] = {}
-                self.products[f"{_c_}{_b_}"]["all"]["std"] = GroupedProducts(
+                self.products[f"{_c_}{_b_}"]["all"]["std"] = DenseProducts(
                     f"{_c_}{_b_}-all-std", "t"
                 )
-                self.products[f"{_c_}{_b_}"]["all"]["replace"] = GroupedProducts(
+                self.products[f"{_c_}{_b_}"]["all"]["replace"] = DenseProducts(
                     f"{_c_}{_b_}-all-replace", "t"
                 )
 
@@ -93,8 +101,8 @@ class BuildingProducts:
                         else comp_
                     )
 
-                temp_ = GroupedProducts("temp_", "t")
-                replace_ = GroupedProducts("repa_", "t")
+                temp_ = DenseProducts("temp_", "t")
+                replace_ = DenseProducts("repa_", "t")
                 temp_ += comp_.grouped_products * area_
 
                 if u_ in comp_.grouped_products.additions:
@@ -129,8 +137,8 @@ class BuildingProducts:
                     continue
 
                 self.products[f"{_c_}a"][key] = {
-                    "std": GroupedProducts(f"{_c_}a-{key}-std", "t"),
-                    "replace": GroupedProducts(f"{_c_}a-{key}-replace", "t"),
+                    "std": DenseProducts(f"{_c_}a-{key}-std", "t"),
+                    "replace": DenseProducts(f"{_c_}a-{key}-replace", "t"),
                 }
                 self.products[f"{_c_}a"][key]["std"] += temp_
                 self.products[f"{_c_}a"][key]["replace"] += replace_
@@ -138,8 +146,8 @@ class BuildingProducts:
                 if self.altRequirements["basement"][0]:
                     if key != "Foundation" and key != "Retaining walls":
                         self.products[f"{_c_}b"][key] = {
-                            "std": GroupedProducts(f"{_c_}b-{key}-std", "t"),
-                            "replace": GroupedProducts(f"{_c_}b-{key}-replace", "t"),
+                            "std": DenseProducts(f"{_c_}b-{key}-std", "t"),
+                            "replace": DenseProducts(f"{_c_}b-{key}-replace", "t"),
                         }
                         self.products[f"{_c_}b"][key]["std"] += temp_
                         self.products[f"{_c_}b"][key]["replace"] += replace_
@@ -169,10 +177,10 @@ class BuildingProducts:
                 temp_component if renoType in ["light", "medium", "deep"] else ["a"]
             ):
                 self.products[renoType]["all"][_c_] = {}
-                self.products[renoType]["all"][_c_]["std"] = GroupedProducts(
+                self.products[renoType]["all"][_c_]["std"] = DenseProducts(
                     f"{renoType}-all-{_c_}-std", "t"
                 )
-                self.products[renoType]["all"][_c_]["replace"] = GroupedProducts(
+                self.products[renoType]["all"][_c_]["replace"] = DenseProducts(
                     f"{renoType}-all-{_c_}-replace", "t"
                 )
 
@@ -185,8 +193,8 @@ class BuildingProducts:
             )
             if not comp_:
                 continue
-            temp_ = GroupedProducts("temp_", "t")
-            replace_ = GroupedProducts("repa_", "t")
+            temp_ = DenseProducts("temp_", "t")
+            replace_ = DenseProducts("repa_", "t")
             temp_ += comp_.grouped_products * area_
 
             #if f"U-Value: {u_}" in comp_.grouped_products.additions:
@@ -209,20 +217,20 @@ class BuildingProducts:
             if key not in self.products["std"]:
                 self.products["std"][key] = {
                     letter: {
-                        "std": GroupedProducts("Temp", "t"),
-                        "replace": GroupedProducts("Temp", "t"),
+                        "std": DenseProducts("Temp", "t"),
+                        "replace": DenseProducts("Temp", "t"),
                     }
                     for letter in temp_component
                 }
                 self.products["out"][key] = {
                     letter: {
-                        "std": GroupedProducts("Temp", "t"),
-                        "replace": GroupedProducts("Temp", "t"),
+                        "std": DenseProducts("Temp", "t"),
+                        "replace": DenseProducts("Temp", "t"),
                     }
                     for letter in temp_component
                 }
 
-            temp_out = GroupedProducts("temp_out", "t")
+            temp_out = DenseProducts("temp_out", "t")
 
             temp_out += comp_.refurbishment_products * area_
 
@@ -266,8 +274,8 @@ class BuildingProducts:
                             else r_comp_
                         )
 
-                    t_temp_ = GroupedProducts("temp_", "t")
-                    t_replace_ = GroupedProducts("replace_", "t")
+                    t_temp_ = DenseProducts("temp_", "t")
+                    t_replace_ = DenseProducts("replace_", "t")
 
                     t_temp_ += r_comp__.grouped_products * area_
                     t_replace_ += r_comp__.replaceable_products * area_
@@ -282,8 +290,8 @@ class BuildingProducts:
                     if key not in self.products[renoType]:
                         self.products[renoType][key] = {
                             letter: {
-                                "std": GroupedProducts("Temp", "t"),
-                                "replace": GroupedProducts("Temp", "t"),
+                                "std": DenseProducts("Temp", "t"),
+                                "replace": DenseProducts("Temp", "t"),
                             }
                             for letter in temp_component
                         }
@@ -293,8 +301,8 @@ class BuildingProducts:
 
                     if _c_ not in self.products[renoType][key]:
                         self.products[renoType][key][_c_] = {
-                            "std": GroupedProducts("Temp", "t"),
-                            "replace": GroupedProducts("Temp", "t"),
+                            "std": DenseProducts("Temp", "t"),
+                            "replace": DenseProducts("Temp", "t"),
                         }
 
                     self.products[renoType][key][_c_]["std"] += t_temp_
@@ -308,11 +316,11 @@ class BuildingProducts:
             if _c_ not in self.products["std"][key]:
                 self.products["std"][key][_c_] = {}
             if "std" not in self.products["std"][key][_c_]:
-                self.products["std"][key][_c_]["std"] = GroupedProducts(
+                self.products["std"][key][_c_]["std"] = DenseProducts(
                     f"std-{key}-{_c_}-std", "t"
                 )
             if "replace" not in self.products["std"][key][_c_]:
-                self.products["std"][key][_c_]["replace"] = GroupedProducts(
+                self.products["std"][key][_c_]["replace"] = DenseProducts(
                     f"std-{key}-{_c_}-replace", "t"
                 )
 
@@ -336,7 +344,47 @@ class BuildingProducts:
         replace: bool = False,
         detail: Detail = Detail.TYPOLOGY,
     ) -> GroupedProducts | dict[str, GroupedProducts]:
-        """"""
+        """This function returns the products of the building. The results are memoized, the
+        returned products must not be changed by the caller."""
+        cache = SELECTIONS.setdefault(self, {})
+        key = (basement, altComp, reno, replace, detail)
+        if key not in cache:
+            cache[key] = self.select(basement, altComp, reno, replace, detail)
+        return cache[key]
+
+    def dictify(
+        self,
+        basement: bool = False,
+        altComp: str = "a",
+        reno: str = "std",
+        replace: bool = False,
+        detail: Detail = Detail.TYPOLOGY,
+    ) -> dict:
+        """This function returns the products of the building as {product: amount}, or for the
+        component detail as {component: {product: amount} | None}. The results are memoized."""
+        cache = SELECTIONS.setdefault(self, {})
+        key = ("dictify", basement, altComp, reno, replace, detail)
+        if key not in cache:
+            products = self.get(basement, altComp, reno, replace, detail)
+            cache[key] = (
+                {
+                    comp: compData.dictify() if compData else None
+                    for comp, compData in products.items()
+                }
+                if isinstance(products, dict)
+                else products.dictify()
+            )
+        return cache[key]
+
+    def select(
+        self,
+        basement: bool,
+        altComp: str,
+        reno: str,
+        replace: bool,
+        detail: Detail,
+    ) -> GroupedProducts | dict[str, GroupedProducts]:
+        """This function selects the products of the building."""
         if basement:
             assert self.altRequirements["basement"][
                 0
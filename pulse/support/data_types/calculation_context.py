@@ -0,0 +1,106 @@
+# --------------------------------------------------------------------------------------------------
+# calculation_context.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file deals with the data type calculation context
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import logging
+from functools import lru_cache
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from ..variables import Use
+from .lca_table import LCATable
+from .characterization_matrix import CharacterizationMatrix
+from .product_registry import PRODUCT_REGISTRY
+
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+STANDARD_PROSPECTIVE = "SSP2-NDC"
+LCA_CACHE_SIZE = 4
+LCA_FILES = {
+    "A1": "A1A3",
+    "A4": "A4",
+    "A5": "A5C1",
+    "B6": "B6B7B8",
+    "C2": "C2",
+    "C3": "C3C4",
+}
+
+
+# --------------------------------------------------------------------------------------------------
+# Definitions
+# --------------------------------------------------------------------------------------------------
+@lru_cache(maxsize=LCA_CACHE_SIZE)
+def load_lca(prospective: str | None) -> dict[str, LCATable]:
+    """This function loads the lca tables of a prospective scenario. The last LCA_CACHE_SIZE
+    prospective scenarios are kept per process, so scenarios on different prospective scenarios
+    do not evict each other's tables every year."""
+    s = prospective if prospective else STANDARD_PROSPECTIVE
+    return {
+        stage: LCATable.load(f"{s}_{file}", "data/lca") for stage, file in LCA_FILES.items()
+    }
+
+
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
+class CalculationContext:
+    """This class holds the state of one scenario run. Values that are derived from the stock of
+    the scenario (initial population, construction statistics, ...) are stored here instead of in
+    module globals, so scenarios calculated in the same process do not influence each other. The
+    static input tables are only referenced, they are loaded once per process and shared."""
+
+    def __init__(self, name: str = "") -> None:
+        """This function initializes the calculation context.\n
+        name (str): The name of the scenario, only used for logging."""
+        self.name = name
+        self.initial_pop: int = 0
+        self.initial_sm: float = 0
+        self.construction_statistic: dict[Use, dict] = {
+            Use.RESIDENTIAL: {},
+            Use.NON_RESIDENTIAL: {},
+        }
+        self.lifetimes: dict | None = None
+        self.lcaTables: dict[str | None, dict] = {}
+        self.characterizations: dict[tuple[str | None, str], CharacterizationMatrix] = {}
+
+    def __repr__(self) -> str:
+        return f"CalculationContext({self.name})"
+
+    def __getstate__(self) -> dict:
+        """The lca tables are shared input data, they are loaded again after unpickling. The
+        characterization matrices are derived from them and built again as well."""
+        state = self.__dict__.copy()
+        state["lcaTables"], state["characterizations"] = {}, {}
+        return state
+
+    def lca(self, prospective: str | None) -> dict[str, LCATable]:
+        """This function returns the lca tables (A1, A4, A5, B6, C2, C3) of a prospective
+        scenario. The tables are shared and must not be changed. The tables of every prospective
+        scenario that is used are kept, so several of them can be evaluated in the same year."""
+        if prospective not in self.lcaTables:
+            logging.debug("Using LCA data of prospect '%s'", prospective)
+            self.lcaTables[prospective] = load_lca(prospective)
+        return self.lcaTables[prospective]
+
+    def characterization(self, prospective: str | None, year: str) -> CharacterizationMatrix:
+        """This function returns the characterization matrix of the product tables of a
+        prospective scenario in a year. It is built once per prospective scenario and year and
+        kept until new products get registered."""
+        tables = self.lca(prospective)
+        matrix = self.characterizations.get((prospective, year))
+        if matrix is None or matrix.size != len(PRODUCT_REGISTRY):
+            matrix = CharacterizationMatrix(tables, year)
+            self.characterizations[prospective, year] = matrix
+        return matrix
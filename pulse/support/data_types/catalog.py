@@ -0,0 +1,88 @@
+# --------------------------------------------------------------------------------------------------
+# catalog.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file deals with the data type catalog
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+from collections.abc import Mapping
+from enum import Enum
+from types import FunctionType, ModuleType
+
+import numpy as np
+
+
+# --------------------------------------------------------------------------------------------------
+# Definitions
+# --------------------------------------------------------------------------------------------------
+def freeze_arrays(data) -> int:
+    """This function walks through the object graph of the data and makes every ndarray read only,
+    so an accidental change of shared data raises an error instead of leaking into the other
+    scenarios. It returns the number of frozen arrays."""
+    frozen, seen, todo = 0, set(), [data]
+    while todo:
+        item = todo.pop()
+        if id(item) in seen or isinstance(item, (str, int, float, type, Enum, ModuleType)):
+            continue
+        seen.add(id(item))
+        if isinstance(item, np.ndarray):
+            if item.flags.writeable:
+                item.flags.writeable = False
+                frozen += 1
+        elif isinstance(item, (dict, Catalog)):
+            todo.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            todo.extend(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, FunctionType):
+            todo.extend(vars(item).values())
+    return frozen
+
+
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
+class Catalog(Mapping):
+    """This class is a read only view of the imported products or buildings. The same catalog is
+    shared by all scenarios of a run, so it is neither copied per scenario nor changed by the
+    calculations. The per scenario state lives in the stock items and the calculation context,
+    memoized results like the product selections of the buildings are kept per process outside of
+    the catalog."""
+
+    def __init__(self, data: dict, freeze: bool = True) -> None:
+        """This function initializes the catalog.\n
+        data (dict): The products or buildings, referenced and not copied.
+        freeze (bool): If the arrays of the data should be made read only."""
+        self._data = data._data if isinstance(data, Catalog) else data
+        if freeze:
+            freeze_arrays(self._data)
+
+    def __repr__(self) -> str:
+        return f"Catalog({len(self._data)} entries)"
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Catalog, (self._data,))
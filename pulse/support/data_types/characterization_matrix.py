@@ -0,0 +1,109 @@
+# --------------------------------------------------------------------------------------------------
+# characterization_matrix.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file deals with the data type characterization matrix
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import numpy as np
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from .lca_table import LCATable, MISSING, SCALAR
+from .product_registry import PRODUCT_REGISTRY
+
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+# The tables of the products, in the order their data is checked
+PRODUCT_TABLES = ("A1", "A4", "A5", "C2", "C3")
+# The table with the loss multipliers of the products
+LOSSES = "A5"
+# The table of the energy carriers
+ENERGY = "B6"
+
+
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
+class CharacterizationMatrix:
+    """This class holds the lca tables of the products for one year as product x impact matrices,
+    with the products in the order of the product registry. The coefficients of a lca stage are
+    combined from these tables once, so a whole product flow is characterized with one matrix
+    operation instead of looking up every product in the tables.\n
+    A stage is given by the tables it needs and its terms (table, constant, loss factor). The
+    impacts of every term are multiplied with constant + loss factor * the A5 loss multiplier of
+    the product. Products that miss one of the needed tables get no impacts in the stage. Since
+    the terms are combined before the quantities are multiplied, the impacts agree with looking up
+    every product to floating point tolerance (about 1e-12 relative), not exactly.\n
+    The impacts of the energy carriers are taken from the energy table the same way, one row per
+    carrier."""
+
+    def __init__(self, tables: dict[str, LCATable], year: str) -> None:
+        """This function initializes the characterization matrix.\n
+        tables (dict): The lca tables of a prospective scenario.
+        year (str): The year of the tables that is used."""
+        self.year = str(year)
+        self.size = len(PRODUCT_REGISTRY)
+        self.values: dict[str, np.ndarray] = {}
+        self.present: dict[str, np.ndarray] = {}
+        for title in PRODUCT_TABLES:
+            table = tables[title]
+            y = table.yearIndex[self.year]
+            columns = np.array(
+                [table.index.get(code, -1) for code in PRODUCT_REGISTRY.codes], dtype=np.int64
+            )
+            kind = np.where(columns >= 0, table.kind[y][columns], MISSING)
+            self.present[title] = kind != MISSING
+            self.values[title] = np.where(self.present[title][:, None], table.values[y][columns], 0)
+            if title == LOSSES:
+                self.losses = np.where(kind == SCALAR, self.values[title][:, 0], 0)
+        self.stages: dict = {}
+        self.energy = tables[ENERGY]
+
+    def __repr__(self) -> str:
+        return f"CharacterizationMatrix({self.year}, {self.size} products, {len(self.stages)} stages)"
+
+    def stage(self, key, required: tuple, terms: tuple) -> tuple[np.ndarray, dict[str, str]]:
+        """This function returns the coefficients (product x impact) of a stage and the products
+        that miss data, together with the first table they miss. The stage is combined on first
+        use and kept afterwards.\n
+        key: The name of the stage.
+        required (tuple): The tables a product needs to get impacts in the stage.
+        terms (tuple): The terms (table, constant, loss factor) of the stage."""
+        if key in self.stages:
+            return self.stages[key]
+        complete = np.ones(self.size, dtype=bool)
+        missing: dict[str, str] = {}
+        for title in (title for title in PRODUCT_TABLES if title in required):
+            for index in np.flatnonzero(complete & ~self.present[title]).tolist():
+                missing[PRODUCT_REGISTRY.codes[index]] = title
+            complete &= self.present[title]
+
+        impacts = max(self.values[title].shape[1] for title, _, _ in terms)
+        coefficients = np.zeros((self.size, impacts))
+        for title, constant, loss in terms:
+            values = self.values[title]
+            coefficients[:, : values.shape[1]] += values * (constant + loss * self.losses)[:, None]
+        coefficients[~complete] = 0
+        self.stages[key] = (coefficients, missing)
+        return self.stages[key]
+
+    def carriers(self, names: list[str]) -> np.ndarray:
+        """This function returns the coefficients (carrier x impact) of the energy carriers, one
+        row per name. A carrier without data in the year raises a KeyError, like looking it up in
+        the table does."""
+        y = self.energy.yearIndex[self.year]
+        columns = {name: self.energy.index.get(name, -1) for name in dict.fromkeys(names)}
+        for name, column in columns.items():
+            if column < 0 or self.energy.kind[y][column] == MISSING:
+                raise KeyError(name)
+        return self.energy.values[y][np.array([columns[name] for name in names], dtype=np.int64)]
@@ -24,14 +24,40 @@ from ..variables import CONSTRUCTION_TYPE, STANDARD
 from ..variables import ObjectType
 
 
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+# Every code string is only parsed once per process, afterwards the same object gets returned
+INTERNED_CODES: dict[tuple[str, ObjectType], "Code"] = {}
+
+
 # --------------------------------------------------------------------------------------------------
 # Classes
 # --------------------------------------------------------------------------------------------------
 class Code:
-    """A class for dealing with the codes for different classes."""
+    """A class for dealing with the codes for different classes.\n
+    Code objects are interned: creating a code a second time returns the already parsed object,
+    which also carries an integer handle (id). Two code objects are therefore equal, if they are the
+    same object."""
+
+    def __new__(cls, code: str, kind: ObjectType):
+        """This function returns the interned code object, if the code was already parsed."""
+        interned = INTERNED_CODES.get((code, kind))
+        if interned is not None:
+            return interned
+        return super().__new__(cls)
 
     def __init__(self, code: str, kind: ObjectType) -> None:
         """This function initiates the code class"""
+        if "id" in self.__dict__:
+            return
+        self._parse(code, kind)
+        self.objectType: ObjectType = kind
+        self.id: int = len(INTERNED_CODES)
+        INTERNED_CODES[(code, kind)] = self
+
+    def _parse(self, code: str, kind: ObjectType) -> None:
+        """This function splits the code string into its parts"""
         self.code: str = code
         if kind == ObjectType.PRODUCT:
             assert (
@@ -68,7 +94,22 @@ class Code:
 
     def __eq__(self, other: str | object) -> bool:
         """This function returns true if the input string or code object is the same as the code object"""
-        return str(self) == str(other)
+        if isinstance(other, Code):
+            return self is other
+        return self.code == str(other)
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        """This function makes sure, that unpickled codes get interned again."""
+        return (Code, (self.code, self.objectType))
 
     def __str__(self) -> str:
         return self.code
@@ -27,6 +27,7 @@ from ..variables import LANGUAGE
 from .code import Code
 from .layered_products import LayeredProducts
 from .grouped_products import GroupedProducts
+from .dense_products import DenseProducts
 from ..variables import ObjectType
 
 
@@ -136,9 +137,9 @@ class Component:
     def calc_layered_products(self, requirements, components) -> None:
         """This function calculates the products for a given layered component and stores it using a
         GroupedProduct object"""
-        self.grouped_products = GroupedProducts(f"{self.code}", "t/m2")
-        self.replaceable_products = GroupedProducts(f"{self.code}", "t/m2")
-        self.refurbishment_products = GroupedProducts(f"{self.code}", "t/m2")
+        self.grouped_products = DenseProducts(f"{self.code}", "t/m2")
+        self.replaceable_products = DenseProducts(f"{self.code}", "t/m2")
+        self.refurbishment_products = DenseProducts(f"{self.code}", "t/m2")
 
         removable = True
         for _, product in enumerate(self.products):
@@ -232,9 +233,9 @@ class Component:
         using a GroupedProduct object"""
         match self.code.category:
             case "Win" | "PEL" | "GAS" | "OIL" | "DIH" | "HEP" | "ELE":
-                self.grouped_products = GroupedProducts(f"{self.code}", "t/m2")
-                self.replaceable_products = GroupedProducts(f"{self.code}", "t/m2")
-                self.refurbishment_products = GroupedProducts(f"{self.code}", "t/m2")
+                self.grouped_products = DenseProducts(f"{self.code}", "t/m2")
+                self.replaceable_products = DenseProducts(f"{self.code}", "t/m2")
+                self.refurbishment_products = DenseProducts(f"{self.code}", "t/m2")
                 for product in self.products:
                     self.grouped_products += (
                         product[1].code,
@@ -261,9 +262,9 @@ class Component:
                         / 100,
                     )
             case "Doo" | "SAN" | "ELI":
-                self.grouped_products = GroupedProducts(f"{self.code}", "variable")
-                self.replaceable_products = GroupedProducts(f"{self.code}", "variable")
-                self.refurbishment_products = GroupedProducts(f"{self.code}", "t/m2")
+                self.grouped_products = DenseProducts(f"{self.code}", "variable")
+                self.replaceable_products = DenseProducts(f"{self.code}", "variable")
+                self.refurbishment_products = DenseProducts(f"{self.code}", "t/m2")
                 for product in self.products:
                     self.grouped_products.addAddition(f"{product[0]}")
                     self.replaceable_products.addAddition(f"{product[0]}")
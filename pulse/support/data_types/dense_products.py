@@ -0,0 +1,212 @@
+# --------------------------------------------------------------------------------------------------
+# dense_products.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file deals with the data type dense products
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import copy
+
+import numpy as np
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from .grouped_products import GroupedProducts
+from .product_registry import PRODUCT_REGISTRY
+
+
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
+class DenseProducts(GroupedProducts):
+    """A variant of the grouped products, that stores the quantities in a float64 vector indexed by
+    the product registry. Adding, subtracting and scaling are vector operations.\n
+    Like the grouped products it remembers which products were touched, even if their quantity is
+    0, and in which order, so dictify and getProducts give the same results."""
+
+    def __init__(self, code: str, unit):
+        """The initializer for the dense products."""
+        self.code: str = code
+        self.vector = np.zeros(len(PRODUCT_REGISTRY))
+        self.used = np.zeros(len(PRODUCT_REGISTRY), dtype=bool)
+        # The touched products, grouped by category and subcategory like the nested dictionary
+        self.order: list[int] = []
+        self.additions: dict = {}
+        self.unit: str = unit
+        # The position in the intensity matrix, if the products got registered there
+        self.row: tuple | None = None
+
+    @classmethod
+    def fromVector(cls, code: str, unit, vector, order: list[int], used):
+        """This function creates dense products from an already calculated vector."""
+        output = cls.__new__(cls)
+        output.code, output.unit, output.additions, output.row = code, unit, {}, None
+        output.vector, output.order, output.used = vector, order, used
+        return output
+
+    def __getstate__(self) -> dict:
+        """This function stores the products by their IDs, so they can be restored in a process
+        with a differently ordered product registry."""
+        state = {key: value for key, value in self.__dict__.items() if key not in ("vector", "used")}
+        state["order"] = [PRODUCT_REGISTRY.codes[index] for index in self.order]
+        state["values"] = self.vector[self.order].tolist()
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """This function restores the products from their IDs."""
+        codes, values = state.pop("order"), state.pop("values")
+        self.__dict__.update(state)
+        self.order = [PRODUCT_REGISTRY.index(code) for code in codes]
+        self.vector = np.zeros(len(PRODUCT_REGISTRY))
+        self.vector[self.order] = values
+        self.used = np.zeros(len(PRODUCT_REGISTRY), dtype=bool)
+        self.used[self.order] = True
+
+    def __deepcopy__(self, memo):
+        """This function copies the dense products without going through the product IDs."""
+        output = DenseProducts.fromVector(
+            self.code, self.unit, self.vector.copy(), list(self.order), self.used.copy()
+        )
+        output.row = self.row
+        output.additions = {
+            key: copy.deepcopy(value, memo) for key, value in self.additions.items()
+        }
+        memo[id(self)] = output
+        return output
+
+    @property
+    def products(self) -> dict:
+        """The quantities as nested dictionary (category -> subcategory -> designation)."""
+        output = {}
+        for index, amount in zip(self.order, self.vector[self.order].tolist()):
+            output.setdefault(PRODUCT_REGISTRY.category[index], {}).setdefault(
+                PRODUCT_REGISTRY.subcategory[index], {}
+            )[PRODUCT_REGISTRY.designation[index]] = amount
+        return output
+
+    def _fit(self) -> None:
+        """This function extends the vectors, if products got registered after the creation."""
+        missing = len(PRODUCT_REGISTRY) - len(self.vector)
+        if missing > 0:
+            self.vector = np.concatenate((self.vector, np.zeros(missing)))
+            self.used = np.concatenate((self.used, np.zeros(missing, dtype=bool)))
+
+    def _touch(self, indices) -> None:
+        """This function marks products as used, keeping them grouped by category and
+        subcategory in the order they were first used."""
+        for index in indices:
+            if self.used[index]:
+                continue
+            self.used[index] = True
+            category = PRODUCT_REGISTRY.category[index]
+            subcategory = PRODUCT_REGISTRY.subcategory[index]
+            position, position_sub = len(self.order), None
+            for nr, other in enumerate(self.order):
+                if PRODUCT_REGISTRY.category[other] == category:
+                    position = nr + 1
+                    if PRODUCT_REGISTRY.subcategory[other] == subcategory:
+                        position_sub = nr + 1
+            self.order.insert(position_sub if position_sub is not None else position, index)
+
+    def _add(self, other, sign: int):
+        """This function adds or subtracts another product container or a (code, value) tuple."""
+        if other is None:
+            return self
+        if isinstance(other, tuple):
+            code, val = other
+            index = PRODUCT_REGISTRY.index(code)
+            self._fit()
+            self._touch((index,))
+            self.vector[index] += val if sign > 0 else -val
+            return self
+        if isinstance(other, DenseProducts):
+            self._fit()
+            other._fit()
+            if (other.used & ~self.used).any():
+                self._touch(other.order)
+            if sign > 0:
+                self.vector += other.vector
+            else:
+                self.vector -= other.vector
+            return self
+        if isinstance(other, GroupedProducts):
+            for kind, kindData in other.products.items():
+                for group, groupData in kindData.items():
+                    for nr, nrData in groupData.items():
+                        self._add((f"{kind}_{group}{nr:02d}", nrData), sign)
+            return self
+        if other == 0:
+            return self
+        raise TypeError(f"Wrong type: {type(other)}")
+
+    def __iadd__(self, other):
+        """This function overwrites the i adder (+=) method."""
+        return self._add(other, 1)
+
+    def __isub__(self, other):
+        """This function overwrites the i subber (-=) method."""
+        return self._add(other, -1)
+
+    def __mul__(self, other):
+        """This function overwrites the mupltiplier (*) method."""
+        temp = DenseProducts(self.code, "t/b")
+        if isinstance(other, (int, float, np.integer, np.floating)):
+            self._fit()
+            temp.vector = self.vector * other
+            temp.used = self.used.copy()
+            temp.order = list(self.order)
+            return temp
+        if isinstance(other, list):
+            assert other != [0,0], f"{self.code} does not have a specified area for multiplication."
+            assert len(other) == len(self.additions ), "ERROR: This should not happen"
+
+            for multiplier, addition in zip(other,list(self.additions.values())[1:]):
+                temp += addition * multiplier
+            return temp
+        raise TypeError(f"ERROR: Wrong type: {type(other)}. Can't multiply a grouped product object with this.")
+
+    def addAddition(self, code: str) -> None:
+        """"""
+        self.additions[code] = DenseProducts(f"{self.code} - {code}",self.unit)
+
+    def getProducts(self, code) -> dict:
+        assert isinstance(code, str)
+        if len(code) == 6:
+            index = PRODUCT_REGISTRY.indices.get(code)
+            if index is None or index >= len(self.used) or not self.used[index]:
+                return {code : 0}
+            return {code : float(self.vector[index])}
+        return super().getProducts(code)
+
+    def dictify(self) -> dict:
+        """"""
+        return {
+            PRODUCT_REGISTRY.codes[index]: round(amount, 5)
+            for index, amount in zip(self.order, self.vector[self.order].tolist())
+        }
+
+    def empty(self) -> bool:
+        return not self.order
+
+
+# --------------------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------------------
+def round_amounts(amounts: np.ndarray, digits: int = 5) -> np.ndarray:
+    """This function rounds an array of amounts exactly like round(amount, digits) does in dictify.
+    np.round scales the amounts first, which can tip values close to a tie the other way, so those
+    few are rounded one by one."""
+    rounded = np.round(amounts, digits)
+    scaled = np.abs(amounts) * 10.0**digits
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-3)
+    if len(ties):
+        rounded.flat[ties] = [round(amount, digits) for amount in amounts.flat[ties].tolist()]
+    return rounded
@@ -47,10 +47,13 @@ class GroupedProducts:
             self.products[code.category][code.subcategory][code.designation] += val
             return self
         if isinstance(other, GroupedProducts):
+            # Merging the nested dictionaries directly, without going through the code strings
             for kind, kindData in other.products.items():
+                kindTarget = self.products.setdefault(kind, {})
                 for group, groupData in kindData.items():
+                    groupTarget = kindTarget.setdefault(group, {})
                     for nr, nrData in groupData.items():
-                        self += (Code(f"{kind}_{group}{nr:02d}", ObjectType.PRODUCT), nrData)
+                        groupTarget[nr] = groupTarget.get(nr, 0) + nrData
             return self
         raise TypeError(f"Wrong type: {type(other)}")
 
@@ -71,10 +74,13 @@ class GroupedProducts:
             self.products[code.category][code.subcategory][code.designation] -= val
             return self
         if isinstance(other, GroupedProducts):
+            # Merging the nested dictionaries directly, without going through the code strings
             for kind, kindData in other.products.items():
+                kindTarget = self.products.setdefault(kind, {})
                 for group, groupData in kindData.items():
+                    groupTarget = kindTarget.setdefault(group, {})
                     for nr, nrData in groupData.items():
-                        self -= (Code(f"{kind}_{group}{nr:02d}", ObjectType.PRODUCT), nrData)
+                        groupTarget[nr] = groupTarget.get(nr, 0) - nrData
             return self
         raise TypeError(f"Wrong type: {type(other)}")
 
@@ -82,10 +88,10 @@ class GroupedProducts:
         """This function overwrites the mupltiplier (*) method."""
         temp = GroupedProducts(self.code, "t/b")
         if isinstance(other, int) or isinstance(other, float):
-            for a in self.products:
-                for b in self.products[a]:
-                    for c, amount in self.products[a][b].items():
-                        temp += (f'{a}_{b}{c:02d}', amount * other)
+            temp.products = {
+                a: {b: {c: amount * other for c, amount in bData.items()} for b, bData in aData.items()}
+                for a, aData in self.products.items()
+            }
             return temp
         if isinstance(other, list):
             assert other != [0,0], f"{self.code} does not have a specified area for multiplication."
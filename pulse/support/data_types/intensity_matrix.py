@@ -0,0 +1,192 @@
+# --------------------------------------------------------------------------------------------------
+# intensity_matrix.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file deals with the data types intensity matrix and material flow
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import uuid
+import numpy as np
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from .dense_products import DenseProducts
+from .product_registry import PRODUCT_REGISTRY
+
+
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
+class IntensityMatrix:
+    """This class stacks the material intensities (t per building or t per m2) of all typology
+    variants into one row x product matrix. The rows are the dense products of the building
+    products and of the heating system components, so product flows can be calculated as a single
+    matrix product with the building numbers."""
+
+    def __init__(self) -> None:
+        """This function initializes the intensity matrix."""
+        # The token makes sure, that rows of another process (or another matrix) are not reused
+        self.token: str = uuid.uuid4().hex
+        self.matrix = np.zeros((0, len(PRODUCT_REGISTRY)))
+        self.size: int = 0
+        self.orders: list[list[int]] = []
+        self.mergedOrders: dict[tuple, tuple[list[int], np.ndarray]] = {}
+
+    def __repr__(self) -> str:
+        return f"IntensityMatrix({self.size} rows x {self.matrix.shape[1]} products)"
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _fit(self, rows: int) -> None:
+        """This function extends the matrix, if there is no space for the rows or if products got
+        registered after the creation."""
+        missing = len(PRODUCT_REGISTRY) - self.matrix.shape[1]
+        if missing > 0:
+            self.matrix = np.hstack((self.matrix, np.zeros((self.matrix.shape[0], missing))))
+        if rows > self.matrix.shape[0]:
+            grown = np.zeros((max(rows, 2 * self.matrix.shape[0], 64), self.matrix.shape[1]))
+            grown[: self.size] = self.matrix[: self.size]
+            self.matrix = grown
+
+    def row(self, products: DenseProducts) -> int:
+        """This function returns the row of the dense products and registers them if necessary.
+        The products must not be changed after the registration."""
+        if products.row is not None and products.row[0] == self.token:
+            return products.row[1]
+        products._fit()
+        self._fit(self.size + 1)
+        self.matrix[self.size, : len(products.vector)] = products.vector
+        self.orders.append(list(products.order))
+        products.row = (self.token, self.size)
+        self.size += 1
+        return products.row[1]
+
+    def merged_order(self, rows: list[int]) -> tuple[list[int], np.ndarray]:
+        """This function returns the order and the mask of the products, that are touched by adding
+        up the rows in the given order."""
+        key = tuple(rows)
+        if key not in self.mergedOrders:
+            products = DenseProducts("Temp", "t")
+            for row in rows:
+                products._touch(self.orders[row])
+            self.mergedOrders[key] = (products.order, products.used)
+        order, used = self.mergedOrders[key]
+        return list(order), used.copy()
+
+    def register(self, buildings: dict, components: dict) -> None:
+        """This function registers the products of all buildings and components."""
+        for component in components.values():
+            for products in (
+                component.grouped_products,
+                component.replaceable_products,
+                component.refurbishment_products,
+            ):
+                if isinstance(products, DenseProducts):
+                    self.row(products)
+        for building in buildings.values():
+            self._register(getattr(building.products, "products", None))
+
+    def _register(self, data) -> None:
+        """This function registers all dense products in a nested dictionary."""
+        if isinstance(data, DenseProducts):
+            self.row(data)
+        if isinstance(data, dict):
+            for value in data.values():
+                self._register(value)
+
+
+class MaterialFlow:
+    """This class collects the terms of a product flow (row of the intensity matrix times a number
+    of buildings or an area) and calculates all of them with one matrix operation.\n
+    Targets are placeholders for the resulting dense products. The terms of a target are summed up
+    in the order they were added, so the result is the same as adding the grouped products one by
+    one."""
+
+    def __init__(self, intensity: IntensityMatrix) -> None:
+        """This function initializes the material flow."""
+        self.intensity = intensity
+        self.targets: int = 0
+        self.terms: list[int] = []
+        self.rows: list[int] = []
+        self.factors: list[tuple[float, float, float]] = []
+        self.touched: list[list[int]] = []
+        self.merges: list[tuple[int, int]] = []
+
+    def target(self) -> int:
+        """This function creates a new target and returns its index."""
+        self.touched.append([])
+        self.targets += 1
+        return self.targets - 1
+
+    def add(self, target: int, products, *factors) -> None:
+        """This function adds products times the factors (up to three, multiplied in order) to the
+        target. Products that are None or 0 are ignored."""
+        if not products:
+            return
+        assert len(factors) <= 3, "ERROR: Only up to three factors are supported"
+        row = self.intensity.row(products)
+        self.terms.append(target)
+        self.rows.append(row)
+        self.factors.append(tuple(factors) + (1.0,) * (3 - len(factors)))
+        self.touched[target].append(row)
+
+    def sub(self, target: int, products, *factors) -> None:
+        """This function subtracts products times the factors from the target."""
+        if not products:
+            return
+        self.add(target, products, -factors[0], *factors[1:])
+
+    def merge(self, target: int, source: int) -> None:
+        """This function adds the result of one target to another one. Merges are done after all
+        terms got calculated."""
+        self.merges.append((target, source))
+
+    def calculate(self) -> list[DenseProducts]:
+        """This function calculates the dense products of all targets."""
+        self.intensity._fit(0)
+        result = np.zeros((self.targets, self.intensity.matrix.shape[1]))
+        if self.terms:
+            factors = np.array(self.factors, dtype=float)
+            values = self.intensity.matrix[self.rows]
+            values *= factors[:, 0, None]
+            values *= factors[:, 1, None]
+            values *= factors[:, 2, None]
+            np.add.at(result, np.array(self.terms), values)
+
+        output = []
+        for vector, rows in zip(result, self.touched):
+            order, used = self.intensity.merged_order(rows)
+            output.append(DenseProducts.fromVector("Temp", "t", vector, order, used))
+
+        for target, source in self.merges:
+            output[target] += output[source]
+        return output
+
+    def fill(self, data):
+        """This function replaces the targets in a nested dictionary (or a single target) with the
+        calculated dense products."""
+        output = self.calculate()
+
+        def replace(data_):
+            if isinstance(data_, dict):
+                return {key: replace(value) for key, value in data_.items()}
+            if isinstance(data_, int) and not isinstance(data_, bool):
+                return output[data_]
+            return data_
+
+        return replace(data)
+
+
+# --------------------------------------------------------------------------------------------------
+# Variables
+# --------------------------------------------------------------------------------------------------
+INTENSITY_MATRIX = IntensityMatrix()
@@ -0,0 +1,150 @@
+# --------------------------------------------------------------------------------------------------
+# lca_table.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file deals with the data type lca table
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from ..file_handling.importer import import_json
+
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+LCA_CACHE_PATH = "output/.cache/lca"
+
+MISSING = 0
+SCALAR = 1
+VECTOR = 2
+
+
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
+class LCATable:
+    """This class stores one lca file as dense year x product x impact array. The array is
+    compiled once from the JSON file, stored as .npy file and memory mapped afterwards, so
+    switching between prospective scenarios does not parse any JSON.\n
+    Indexing a year returns the same dictionary as the JSON file (key -> list of impacts, or a
+    float for the multipliers of the A5 table). It is built from the arrays on first use."""
+
+    def __init__(self, years: list[str], keys: list[str], values, kind, width) -> None:
+        """This function initializes the lca table.\n
+        years (list): The years of the first axis.
+        keys (list): The products or energy carriers of the second axis.
+        values (ndarray): The impacts (year x key x impact).
+        kind (ndarray): If an entry is missing, a scalar or a vector (year x key).
+        width (ndarray): The number of impacts of every key."""
+        self.years = years
+        self.keys = keys
+        self.yearIndex = {year: nr for nr, year in enumerate(years)}
+        self.index = {key: nr for nr, key in enumerate(keys)}
+        self.values = values
+        self.kind = kind
+        self.width = width
+        self.rows: dict[str, dict] = {}
+
+    def __repr__(self) -> str:
+        return f"LCATable({len(self.years)} years x {len(self.keys)} keys)"
+
+    def __getitem__(self, year: str) -> dict:
+        year = str(year)
+        if year not in self.rows:
+            self.rows[year] = self.row(self.yearIndex[year])
+        return self.rows[year]
+
+    def __contains__(self, year) -> bool:
+        return str(year) in self.yearIndex
+
+    def row(self, y: int) -> dict:
+        """This function turns one year of the arrays back into a dictionary."""
+        values, kind, width = self.values[y].tolist(), self.kind[y].tolist(), self.width.tolist()
+        return {
+            key: values[column][0] if kind[column] == SCALAR else values[column][: width[column]]
+            for column, key in enumerate(self.keys)
+            if kind[column] != MISSING
+        }
+
+    @classmethod
+    def fromDict(cls, data: dict):
+        """This function compiles the dictionary of a lca JSON file."""
+        years = list(data)
+        keys = list(dict.fromkeys(key for year in data.values() for key in year))
+        index = {key: nr for nr, key in enumerate(keys)}
+        impacts = max(
+            (len(v) for year in data.values() for v in year.values() if isinstance(v, list)),
+            default=1,
+        )
+        values = np.zeros((len(years), len(keys), impacts))
+        kind = np.zeros((len(years), len(keys)), dtype=np.int8)
+        width = np.zeros(len(keys), dtype=np.int64)
+        for y, year in enumerate(data.values()):
+            for key, value in year.items():
+                column = index[key]
+                if isinstance(value, list):
+                    values[y, column, : len(value)] = value
+                    kind[y, column] = VECTOR
+                    width[column] = max(width[column], len(value))
+                else:
+                    values[y, column, 0] = value
+                    kind[y, column] = SCALAR
+        return cls(years, keys, values, kind, width)
+
+    @classmethod
+    def load(cls, title: str, location: str):
+        """This function loads a lca file. The compiled arrays are reused as long as the JSON file
+        did not change, otherwise it is compiled again."""
+        with open(f"{location}/{title}.json", "rb") as file:
+            source = hashlib.sha256(file.read()).hexdigest()
+        base = f"{LCA_CACHE_PATH}/{title}"
+        try:
+            with open(f"{base}.json", "r", encoding="UTF-8") as file:
+                labels = json.load(file)
+            if labels["source"] == source:
+                return cls(
+                    labels["years"],
+                    labels["keys"],
+                    np.load(f"{base}.values.npy", mmap_mode="r"),
+                    np.load(f"{base}.kind.npy"),
+                    np.load(f"{base}.width.npy"),
+                )
+        except (OSError, ValueError, KeyError):
+            pass
+
+        logging.debug("Compiling LCA file %s/%s.json", location, title)
+        table = cls.fromDict(import_json(title=title, location=location))
+        try:
+            table.store(base, source)
+        except OSError as error:
+            logging.warning("The compiled LCA file %s could not be stored: %s", title, repr(error))
+        return table
+
+    def store(self, base: str, source: str) -> None:
+        """This function stores the compiled arrays. The labels are written last, so an
+        interrupted compilation is never mistaken for a valid one."""
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        for name, array in (("values", self.values), ("kind", self.kind), ("width", self.width)):
+            temp = f"{base}.{name}.{os.getpid()}.tmp"
+            with open(temp, "wb") as file:
+                np.save(file, array)
+            os.replace(temp, f"{base}.{name}.npy")
+        temp = f"{base}.json.{os.getpid()}.tmp"
+        with open(temp, "w", encoding="UTF-8") as file:
+            json.dump({"source": source, "years": self.years, "keys": self.keys}, file)
+        os.replace(temp, f"{base}.json")
@@ -1,60 +1,319 @@
 # --------------------------------------------------------------------------------------------------
-# component.py
+# output_matrix.py
 #
 # Author: Benedict Schwark 
 # Supervision: Nicolas Alaux
 # Other contributors: See README.md
 # License: See LICENSE.md
 #
-# Description: This file deals with the data type code
+# Description: This file deals with the data type output matrix
 # --------------------------------------------------------------------------------------------------
 
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import numpy as np
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
 from ..variables import Detail
+from .grouped_products import GroupedProducts
+from .dense_products import DenseProducts, round_amounts
+from .product_registry import PRODUCT_REGISTRY
 
-ALL = (slice(0,0,0), slice(None,None,None))
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+AXES = ("country", "typology", "component", "product")
+ALL = slice(None, None, None)
 
-def recursiveGetter(data: dict, keys: list) -> dict | int | float:
-    if len(keys) > 1:
-        if keys[0] in ALL:  return {k : recursiveGetter(d, keys[1:]) for k, d in data.items()}
-        return recursiveGetter(data[keys[0]], keys[1:])
-    if keys[0] in ALL: return data
-    return data[keys[0]]
 
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
 class OutputMatrix:
-    def __init__(self, detail: Detail = Detail.GROUPED):
-        """This class deals with the multi dimendional output files."""
+    """This class deals with the multi dimensional output data.\n
+    The values are stored in one ndarray with a named axis per detail level (country, typology,
+    component, product), so reducing the detail is a sum over the last axes. A boolean mask of the
+    same shape remembers which entries were set, so the matrix can be turned back into the nested
+    dictionaries that are used for the output.\n
+    Every entry can also be a vector (e.g. one value per impact category), which is stored as an
+    extra last dimension of the values. It is kept when axes are summed up and the entries of the
+    dictionaries are lists then."""
+
+    def __init__(self, detail: Detail = Detail.GROUPED, axes: tuple | None = None):
+        """This function initializes the output matrix.\n
+        detail (Detail): The detail of the matrix, one axis per level above grouped.
+        axes (tuple): The names of the axes, if they differ from the standard ones."""
         assert detail.value >= Detail.GROUPED.value
+        self.axes: tuple = tuple(axes) if axes is not None else AXES[: detail.value - 1]
+        self.labels: list[list] = [[] for _ in self.axes]
+        self.index: list[dict] = [{} for _ in self.axes]
+        self.data = np.zeros((0,) * len(self.axes))
+        self.present = np.zeros((0,) * len(self.axes), dtype=bool)
+        if not self.axes:
+            self.data, self.present = np.zeros(()), np.zeros((), dtype=bool)
+
+    def __repr__(self) -> str:
+        shape = " x ".join(f"{len(l)} {a}" for a, l in zip(self.axes, self.labels))
+        return f"OutputMatrix({shape if shape else 'grouped'})"
+
+    @property
+    def detail(self) -> Detail:
+        """The detail of the matrix."""
+        return Detail(len(self.axes) + 1)
+
+    def getLabels(self, axis: str) -> list:
+        """This function returns the labels of an axis."""
+        return self.labels[self.axes.index(axis)]
 
-        self.detail = detail
-        self.countries =    [] if detail.value >= Detail.COUNTRY.value else None
-        self.typology =     [] if detail.value >= Detail.TYPOLOGY.value else None
-        self.components =   [] if detail.value >= Detail.COMPONENT.value else None
-        self.products =     [] if detail.value >= Detail.PRODUCT.value else None
+    def _positions(self, keys: tuple) -> tuple:
+        """This function turns labels into positions and registers unknown labels."""
+        assert len(keys) == len(self.axes), f"ERROR: {len(self.axes)} keys needed, got {len(keys)}"
+        positions, grow = [], False
+        for key, labels, index in zip(keys, self.labels, self.index):
+            if isinstance(key, slice):
+                positions.append(key)
+                continue
+            if key not in index:
+                index[key] = len(labels)
+                labels.append(key)
+                grow = True
+            positions.append(index[key])
+        if grow:
+            self._grow()
+        return tuple(positions)
 
-        self.data =         {}
+    def _grow(self) -> None:
+        """This function extends the arrays to the number of labels."""
+        padding = [(0, len(l) - s) for l, s in zip(self.labels, self.data.shape)]
+        self.data = np.pad(self.data, padding + [(0, 0)] * (self.data.ndim - len(padding)))
+        self.present = np.pad(self.present, padding)
 
-    def __getitem__(self, keys) -> any:
-        assert len(keys) == self.detail.value - 1
-        return recursiveGetter(self.data, keys)
+    def __getitem__(self, keys) -> float | np.ndarray:
+        """This function returns a value or, if slices are used, an array of values."""
+        keys = keys if isinstance(keys, tuple) else (keys,)
+        for key, index in zip(keys, self.index):
+            if not isinstance(key, slice) and key not in index:
+                return 0
+        positions = tuple(
+            key if isinstance(key, slice) else index[key] for key, index in zip(keys, self.index)
+        )
+        value = self.data[positions]
+        return value if isinstance(value, np.ndarray) and value.ndim else float(value)
 
     def __setitem__(self, keys, value) -> None:
-        assert len(keys) == self.detail.value - 1
-        if self.countries != None and keys[0] not in self.data:
-            self.countries.append(keys[0])
-            self.data[keys[0]] = {} if self.detail.value > Detail.COUNTRY.value else 0
-        if self.typology != None and keys[1] not in self.data[keys[0]]:
-            self.typology.append(keys[1])
-            self.data[keys[0]][keys[1]] = {} if self.detail.value > Detail.TYPOLOGY.value else 0
-        if self.components != None and keys[2] not in self.data[keys[0]][keys[1]]:
-            self.components.append(keys[2])
-            self.data[keys[0]][keys[1]][keys[2]] = {} if self.detail.value > Detail.COMPONENT.value else 0
-        if self.products != None and keys[3] not in self.data[keys[0]][keys[1]][keys[2]]:
-            self.products.append(keys[3])
-            self.data[keys[0]][keys[1]][keys[2]][keys[3]] = 0
-        
-        if self.detail == Detail.GROUPED:   self.data = value
-        if self.detail == Detail.COUNTRY:   self.data[keys[0]] = value
-        if self.detail == Detail.TYPOLOGY:  self.data[keys[0]][keys[1]] = value
-        if self.detail == Detail.COMPONENT: self.data[keys[0]][keys[1]][keys[2]] = value
-        if self.detail == Detail.PRODUCT:   self.data[keys[0]][keys[1]][keys[2]][keys[3]] = value
-        return
\ No newline at end of file
+        """This function sets a value."""
+        positions = self._positions(keys if isinstance(keys, tuple) else (keys,))
+        self.data[positions] = value
+        self.present[positions] = True
+
+    def add(self, keys, value) -> None:
+        """This function adds a value."""
+        positions = self._positions(keys if isinstance(keys, tuple) else (keys,))
+        self.data[positions] += value
+        self.present[positions] = True
+
+    def __iadd__(self, other):
+        """This function overwrites the i adder (+=) method."""
+        if other is None or (not isinstance(other, OutputMatrix) and other == 0):
+            return self
+        assert isinstance(other, OutputMatrix), f"Wrong type: {type(other)}"
+        assert self.axes == other.axes, f"ERROR: Axes {other.axes} do not match {self.axes}"
+        positions = [
+            np.array([self._register(axis, label) for label in labels], dtype=int)
+            for axis, labels in enumerate(other.labels)
+        ]
+        self._grow()
+        grid = np.ix_(*positions) if positions else ()
+        self.data[grid] += other.data
+        self.present[grid] |= other.present
+        return self
+
+    def _register(self, axis: int, label) -> int:
+        """This function registers a label on an axis without growing the arrays."""
+        if label not in self.index[axis]:
+            self.index[axis][label] = len(self.labels[axis])
+            self.labels[axis].append(label)
+        return self.index[axis][label]
+
+    def sum(self, *axes: str):
+        """This function sums up the given axes and returns a new output matrix."""
+        positions = tuple(self.axes.index(axis) for axis in axes)
+        output = OutputMatrix(axes=tuple(a for a in self.axes if a not in axes))
+        output.labels = [list(l) for n, l in enumerate(self.labels) if n not in positions]
+        output.index = [dict(i) for n, i in enumerate(self.index) if n not in positions]
+        output.data = self.data.sum(axis=positions)
+        output.present = self.present.any(axis=positions)
+        return output
+
+    def reduce(self, detail: Detail):
+        """This function reduces the matrix to the given detail by summing up the last axes. If the
+        detail is already lower, the matrix is returned unchanged."""
+        if detail.value - 1 >= len(self.axes):
+            return self
+        return self.sum(*self.axes[max(detail.value - 1, 0) :])
+
+    @classmethod
+    def fromDict(cls, data: dict, function=None, dtype=float):
+        """This function creates an output matrix from a nested dictionary. The leaves can be
+        numbers, lists of numbers (vector entries) or grouped products, the latter add the product
+        axis.\n
+        function (callable): Is called with (product, amount) for every product of the grouped
+                             products and returns the value that gets stored.
+        dtype: The type of the values. None keeps the type of the leaves, e.g. integers."""
+        paths, values, depth, products = [], [], None, False
+
+        def walk(data_, path):
+            nonlocal depth, products
+            for key, value in data_.items():
+                if isinstance(value, dict):
+                    walk(value, path + (key,))
+                    continue
+                if isinstance(value, GroupedProducts):
+                    products = True
+                    for product, amount in value.dictify().items():
+                        paths.append(path + (key, product))
+                        values.append(function(product, amount) if function else amount)
+                    length = len(path) + 2
+                elif isinstance(value, (int, float, np.integer, np.floating)):
+                    paths.append(path + (key,))
+                    values.append(function(key, value) if function else value)
+                    length = len(path) + 1
+                elif isinstance(value, (list, tuple)):
+                    paths.append(path + (key,))
+                    values.append(value)
+                    length = len(path) + 1
+                elif value is None:
+                    continue
+                else:
+                    raise TypeError(f"Wrong type in output matrix: {type(value)}")
+                assert depth in (None, length), "ERROR: The dictionary has an uneven depth"
+                depth = length
+
+        walk(data, ())
+        if depth is None:
+            return cls(Detail.COUNTRY)
+        axes = AXES[: depth - 1] + ("product",) if products else AXES[:depth]
+        output = cls(axes=axes)
+        positions = [
+            [output._register(axis, path[axis]) for path in paths] for axis in range(depth)
+        ]
+        output._grow()
+        values_ = np.array(values, dtype=dtype)
+        output.data = np.zeros(output.present.shape + values_.shape[1:], dtype=values_.dtype)
+        output.data[tuple(positions)] = values_
+        output.present[tuple(positions)] = True
+        return output
+
+    @classmethod
+    def fromFlows(cls, data: dict, coefficients: np.ndarray | None = None):
+        """This function creates an output matrix with a product axis from a nested dictionary of
+        dense products. All leaves are stacked into one flow x product array, which is multiplied
+        with the coefficients (one per product of the product registry) at once. The quantities
+        are rounded like in dictify, so the result is the same as fromDict. Coefficients with a
+        second dimension (product x impact) give a vector per entry.\n
+        Returns None if a leaf is not a dense product, those have to go through fromDict."""
+        paths, leaves, depth = [], [], None
+
+        def walk(data_, path) -> bool:
+            nonlocal depth
+            for key, value in data_.items():
+                if isinstance(value, dict):
+                    if not walk(value, path + (key,)):
+                        return False
+                    continue
+                if value is None:
+                    continue
+                if not isinstance(value, DenseProducts):
+                    return False
+                assert depth in (None, len(path) + 1), "ERROR: The dictionary has an uneven depth"
+                depth = len(path) + 1
+                paths.append(path + (key,))
+                leaves.append(value)
+            return True
+
+        if not walk(data, ()):
+            return None
+        if depth is None:
+            return cls(Detail.COUNTRY)
+        for leaf in leaves:
+            leaf._fit()
+        # The products keep the order in which the leaves list them, only those are multiplied
+        columns = list(dict.fromkeys(index for leaf in leaves for index in leaf.order))
+        flows = round_amounts(np.stack([leaf.vector[columns] for leaf in leaves]))
+        if coefficients is not None and coefficients.ndim == 2:
+            flows = flows[:, :, None] * coefficients[columns][None]
+        elif coefficients is not None:
+            flows *= coefficients[columns]
+        used = np.stack([leaf.used[columns] for leaf in leaves])
+
+        output = cls(axes=AXES[: depth] + ("product",))
+        positions = [
+            np.array([output._register(axis, path[axis]) for path in paths], dtype=int)
+            for axis in range(depth)
+        ]
+        for index in columns:
+            output._register(depth, PRODUCT_REGISTRY.codes[index])
+        output._grow()
+        output.data = np.zeros(output.present.shape + flows.shape[2:])
+        output.data[tuple(positions)] = flows
+        output.present[tuple(positions)] = used
+        return output
+
+    def toDict(self) -> dict | float:
+        """This function turns the set entries of the matrix into nested dictionaries."""
+        if not self.axes:
+            return float(self.data) if not self.data.ndim else self.data.tolist()
+        output = {}
+        entries = np.argwhere(self.present)
+        for entry, value in zip(entries.tolist(), self.data[self.present].tolist()):
+            target = output
+            for axis, position in enumerate(entry[:-1]):
+                target = target.setdefault(self.labels[axis][position], {})
+            target[self.labels[-1][entry[-1]]] = value
+        return output
+
+
+# --------------------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------------------
+def levels(data) -> int:
+    """This function returns the number of dictionary levels of a nested dictionary, like
+    find_detail, by following its first entries. Empty dictionaries are only followed if there is
+    nothing else."""
+    levels_ = 0
+    while isinstance(data, dict):
+        levels_ += 1
+        first = next(iter(data.values()), None)
+        data = next((value for value in data.values() if value != {}), first)
+    return levels_
+
+
+def adapt_output(data: dict, detail: Detail):
+    """This function changes the detail of a nested dictionary of numbers or lists of numbers
+    (e.g. country -> typology -> value), with the same result as adapt_detail. The lower detail
+    is a sum over the last axes of an output matrix, the keys that are left keep their order and
+    entries without values become 0. Integers stay integers, floats can differ from adapt_detail
+    in the last digits (about 1e-13 relative), because they are summed in another order."""
+    if data == {}:
+        return 0
+    if levels(data) + 1 <= detail.value:
+        return data
+    matrix = OutputMatrix.fromDict(data, dtype=None).reduce(detail)
+    levels_ = detail.value - 1
+
+    def fill(data_, positions: tuple):
+        if len(positions) == levels_:
+            # Entries without any values are not part of the matrix
+            if None in positions or len(matrix.axes) != levels_ or not matrix.present[positions]:
+                return 0
+            value = matrix.data[positions].tolist()
+            return value if value or isinstance(value, list) else 0
+        if not isinstance(data_, dict) or data_ == {}:
+            return 0
+        index = matrix.index[len(positions)] if len(positions) < len(matrix.axes) else {}
+        return {key: fill(value, positions + (index.get(key),)) for key, value in data_.items()}
+
+    return fill(data, ())
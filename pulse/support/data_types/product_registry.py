@@ -0,0 +1,69 @@
+# --------------------------------------------------------------------------------------------------
+# product_registry.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file deals with the data type product registry
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
+class ProductRegistry:
+    """This class maps the product IDs onto dense column indices, which are used by the vector based
+    product containers. Products that are not known yet get registered on first use."""
+
+    def __init__(self) -> None:
+        """This function initializes the product registry."""
+        self.codes: list[str] = []
+        self.indices: dict[str, int] = {}
+        self.category: list[str] = []
+        self.subcategory: list[int] = []
+        self.designation: list[int] = []
+
+    def __repr__(self) -> str:
+        return f"ProductRegistry({len(self.codes)} products)"
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code) -> bool:
+        return str(code) in self.indices
+
+    def register(self, codes) -> None:
+        """This function registers a collection of product IDs in the given order."""
+        for code in codes:
+            self.index(code)
+
+    def index(self, code) -> int:
+        """This function returns the column index of a product ID."""
+        code = str(code)
+        if code in self.indices:
+            return self.indices[code]
+        assert (
+            len(code) == 6
+        ), f'ERROR: Registering product "{code}" failed. Length has to be 6, was {len(code)}'
+        self.indices[code] = len(self.codes)
+        self.codes.append(code)
+        self.category.append(code[:2])
+        self.subcategory.append(int(code[3]))
+        self.designation.append(int(code[4:]))
+        return self.indices[code]
+
+
+# --------------------------------------------------------------------------------------------------
+# Variables
+# --------------------------------------------------------------------------------------------------
+PRODUCT_REGISTRY = ProductRegistry()
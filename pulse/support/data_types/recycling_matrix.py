@@ -0,0 +1,198 @@
+# --------------------------------------------------------------------------------------------------
+# recycling_matrix.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file deals with the data type recycling matrix
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+from itertools import chain
+
+import numpy as np
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from .dense_products import DenseProducts, round_amounts
+from .product_registry import PRODUCT_REGISTRY
+
+
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
+class RecyclingMatrix:
+    """This class holds the recycling factors as vectors and a sparse substitution matrix over the
+    product registry, so the recycling of a whole product flow is a few vector operations instead
+    of matching every product against the recycling factors.\n
+    The recycling factors map a recycled product group (a category, a subcategory or a product) to
+    the products of the construction it substitutes and the recycled product they are replaced by
+    (None keeps the product). The matrix is stored as pairs of source and goal products, each
+    belonging to the group it is recycled from. It is compiled again if new products get
+    registered."""
+
+    def __init__(self, factors: dict[str, dict[str, tuple]]) -> None:
+        """This function initializes the recycling matrix.\n
+        factors (dict): The recycling factors (recycled group -> product -> (goal product, _))."""
+        self.factors = factors
+        self.groups = list(factors)
+        self.size = -1
+        self.compile()
+
+    def __repr__(self) -> str:
+        return f"RecyclingMatrix({len(self.groups)} groups, {len(self.source)} substitutions)"
+
+    def compile(self) -> None:
+        """This function compiles the recycling factors for the products of the registry. The goal
+        products of registered products are registered as well."""
+        for products in self.factors.values():
+            for product, (goal, _) in products.items():
+                if product in PRODUCT_REGISTRY and goal:
+                    PRODUCT_REGISTRY.index(goal)
+        codes = PRODUCT_REGISTRY.codes
+        self.size = len(codes)
+        self.recyclable = np.array(
+            [code[:2] in self.factors or code[:4] in self.factors or code in self.factors
+             for code in codes],
+            dtype=bool,
+        )
+        # The demolished products of every group, single products are not rounded like groups
+        self.members = [
+            np.array([nr for nr, code in enumerate(codes) if code[: len(group)] == group],
+                     dtype=np.int64)
+            for group in self.groups
+        ]
+        source, goal, group_ = [], [], []
+        for nr, group in enumerate(self.groups):
+            for product, (goal_product, _) in self.factors[group].items():
+                if product not in PRODUCT_REGISTRY:
+                    continue
+                source.append(PRODUCT_REGISTRY.index(product))
+                goal.append(PRODUCT_REGISTRY.index(goal_product) if goal_product else source[-1])
+                group_.append(nr)
+        self.source = np.array(source, dtype=np.int64)
+        self.goal = np.array(goal, dtype=np.int64)
+        self.group = np.array(group_, dtype=np.int64)
+        # The goal and the group of every substituted product, -1 for the others
+        self.goals = np.full(self.size, -1, dtype=np.int64)
+        self.goals[self.source] = self.goal
+        self.groupOf = np.full(self.size, -1, dtype=np.int64)
+        self.groupOf[self.source] = self.group
+        self.layouts: dict[tuple, tuple[list[int], np.ndarray]] = {}
+        self.recycledLayouts: dict[tuple, tuple[list[int], np.ndarray]] = {}
+        self.substitutions: dict[tuple, tuple[list[int], np.ndarray]] = {}
+
+    def fit(self) -> None:
+        """This function compiles the matrix again, if products got registered in the meantime."""
+        if self.size != len(PRODUCT_REGISTRY):
+            self.compile()
+
+    def layout(self, indices) -> tuple[list[int], np.ndarray]:
+        """This function returns the order and the used products of dense products that got the
+        given products added one after the other. It only depends on the products, so it is kept."""
+        key = tuple(indices)
+        if key not in self.layouts:
+            products = DenseProducts("Temp", "t")
+            products._touch(key)
+            self.layouts[key] = (products.order, products.used)
+        return self.layouts[key]
+
+    def stack(self, leaves: list) -> tuple[list[list[int]], np.ndarray, np.ndarray, np.ndarray]:
+        """This function stacks the products of the leaves. It returns the order of every leaf and
+        the row, the product and the amount of every touched product, with the amounts rounded like
+        dictify does."""
+        dense = []
+        for products in leaves:
+            if not isinstance(products, DenseProducts):
+                temp = DenseProducts(products.code, products.unit)
+                temp += products
+                products = temp
+            products._fit()
+            dense.append(products)
+        orders = [products.order for products in dense]
+        lengths = [len(order) for order in orders]
+        rows = np.repeat(np.arange(len(dense)), lengths)
+        indices = np.fromiter(chain.from_iterable(orders), dtype=np.int64, count=sum(lengths))
+        vectors = np.stack([products.vector for products in dense]) if dense else np.zeros((0, 0))
+        return orders, rows, indices, round_amounts(vectors[rows, indices])
+
+    def unstack(self, matrix: np.ndarray, layouts: list) -> list[DenseProducts]:
+        """This function turns the rows of a matrix into dense products with the given layouts."""
+        return [
+            DenseProducts.fromVector("Temp", "t", vector, list(order), used.copy())
+            for vector, (order, used) in zip(matrix, layouts)
+        ]
+
+    def split(self, leaves: list, rate: float) -> tuple[list[DenseProducts], list[DenseProducts]]:
+        """This function splits the products of every leaf into the recycled products (the rate of
+        every recyclable product) and the remaining ones."""
+        self.fit()
+        orders, rows, indices, amounts = self.stack(leaves)
+        recyclable = self.recyclable[indices]
+        recycled, remaining = np.zeros((2, len(leaves), self.size))
+        recycled[rows, indices] = np.where(recyclable, amounts * rate, 0)
+        remaining[rows, indices] = np.where(recyclable, amounts * (1 - rate), amounts)
+        return (
+            self.unstack(recycled, [self.recycled(order) for order in orders]),
+            self.unstack(remaining, [self.layout(order) for order in orders]),
+        )
+
+    def reducers(self, construction: np.ndarray, demolition: np.ndarray) -> np.ndarray:
+        """This function returns the share of every recycled group that is substituted, which is
+        the recycled amount compared to the amount of the products it substitutes, at most 1.\n
+        construction (np.ndarray): The product vector of the whole construction.
+        demolition (np.ndarray): The product vector of the whole recycled demolition."""
+        self.fit()
+        construction = np.pad(construction, (0, self.size - len(construction)))
+        demolition = np.pad(demolition, (0, self.size - len(demolition)))
+        needed = np.bincount(
+            self.group, weights=construction[self.source], minlength=len(self.groups)
+        )
+        available = np.array([
+            (sum(round_amounts(demolition[members]).tolist()) if len(group) != 6
+             else float(demolition[members].sum()))
+            for group, members in zip(self.groups, self.members)
+        ])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(needed == 0, 0, np.minimum(available / needed, 1))
+
+    def substitute(self, leaves: list, reducers: np.ndarray) -> list[DenseProducts]:
+        """This function replaces the substituted share of the products of every leaf by their
+        recycled goal products."""
+        self.fit()
+        orders, rows, indices, amounts = self.stack(leaves)
+        goals = self.goals[indices]
+        substituted = goals >= 0
+        shares = np.where(substituted, reducers[self.groupOf[indices]], 0)
+        output = np.zeros((len(leaves), self.size))
+        output[rows, indices] = np.where(substituted, amounts * (1 - shares), amounts)
+        np.add.at(
+            output, (rows[substituted], goals[substituted]), (amounts * shares)[substituted]
+        )
+        return self.unstack(output, [self.substitution(order) for order in orders])
+
+    def recycled(self, order: list[int]) -> tuple[list[int], np.ndarray]:
+        """This function returns the layout of the recycled products, which are the recyclable
+        products of the order."""
+        key = tuple(order)
+        if key not in self.recycledLayouts:
+            self.recycledLayouts[key] = self.layout(
+                [index for index, keep in zip(order, self.recyclable[order].tolist()) if keep]
+            )
+        return self.recycledLayouts[key]
+
+    def substitution(self, order: list[int]) -> tuple[list[int], np.ndarray]:
+        """This function returns the layout of substituted products, where every product is
+        followed by its goal product, like they are added one after the other."""
+        key = tuple(order)
+        if key not in self.substitutions:
+            touched = []
+            for index, goal in zip(order, self.goals[order].tolist()):
+                touched.extend((index, goal) if goal >= 0 else (index,))
+            self.substitutions[key] = self.layout(touched)
+        return self.substitutions[key]
@@ -0,0 +1,120 @@
+# --------------------------------------------------------------------------------------------------
+# scenario_tree.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file deals with the data type scenario tree
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+from collections.abc import Iterable
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from .scenario import Scenario
+
+
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
+class ScenarioNode:
+    """This class is one node of the scenario tree. It holds the years a group of scenarios has
+    in common: all of them start from the same state and have the same parameters in these years,
+    so the years are only calculated once. Where the scenarios diverge, the state gets forked and
+    every child continues with its part of the group."""
+
+    def __init__(
+        self,
+        scenarios: list[Scenario],
+        years: list[int],
+        children: list["ScenarioNode"] | None = None,
+        root: bool = True,
+    ) -> None:
+        """This function initializes the scenario node.\n
+        scenarios (list): The scenarios that share the years, the first one is calculated.
+        years (list): The shared years.
+        children (list): The nodes the state gets forked into after the last year.
+        root (bool): If the node starts from the initial stock."""
+        self.scenarios = scenarios
+        self.years = years
+        self.children = children if children else []
+        self.root = root
+
+    def __repr__(self) -> str:
+        return f"ScenarioNode({', '.join(self.names)}: {self.years[0]}-{self.years[-1]})"
+
+    @property
+    def scenario(self) -> Scenario:
+        """The scenario that is calculated for the node."""
+        return self.scenarios[0]
+
+    @property
+    def names(self) -> list[str]:
+        """The names of the scenarios of the node."""
+        return [scenario.name for scenario in self.scenarios]
+
+    @property
+    def label(self) -> str:
+        """The label of the node, which is the scenario name if the node is a whole scenario."""
+        if self.root and not self.children and len(self.scenarios) == 1:
+            return self.scenario.name
+        return f"{self.scenario.name} {self.years[0]}-{self.years[-1]}"
+
+    def nodes(self) -> list["ScenarioNode"]:
+        """This function returns the node and all nodes below it."""
+        return [self] + [node for child in self.children for node in child.nodes()]
+
+
+# --------------------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------------------
+def year_parameters(scenario: Scenario, year: int) -> tuple:
+    """This function returns everything of a scenario the calculation of a year depends on."""
+    return scenario.prospective, scenario.getYear(year)
+
+
+def group_scenarios(scenarios: list[Scenario], year: int) -> list[list[Scenario]]:
+    """This function groups the scenarios by their parameters in the year. The parameters are
+    nested dictionaries and lists, so they are compared and not hashed."""
+    groups: list[tuple[tuple, list[Scenario]]] = []
+    for scenario in scenarios:
+        parameters = year_parameters(scenario, year)
+        for other, group in groups:
+            if other == parameters:
+                group.append(scenario)
+                break
+        else:
+            groups.append((parameters, [scenario]))
+    return [group for _, group in groups]
+
+
+def build_nodes(scenarios: list[Scenario], start: int, root: bool) -> list[ScenarioNode]:
+    """This function builds the nodes of scenarios that share every year before the start."""
+    nodes = []
+    for group in group_scenarios(scenarios, start):
+        years, year = [], start
+        while all(year in scenario.years for scenario in group) and (
+            len(group) == 1 or len(group_scenarios(group, year)) == 1
+        ):
+            years.append(year)
+            year += 1
+        remaining = [scenario for scenario in group if year in scenario.years]
+        children = build_nodes(remaining, year, root=False) if remaining else []
+        nodes.append(ScenarioNode(group, years, children, root))
+    return nodes
+
+
+def build_scenario_tree(scenarios: Iterable[Scenario]) -> list[ScenarioNode]:
+    """This function finds the years the scenarios have in common and returns the roots of the
+    scenario tree. Scenarios without any common years are roots without children."""
+    scenarios = list(scenarios)
+    roots = []
+    for start in dict.fromkeys(scenario.years[0] for scenario in scenarios):
+        roots += build_nodes([s for s in scenarios if s.years[0] == start], start, root=True)
+    return roots
@@ -0,0 +1,97 @@
+# --------------------------------------------------------------------------------------------------
+# stock_history.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file deals with the data type stock history
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import numpy as np
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+
+# VARIABLES
+from .building_number import STATES, GROWTH
+
+# CLASSES
+from .building_number import BuildingNumber
+
+
+# --------------------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------------------
+class StockHistory:
+    """This class stores the yearly building numbers of one typology in a single
+    year x cohort x state tensor. Only the latest year can be changed, all earlier years are
+    read-only."""
+
+    def __init__(self, number: BuildingNumber, horizon: int = 0) -> None:
+        """This function initializes the stock history.\n
+        number (BuildingNumber): The initial building number the first year is based on.
+        horizon (int): The number of years the tensor is allocated for. More years are possible,
+                       but the tensor then has to be reallocated."""
+        self.initial = number
+        self.years: list[int] = []
+        self.numbers: list[BuildingNumber] = []
+        self.tensor = np.zeros(
+            (max(horizon, 1), len(number.cohorts) + GROWTH, len(STATES)), dtype=np.int64
+        )
+
+    def __repr__(self) -> str:
+        return f"StockHistory({self.years[0]}-{self.years[-1]})" if self.years else "StockHistory()"
+
+    def __len__(self) -> int:
+        return len(self.years)
+
+    def __setstate__(self, state: dict) -> None:
+        """This function restores a pickled history. Pickling copies the numbers of the years
+        out of the tensor, so they are bound to their rows again."""
+        self.__dict__.update(state)
+        for position, number in enumerate(self.numbers):
+            number._data = self.tensor[position]
+            if position != len(self.numbers) - 1:
+                number._data.flags.writeable = False
+
+    def add_year(self, year: int) -> BuildingNumber:
+        """This function adds a year to the history, starting from the state of the previous year,
+        and returns its building number. The previous year becomes read-only."""
+        previous = self.numbers[-1] if self.numbers else self.initial
+        position = len(self.years)
+
+        # Every year at most one cohort gets added, so there has to be one free row
+        if position == self.tensor.shape[0] or len(previous.cohorts) == self.tensor.shape[1]:
+            self._grow(
+                position == self.tensor.shape[0],
+                len(previous.cohorts) == self.tensor.shape[1],
+            )
+
+        self.tensor[position, : len(previous.cohorts)] = previous.matrix
+        number = previous.bind(self.tensor[position])
+
+        if self.numbers:
+            self.numbers[-1]._data.flags.writeable = False
+        self.years.append(year)
+        self.numbers.append(number)
+        return number
+
+    def _grow(self, years: bool, cohorts: bool) -> None:
+        """This function reallocates the tensor with more years and/or more cohorts."""
+        shape = list(self.tensor.shape)
+        shape[0] += len(self.years) if years else 0
+        shape[1] += GROWTH if cohorts else 0
+        tensor = np.zeros(shape, dtype=np.int64)
+        tensor[: self.tensor.shape[0], : self.tensor.shape[1]] = self.tensor
+        self.tensor = tensor
+
+        for position, number in enumerate(self.numbers):
+            number._data = self.tensor[position]
+            if position != len(self.numbers) - 1:
+                number._data.flags.writeable = False
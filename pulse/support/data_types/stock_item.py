@@ -16,6 +16,8 @@ import copy
 import math
 from typing import Any
 
+import numpy as np
+
 # ----------------------------------------------------------------------------------------------------------------
 # Imports Local Libraries
 # ----------------------------------------------------------------------------------------------------------------
@@ -23,24 +25,25 @@ from typing import Any
 # FUNCTIONS
 from ..file_handling.importer import import_json
 from ..variables import (
-    distribute_in_relation,
-    remove_available,
-    add_available,
+    distribute_in_relation_array,
     get_share_of_used,
 )
 
 # CLASSES
-from .building_number import BuildingNumber
+from .building_number import BuildingNumber, demolish
+from .stock_history import StockHistory
+from .building_number import BARE, LIGHT, MEDIUM, DEEP, HS_OLD, HS_MID, HS_NEW
 
 # ----------------------------------------------------------------------------------------------------------------
 # Global Variables
 # ----------------------------------------------------------------------------------------------------------------
 DECONSTRUCTION_STATISTIC = {}  # it is up to date.
+# The weibull tables as arrays per use class, indexed by [cohort after 1945, age]
+HAZARDS = {}
 REPLACEMENT_STATISTIC = {}
 
 INCREMENT = 1
 LIGHT_RENO = True  # Allows the light buildings to be upgraded to medium or deep
-OVERHANG = 0
 CHANGE_HSS = 0.5  # Default Exchanging rate for heating systems
 LIFETIME_HSS = 20  # Default Lifetime for heating systems
 
@@ -54,19 +57,34 @@ END = f"╚{'═'*6}╧{'═'*9}╧{'═'*9}╧{'═'*9}╧{'═'*9}╧{'═'*9}
 intN = lambda x: int(x) if "-" not in x else int(x[x.find("-") + 1 :])
 
 
+def load_deconstruction_statistic() -> None:
+    """This function loads the weibull tables, if they are not loaded yet."""
+    global DECONSTRUCTION_STATISTIC
+    global HAZARDS
+    if not DECONSTRUCTION_STATISTIC:
+        DECONSTRUCTION_STATISTIC = import_json(
+            title="weibull", location="statistics"
+        )
+        HAZARDS = {
+            use: np.array(
+                [
+                    [rates[str(age)] for age in range(len(rates))]
+                    for rates in (eras["1945"], eras["2100"])
+                ]
+            )
+            for use, eras in DECONSTRUCTION_STATISTIC.items()
+        }
+
+
 class StockItem:
     """This is a class to deal with layered elements"""
 
-    def __init__(self, building, use, years, number) -> None:
-        """This function initializes the stock item."""
+    def __init__(self, building, use, years, number, horizon: int = 0) -> None:
+        """This function initializes the stock item. The horizon is the number of years the
+        history gets allocated for."""
+
+        load_deconstruction_statistic()
 
-        global DECONSTRUCTION_STATISTIC
-        global REPLACEMENT_STATISTIC
-        if not DECONSTRUCTION_STATISTIC:
-            DECONSTRUCTION_STATISTIC = import_json(
-                title="weibull", location="statistics"
-            )
- 
         self.building = building
         self.years = years
         self.use = use
@@ -78,6 +96,7 @@ class StockItem:
         )
 
         assert self.number.check(throw_error=True), "NOO"
+        self.history = StockHistory(self.number, horizon)
         self.development = {}
         return
 
@@ -88,25 +107,32 @@ class StockItem:
         string = f"{string}\n{END}"
         return string
 
+    def __setstate__(self, state: dict) -> None:
+        """This function restores a stock item from a checkpoint, which can happen in a process
+        that did not create any stock item yet."""
+        load_deconstruction_statistic()
+        self.__dict__.update(state)
+
     def __getitem__(self, __name: int | str) -> Any:
         return self.development[__name]
 
     def newYear(self, year: int) -> None:
         """This creates and initializes a new year."""
-        if not self.development:
-            self.development[year] = StockItem(
-                self.building, self.use, self.years, self.number
-            )
-            return None
-        else:
+        if self.development:
             assert (
-                list(self.development.keys())[-1] == year - INCREMENT
+                self.history.years[-1] == year - INCREMENT
             ), f"The new year must be one increment ({INCREMENT}) larger than the old year."
-            old_ = self.development[year - INCREMENT]
-            self.development[year] = StockItem(
-                old_.building, old_.use, old_.years, old_.number
-            )
-            return None
+        self.development[year] = StockYear(self, self.history.add_year(year))
+        return None
+
+    def getDemolitionRates(self, year: int) -> np.ndarray:
+        """This function returns the demolition rate of every cohort in the given year."""
+        cohorts = np.array([int(cohort) for cohort in self.number.cohorts])
+        ages = year - cohorts
+        assert (ages >= 0).all(), f"Cohorts of {self.building.code} are built after {year}"
+        return HAZARDS[
+            self.building.typology if self.use != "Residential" else "Residential"
+        ][(cohorts > 1945).astype(int), ages]
 
     def calcDemolition(self, year: int) -> list[int]:
         """This function calculates the demolitions."""
@@ -118,29 +144,8 @@ class StockItem:
                 0,
             ]  # NOTE: Immediately removes new buildings from the equation
 
-        overhang = 0
         assert self.number.check(throw_error=True), "NOO"
-
-        total = [0, 0, 0, 0]
-        for bYear, amount in self.number.total.items():
-
-            age = year - int(bYear)
-
-            deconRate = DECONSTRUCTION_STATISTIC[
-                self.building.typology if self.use != "Residential" else "Residential"
-            ]["2100" if int(bYear) > 1945 else "1945"][str(age)]
-
-            temp_amount = max(amount - self.number.protected[bYear], 0)
-
-            demoAmount = int(temp_amount * deconRate + overhang)
-            overhang = (temp_amount * deconRate + overhang) % 1
-            # demoAmount = int(math.ceil(amount * deconRate))
-
-            total = self.number.demo(bYear, demoAmount, total)
-
-            self.number.check()
-        OVERHANG = overhang
-
+        total = demolish([self.number], [self.getDemolitionRates(year)])[0]
         assert self.number.check(throw_error=True), "NOO"
         return total
 
@@ -150,54 +155,39 @@ class StockItem:
         overflow = [None, None, None]
 
         assert self.number.check(throw_error=True), "NOO"
-        d1, d2, d3 = (
-            distribute_in_relation(light, self.number.bare),
-            distribute_in_relation(medium, self.number.bare),
-            distribute_in_relation(deep, self.number.bare),
-        )
-
-        self.number.check(throw_error=True)
-        old1, old2, old3, old4 = (
-            self.number.bare.values(),
-            self.number.light.values(),
-            self.number.medium.values(),
-            self.number.deep.values(),
-        )
-
-        self.number.check(throw_error=True)
-        self.number.bare, overflow[0] = remove_available(self.number.bare, d1)
-        self.number.bare, overflow[1] = remove_available(self.number.bare, d2)
-        self.number.bare, overflow[2] = remove_available(self.number.bare, d3)
-
-        self.number.light = add_available(self.number.light, d1, overflow[0])
-        self.number.medium = add_available(self.number.medium, d2, overflow[1])
-        self.number.deep = add_available(self.number.deep, d3, overflow[2])
+        matrix = self.number.matrix
+        old = matrix[:, [LIGHT, MEDIUM, DEEP]].sum(axis=0)
+
+        # The refurbishments are distributed in relation to the bare buildings before any of them
+        # got refurbished
+        moved = [
+            distribute_in_relation_array(amount, matrix[:, BARE])
+            for amount in (light, medium, deep)
+        ]
+
+        # Removing from the bare buildings, whatever can not be removed is the overflow
+        for nr, (amount, state) in enumerate(zip(moved, (LIGHT, MEDIUM, DEEP))):
+            remaining = matrix[:, BARE] - amount
+            overflow[nr] = np.maximum(-remaining, 0)
+            matrix[:, BARE] = np.maximum(remaining, 0)
+            matrix[:, state] += amount - overflow[nr]
 
         self.number.check(throw_error=True)
 
+        # The overflow of medium and deep refurbishments is taken from the light refurbished
         if LIGHT_RENO:
-            if type(overflow[1]) is list:
-                new1 = {k: o for k, o in zip(d1, overflow[1])}
-                self.number.light, overflow[1] = remove_available(
-                    self.number.light, new1
-                )
-                self.number.medium = add_available(
-                    self.number.medium, new1, overflow[1]
-                )
-            if type(overflow[2]) is list:
-                new2 = {k: o for k, o in zip(d2, overflow[2])}
-                self.number.light, overflow[2] = remove_available(
-                    self.number.light, new2
-                )
-                self.number.deep = add_available(self.number.deep, new2, overflow[2])
+            for nr, state in ((1, MEDIUM), (2, DEEP)):
+                if not overflow[nr].any():
+                    continue
+                remaining = matrix[:, LIGHT] - overflow[nr]
+                matrix[:, LIGHT] = np.maximum(remaining, 0)
+                matrix[:, state] += overflow[nr] + np.minimum(remaining, 0)
+                overflow[nr] = np.maximum(-remaining, 0)
 
         self.number.check(throw_error=True)
 
-        l, m, d = (
-            sum([b - a for a, b in zip(old2, self.number.light.values())]),
-            sum([b - a for a, b in zip(old3, self.number.medium.values())]),
-            sum([b - a for a, b in zip(old4, self.number.deep.values())]),
-        )
+        l, m, d = (matrix[:, [LIGHT, MEDIUM, DEEP]].sum(axis=0) - old).tolist()
+        overflow = [o.tolist() if o.any() else 0 for o in overflow]
         return [-(l + m + d), l, m, d], overflow
 
     def calcConstruction(
@@ -209,7 +199,6 @@ class StockItem:
         scenario: dict | None = None,
     ) -> int:
         """This..."""
-        assert year not in self.number.bare
         assert year not in self.number.total
 
         if pop:
@@ -243,12 +232,7 @@ class StockItem:
 
         assert number != None, "SHOULDNT BE THE CASE"
 
-        self.number.total[year] = number
-        self.number.bare[year] = number
-        self.number.hs_old[year] = number
-        self.number.light[year] = 0
-        self.number.medium[year] = 0
-        self.number.deep[year] = 0
+        self.number.add_cohort(year, number)
 
         return number
 
@@ -265,40 +249,52 @@ class StockItem:
             else LIFETIME_HSS
         )
 
-        exchange = {}
-        for (key, numberOld), numberNew in zip(
-            self.number.hs_old.items(), self.number.hs_new.values()
-        ):
-            exchange[key] = [0, 0, 0]
-            if (year - int(key)) % temp_hss_lifetime:
-                continue
-
-            replaceOld = numberOld
-            replaceNew = numberNew
-
-            refurbish = min(
-                int((replaceOld + replaceNew) * temp_hss_exchange + 0.5),
-                self.number.hs_old[key],
-            )
+        matrix = self.number.matrix[: self.number.initial_cohorts]
+        cohorts = self.number.cohorts[: self.number.initial_cohorts]
+        ages = year - np.array([int(key) for key in cohorts])
+        due = (ages % temp_hss_lifetime) == 0
 
-            self.number.hs_old[
-                key
-            ] -= refurbish  # Subtracting from the old not renovated
+        replaceOld = np.where(due, matrix[:, HS_OLD], 0)
+        replaceNew = np.where(due, matrix[:, HS_NEW], 0)
 
-            self.number.hs_mid[key] = min(
-                self.number.hs_mid[key] + replaceOld, self.number.hs_old[key]
+        refurbish = np.minimum(
+            ((replaceOld + replaceNew) * temp_hss_exchange + 0.5).astype(np.int64),
+            replaceOld,
+        )
+        assert (
+            refurbish >= 0
+        ).all(), "Why is the refurbishment negative, that is not supposed to happen"
+
+        # Subtracting from the old not renovated
+        matrix[:, HS_OLD] -= refurbish
+        matrix[:, HS_MID] = np.where(
+            due,
+            np.minimum(matrix[:, HS_MID] + replaceOld, matrix[:, HS_OLD]),
+            matrix[:, HS_MID],
+        )
+        matrix[:, HS_NEW] += refurbish
+
+        return dict(
+            zip(
+                cohorts,
+                np.stack(
+                    (replaceOld - refurbish, refurbish, replaceNew), axis=1
+                ).tolist(),
             )
+        )
 
-            assert (
-                refurbish >= 0
-            ), "Why is the refurbishment negative, that is not supposed to happen"
+    def get_total(self, year: int) -> int:
+        return self.development[year].number.get_total()
 
-            self.number.hs_new[key] += refurbish
 
-            exchange[key][0] += replaceOld - refurbish
-            exchange[key][1] += refurbish
-            exchange[key][2] += replaceNew
-        return exchange
+class StockYear(StockItem):
+    """This is a class for one year of a stock item. Its building number is a view into the
+    history of the stock item, which is read-only for every year but the latest one."""
 
-    def get_total(self, year: int) -> int:
-        return self.development[year].number.get_total()
+    def __init__(self, item: StockItem, number: BuildingNumber) -> None:
+        """This function initializes the stock year."""
+        self.building = item.building
+        self.years = item.years
+        self.use = item.use
+        self.number = number
+        self.development = {}
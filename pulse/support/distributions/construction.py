@@ -14,18 +14,42 @@ Description:  This file deals with the distribution of historic buildings based
 # --------------------------------------------------------------------------------------------------
 # Imports Global Libraries
 # --------------------------------------------------------------------------------------------------
+import os
 
 # --------------------------------------------------------------------------------------------------
 # Imports Local Libraries
 # --------------------------------------------------------------------------------------------------
 from ..file_handling.importer import import_json
 from ..file_handling import export_json
+from .statistics_cache import statistic_key, is_current, store_key
 
 # --------------------------------------------------------------------------------------------------
 # Definitions
 # --------------------------------------------------------------------------------------------------
 REFERENCE = 20_000_000
 
+AGE_RANGES = {
+    "Residential": [
+        (1850, 1918),
+        (1919, 1944),
+        (1945, 1960),
+        (1961, 1980),
+        (1981, 1990),
+        (1991, 2000),
+        (2001, 2009),
+        (2010, 2022),
+    ],
+    "Non-residential": [
+        (1850, 1944),
+        (1945, 1969),
+        (1970, 1979),
+        (1980, 1989),
+        (1990, 1999),
+        (2000, 2010),
+        (2011, 2022),
+    ],
+}
+
 
 # --------------------------------------------------------------------------------------------------
 # Functions
@@ -92,33 +116,36 @@ def get_age_range(population_changes: dict, ranges: dict) -> dict:
     return output
 
 
-def calc_historic_construction(country: str = "AT") -> None:
-    """This function calculates the historic statistics."""
-    ages = {
-        "Residential": [
-            (1850, 1918),
-            (1919, 1944),
-            (1945, 1960),
-            (1961, 1980),
-            (1981, 1990),
-            (1991, 2000),
-            (2001, 2009),
-            (2010, 2022),
-        ],
-        "Non-residential": [
-            (1850, 1944),
-            (1945, 1969),
-            (1970, 1979),
-            (1980, 1989),
-            (1990, 1999),
-            (2000, 2010),
-            (2011, 2022),
-        ],
-    }
+def population_title(country: str) -> str:
+    """This function returns the title of the population file of a country. The files are
+    stored in lower case."""
+    for title in (country, country.lower()):
+        if os.path.isfile(f"statistics/population/{title}.json"):
+            return title
+    return country
+
+
+def construction_key(country: str = "AT") -> str:
+    """This function returns the key of the construction statistic."""
+    return statistic_key(
+        {"country": country, "ages": AGE_RANGES, "reference": REFERENCE},
+        [f"statistics/population/{population_title(country)}.json"],
+    )
+
+
+def calc_historic_construction(country: str = "AT", reload: bool = True) -> bool:
+    """This function calculates the historic statistics. If reload is not set, they are only
+    calculated if the age ranges or the population development changed. It returns if the
+    statistic was calculated."""
+    key = construction_key(country)
+    if not reload and is_current("constructionStatistic", key):
+        return False
     population_development = import_json(
-        title=country, location="statistics/population"
+        title=population_title(country), location="statistics/population"
     )
     yearly_chances = get_age_range(
-        clean(get_population_change(fill_gaps(population_development))), ages
+        clean(get_population_change(fill_gaps(population_development))), AGE_RANGES
     )
     export_json(yearly_chances, title="constructionStatistic", location="statistics")
+    store_key("constructionStatistic", key)
+    return True
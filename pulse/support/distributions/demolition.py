@@ -10,18 +10,27 @@ License: See LICENSE.md
 Description: This file deals with the probability calculations for demolition rates
 """
 
-# --------------------------------------------------------------------------------------------------
-# Imports Global Libraries
-# --------------------------------------------------------------------------------------------------
-
 # --------------------------------------------------------------------------------------------------
 # Imports Local Libraries
 # --------------------------------------------------------------------------------------------------
 from ..file_handling import export_json
+from .statistics_cache import statistic_key, is_current, store_key
 
 # --------------------------------------------------------------------------------------------------
 # Definitions
 # --------------------------------------------------------------------------------------------------
+# The weibull parameters (k, lambda) of the buildings built before 1945 and of the newer ones
+WEIBULL_PARAMETERS = {
+    "Residential": {2100: (4, 130), 1945: (0.9, 220)},
+    "Education (EDU)": {2100: (3, 80), 1945: (0.9, 220)},
+    "Health (HEA)": {2100: (3, 80), 1945: (0.9, 220)},
+    "Hotel and Restaurant (HOR)": {2100: (3.5, 120), 1945: (0.9, 220)},
+    "Office (OFF)": {2100: (2.5, 90), 1945: (0.9, 220)},
+    "Other non-residential building (OTH)": {2100: (2, 105), 1945: (0.9, 220)},
+    "Trade (TRA)": {2100: (2.5, 80), 1945: (0.9, 220)},
+}
+AGE_RANGE = (1, 201)
+# The approximation of the exponential the weibull tables are calculated with
 E = 2.71828
 
 
@@ -36,7 +45,8 @@ def get_weibull(
     ageRange: tuple = (1, 201),
     date: int = 2023
 ) -> dict:
-    """This function calculates weibull functions."""
+    """This function calculates weibull functions. The exponential is approximated by E, like the
+    demolition rates have always been calculated, so the statistic does not change."""
     output = {0: 0}
     for x in range(ageRange[0], ageRange[1]):
         year = date - x
@@ -50,36 +60,24 @@ def get_weibull(
     return output
 
 
-def calc_future_demolition() -> None:
-    """This function calculates the weibull distribution and exports it."""
+def demolition_key() -> str:
+    """This function returns the key of the weibull statistic."""
+    return statistic_key({"parameters": WEIBULL_PARAMETERS, "ages": AGE_RANGE, "e": E})
+
+
+def calc_future_demolition(reload: bool = True) -> bool:
+    """This function calculates the weibull distribution and exports it. If reload is not set,
+    it is only calculated if the parameters changed. It returns if the statistic was calculated."""
+    key = demolition_key()
+    if not reload and is_current("weibull", key):
+        return False
     demo_rate = {
-        "Residential": {
-            2100: get_weibull(4, 130),
-            1945: get_weibull(0.9, 220),
-        },
-        "Education (EDU)": {
-            2100: get_weibull(3, 80),
-            1945: get_weibull(0.9, 220),
-        },
-        "Health (HEA)": {
-            2100: get_weibull(3, 80),
-            1945: get_weibull(0.9, 220),
-        },
-        "Hotel and Restaurant (HOR)": {
-            2100: get_weibull(3.5, 120),
-            1945: get_weibull(0.9, 220),
-        },
-        "Office (OFF)": {
-            2100: get_weibull(2.5, 90),
-            1945: get_weibull(0.9, 220),
-        },
-        "Other non-residential building (OTH)": {
-            2100: get_weibull(2, 105),
-            1945: get_weibull(0.9, 220),
-        },
-        "Trade (TRA)": {
-            2100: get_weibull(2.5, 80),
-            1945: get_weibull(0.9, 220),
-        },
+        use: {
+            era: get_weibull(k, lam, ageRange=AGE_RANGE)
+            for era, (k, lam) in parameters.items()
+        }
+        for use, parameters in WEIBULL_PARAMETERS.items()
     }
     export_json(demo_rate, title="weibull", location="statistics")
+    store_key("weibull", key)
+    return True
@@ -0,0 +1,59 @@
+"""
+statistics_cache.py
+-------------------
+
+Author: Benedict Schwark 
+Supervision: Nicolas Alaux
+Other contributors: See README.md
+License: See LICENSE.md
+
+Description:  This file deals with the keys of the generated statistics. Every statistic is
+              stored together with a hash of the parameters and input files it was generated
+              from, so it is regenerated as soon as one of them changes.
+"""
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import hashlib
+import json
+import logging
+import os
+
+# --------------------------------------------------------------------------------------------------
+# Definitions
+# --------------------------------------------------------------------------------------------------
+STATISTICS_VERSION = 1
+LOCATION = "statistics"
+
+
+# --------------------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------------------
+def statistic_key(parameters, files: list[str] | tuple = ()) -> str:
+    """This function hashes the generating parameters and the content of the input files."""
+    hash_ = hashlib.sha256(
+        json.dumps([STATISTICS_VERSION, parameters], sort_keys=True, default=str).encode()
+    )
+    for file_name in files:
+        with open(file_name, "rb") as file:
+            hash_.update(file.read())
+    return hash_.hexdigest()
+
+
+def is_current(title: str, key: str, location: str = LOCATION) -> bool:
+    """This function checks if a statistic exists and was generated with the given key."""
+    if not os.path.isfile(f"{location}/{title}.json"):
+        return False
+    try:
+        with open(f"{location}/{title}.key", "r", encoding="UTF-8") as file:
+            return file.read().strip() == key
+    except OSError:
+        return False
+
+
+def store_key(title: str, key: str, location: str = LOCATION) -> None:
+    """This function stores the key of a generated statistic."""
+    with open(f"{location}/{title}.key", "w", encoding="UTF-8") as file:
+        file.write(f"{key}\n")
+    logging.debug("Stored the key of the statistic '%s'", title)
@@ -7,8 +7,23 @@ Other contributors: See README.md
 License: See LICENSE.md
 
 """
-from .importer import import_json
+from .importer import import_json, import_shared_json
 from .initializer import import_data
 from .exporter import export_json, export_csv
+from .table_exporter import export_table, ResultTable, FORMATS
+from .checkpoint import Checkpoints, load_checkpoint, latest_checkpoint, read_header
+from .checkpoint import dump_state, load_state, read_checkpoint
+from .result_sink import ResultSink, MemorySink, StreamSink, iter_stream, load_stream, load_result
 
-from .grapher import Graph, NUMBERS, PRODUCTS, ENERGY, LCA
\ No newline at end of file
+# The grapher loads matplotlib, seaborn, pandas, plotly and scipy, so it is only imported when it
+# is used. A calculation without graphs does not need any of them.
+GRAPHER = ("Graph", "NUMBERS", "PRODUCTS", "ENERGY", "LCA")
+
+
+def __getattr__(name: str):
+    """This function imports the grapher the first time it is asked for."""
+    if name in GRAPHER:
+        from . import grapher
+
+        return getattr(grapher, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
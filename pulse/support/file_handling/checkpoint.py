@@ -0,0 +1,185 @@
+"""
+checkpoint.py
+-------------
+
+Author: Benedict Schwark 
+Supervision: Nicolas Alaux
+Other contributors: See README.md
+License: See LICENSE.md
+
+Description: This file deals with the checkpoints of a calculation. A checkpoint is the complete
+simulation state at the end of a year (the stock items with their building numbers and the
+calculation context), so a scenario can be resumed from it instead of replaying every year from
+the initial stock. The same state is used to fork a scenario into several branches.
+"""
+
+# --------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------
+import glob
+import io
+import logging
+import os
+import pickle
+import re
+from collections.abc import Iterable, Mapping
+
+# --------------------------------------------------------------------------------------
+# Definitions
+# --------------------------------------------------------------------------------------
+FILE_PATH = "output/checkpoints"
+# Increased whenever the pickled state changes, older checkpoints are rejected when they are read
+CHECKPOINT_VERSION = 2
+
+
+# --------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------
+class StatePickler(pickle.Pickler):
+    """This pickler stores the buildings of the catalog by their code. They are part of the
+    input data and not of the simulation state, so they are neither copied into the checkpoint
+    nor duplicated when it is loaded."""
+
+    def __init__(self, file, buildings: Mapping) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.codes = {id(building): code for code, building in buildings.items()}
+
+    def persistent_id(self, obj):
+        return self.codes.get(id(obj))
+
+
+class StateUnpickler(pickle.Unpickler):
+    """This unpickler replaces the stored building codes with the buildings of the catalog."""
+
+    def __init__(self, file, buildings: Mapping) -> None:
+        super().__init__(file)
+        self.buildings = buildings
+
+    def persistent_load(self, pid):
+        assert pid in self.buildings, f"The building {pid} of the checkpoint is not in the model"
+        return self.buildings[pid]
+
+
+class Checkpoints:
+    """This class decides after which years the state of a scenario is stored.\n
+    If no years are given, the state is stored after every year and only the latest checkpoint
+    of the scenario is kept, which is enough to survive a crash. If years are given, a checkpoint
+    is stored after each of them and all of them are kept, e.g. to rerun variations of the later
+    years."""
+
+    def __init__(self, years: Iterable[int] | None = None, location: str = FILE_PATH) -> None:
+        """This function initializes the checkpoints.\n
+        years (Iterable[int] | None): The years after which the state is stored.
+        location (str): The folder of the checkpoint files."""
+        self.years = set(years) if years is not None else None
+        self.location = location
+
+    def __repr__(self) -> str:
+        return f"Checkpoints({sorted(self.years) if self.years is not None else 'every year'})"
+
+    def due(self, year: int) -> bool:
+        """This function checks if a checkpoint is stored after the year."""
+        return self.years is None or year in self.years
+
+    def save(self, scenarios: Iterable[str], year: int, state: bytes) -> None:
+        """This function stores the state after the year for every given scenario, scenarios
+        that are calculated together share the same state."""
+        os.makedirs(self.location, exist_ok=True)
+        for scenario in scenarios:
+            file_name = save_checkpoint(
+                checkpoint_file(scenario, year, self.location),
+                scenario=scenario,
+                year=year,
+                state=state,
+            )
+            if self.years is None:
+                for old in list_checkpoints(scenario, self.location):
+                    if old != file_name:
+                        os.remove(old)
+
+
+# --------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------
+def checkpoint_file(scenario: str, year: int, location: str = FILE_PATH) -> str:
+    """This function returns the file name of the checkpoint of a scenario after a year."""
+    return f"{location}/{re.sub(r'[^\w\-. ]', '_', scenario)}-{year}.ckpt"
+
+
+def list_checkpoints(scenario: str, location: str = FILE_PATH) -> list[str]:
+    """This function returns the checkpoint files of a scenario, ordered by their year."""
+    prefix = checkpoint_file(scenario, 0, location)[: -len("0.ckpt")]
+    files = [
+        file_name
+        for file_name in glob.glob(f"{glob.escape(prefix)}*.ckpt")
+        if file_name[len(prefix) : -len(".ckpt")].isdigit()
+    ]
+    return sorted(files, key=lambda file_name: int(file_name[len(prefix) : -len(".ckpt")]))
+
+
+def latest_checkpoint(scenario: str, location: str = FILE_PATH) -> str | None:
+    """This function returns the latest checkpoint file of a scenario, if there is one."""
+    files = list_checkpoints(scenario, location)
+    return files[-1] if files else None
+
+
+def dump_state(stock: dict, context, buildings: Mapping) -> bytes:
+    """This function pickles the simulation state (the stock and the calculation context)."""
+    buffer = io.BytesIO()
+    StatePickler(buffer, buildings).dump((stock, context))
+    return buffer.getvalue()
+
+
+def load_state(state: bytes, buildings: Mapping) -> tuple[dict, object]:
+    """This function restores the stock and the calculation context of a pickled state. Every
+    call returns an independent copy, which is how a state gets forked."""
+    return StateUnpickler(io.BytesIO(state), buildings).load()
+
+
+def save_checkpoint(file_name: str, *, scenario: str, year: int, state: bytes) -> str:
+    """This function stores the simulation state at the end of a year. The file starts with a
+    small header (version, scenario, year), followed by the pickled state (see dump_state).
+    It is written to a temporary file first, so a crash never leaves a broken checkpoint."""
+    temp = f"{file_name}.{os.getpid()}.tmp"
+    with open(temp, "wb") as file:
+        pickle.dump(
+            {"version": CHECKPOINT_VERSION, "scenario": scenario, "year": year},
+            file,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        file.write(state)
+    os.replace(temp, file_name)
+    logging.info(
+        "Stored the checkpoint of scenario '%s' after %d in '%s'", scenario, year, file_name
+    )
+    return file_name
+
+
+def read_header(file_name: str) -> dict:
+    """This function reads only the header of a checkpoint."""
+    with open(file_name, "rb") as file:
+        return pickle.load(file)
+
+
+def read_checkpoint(file_name: str) -> tuple[dict, bytes]:
+    """This function reads a checkpoint and returns its header and the pickled state."""
+    with open(file_name, "rb") as file:
+        header = pickle.load(file)
+        assert header.get("version") == CHECKPOINT_VERSION, (
+            f"The checkpoint {file_name} was written by another version ({header.get('version')})"
+        )
+        return header, file.read()
+
+
+def load_checkpoint(file_name: str, buildings: Mapping) -> tuple[dict, dict, object]:
+    """This function loads a checkpoint and returns its header, the stock and the calculation
+    context. The buildings are taken from the given catalog."""
+    header, state = read_checkpoint(file_name)
+    stock, context = load_state(state, buildings)
+    logging.info(
+        "Loaded the checkpoint of scenario '%s' after %d from '%s'",
+        header["scenario"],
+        header["year"],
+        file_name,
+    )
+    return header, stock, context
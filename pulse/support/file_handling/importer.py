@@ -15,11 +15,13 @@ License: See LICENSE.md
 import csv
 import json
 import logging
+import os
 
 # --------------------------------------------------------------------------------------
 # Parameters
 # --------------------------------------------------------------------------------------
 FILE_PATH = "input"
+SHARED_TABLES: dict[tuple[str, str], dict] = {}
 
 # --------------------------------------------------------------------------------------
 # Functions
@@ -42,9 +44,19 @@ def import_json(*, title: str, location: str) -> dict:
     return data
 
 
+def import_shared_json(*, title: str, location: str) -> dict:
+    """This function imports a JSON file only once per process. The returned table is shared
+    between all the scenarios calculated in the process and must not be changed."""
+    key = (location, title)
+    if key not in SHARED_TABLES:
+        SHARED_TABLES[key] = import_json(title=title, location=location)
+    return SHARED_TABLES[key]
+
+
 def import_csv(*, title: str, location: str = "") -> list[dict]:
-    """This function imports dictionaries from CSV files."""
+    """This function imports dictionaries from CSV files. The title is taken from the input
+    folder, unless it is an absolute path."""
     logging.debug("Importing CSV file %s/%s.json", location, title)
-    with open(f"{FILE_PATH}{location}/{title}", "r", encoding='UTF-8') as file:
+    with open(os.path.join(f"{FILE_PATH}{location}", title), "r", encoding='UTF-8') as file:
         data = list(csv.DictReader(file))
     return data
\ No newline at end of file
@@ -15,6 +15,7 @@ Description: This file deals with the import of various different file types and
 import logging
 
 from pulse.support.file_handling.importer import import_csv, int_list
+from pulse.support.file_handling.model_cache import CACHE_PATH, cache_key, load_model, store_model
 
 # --------------------------------------------------------------------------------------
 # Imports Local Libraries
@@ -24,7 +25,7 @@ from pulse.support.file_handling.importer import import_csv, int_list
 from ..variables import PRODUCT_IDs
 
 # CLASSES
-from ..data_types import Product, Component, Building, Scenario
+from ..data_types import Product, Component, Building, Scenario, PRODUCT_REGISTRY, INTENSITY_MATRIX
 
 # --------------------------------------------------------------------------------------
 # Definitions
@@ -159,8 +160,23 @@ def remove_unused(data, alt_requirements, u_requirements) -> tuple[int, int]:
     return c_reduction, p_reduction
 
 
-def import_data(detail: dict, **kwargs):
-    """This function imports data from the four data sources"""
+def import_data(detail: dict, cache: bool = True, cache_location: str = CACHE_PATH, **kwargs):
+    """This function imports data from the four data sources. If cache is set, the compiled
+    model is stored in the cache location and reused as long as the input files, the detail
+    requirement and the source code stay the same."""
+    if cache:
+        key = cache_key(detail, **kwargs)
+        data = load_model(key, cache_location)
+        if data is not None:
+            return data
+        data = compile_model(detail, **kwargs)
+        store_model(key, data, cache_location)
+        return data
+    return compile_model(detail, **kwargs)
+
+
+def compile_model(detail: dict, **kwargs):
+    """This function parses and links the products, components, buildings and scenarios."""
     data = [
         create_objects(import_csv(title=arg), kind) for kind, arg in kwargs.items()
     ] 
@@ -175,6 +191,9 @@ def import_data(detail: dict, **kwargs):
 
     products, components, buildings, scenarios = data
 
+    # Fixing the column order of the product vectors before any products get grouped
+    PRODUCT_REGISTRY.register(products)
+
     for product in products.values():
         product.getIDTranslation(PRODUCT_IDs)
 
@@ -186,4 +205,7 @@ def import_data(detail: dict, **kwargs):
         building.link_components(components)
         building.calc_products(alt_requirements, components, detail["products"])
 
+    # Stacking the material intensities of all typology variants for the product flows
+    INTENSITY_MATRIX.register(buildings, components)
+
     return products, components, buildings, scenarios
@@ -0,0 +1,128 @@
+"""
+model_cache.py
+--------------
+
+Author: Benedict Schwark 
+Supervision: Nicolas Alaux
+Other contributors: See README.md
+License: See LICENSE.md
+
+Description: This file deals with the cache of the compiled model (the linked products,
+components, buildings and scenarios), so unchanged inputs do not need to be parsed again.
+"""
+
+# --------------------------------------------------------------------------------------
+# Imports
+# --------------------------------------------------------------------------------------
+import contextlib
+import glob
+import hashlib
+import logging
+import os
+import pickle
+import time
+
+from .importer import FILE_PATH
+from ..variables import PRODUCT_IDs
+from ..data_types import PRODUCT_REGISTRY, INTENSITY_MATRIX
+
+# --------------------------------------------------------------------------------------
+# Parameters
+# --------------------------------------------------------------------------------------
+CACHE_PATH = "output/.cache"
+CACHE_VERSION = 1
+# Compiled models that were not used for this many days are removed
+CACHE_DAYS = 30
+
+# --------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------
+def source_files() -> list[str]:
+    """This function returns the source files the compiled objects depend on, which are all the
+    modules of the support package (data types, importer, initializer, variables, ...). A change
+    in one of them invalidates the cache as well."""
+    folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return sorted(
+        glob.glob(os.path.join(folder, "**", "*.py"), recursive=True),
+        key=lambda name: os.path.relpath(name, folder),
+    )
+
+
+def cache_key(detail: dict, **kwargs) -> str:
+    """This function hashes the input files, the detail requirement and the source files into
+    the key of the compiled model."""
+    requirement = sorted((kind, str(level)) for kind, level in detail.items())
+    hash_ = hashlib.sha256(f"{CACHE_VERSION}|{requirement}".encode())
+    for kind, title in kwargs.items():
+        hash_.update(f"|{kind}|{title}|".encode())
+        with open(os.path.join(FILE_PATH, title), "rb") as file:
+            hash_.update(file.read())
+    for source in source_files():
+        with open(source, "rb") as file:
+            hash_.update(file.read())
+    return hash_.hexdigest()[:32]
+
+
+def cache_file(key: str, location: str = CACHE_PATH) -> str:
+    """This function returns the file name of a compiled model."""
+    return f"{location}/model-{key}.pkl"
+
+
+def load_model(key: str, location: str = CACHE_PATH) -> tuple | None:
+    """This function loads the compiled model, if it exists. The product registry, the product
+    IDs and the intensity matrix are restored first, because the products are stored by their
+    positions in them. If the model can not be loaded, all three are reset again."""
+    if not os.path.isfile(cache_file(key, location)):
+        return None
+    if len(PRODUCT_REGISTRY) or len(INTENSITY_MATRIX):
+        logging.debug("The product registry is already filled, the model cache is not used")
+        return None
+    previous = {kind: dict(names) for kind, names in PRODUCT_IDs.items()}
+    try:
+        with open(cache_file(key, location), "rb") as file:
+            registry, ids, matrix = pickle.load(file)
+            PRODUCT_REGISTRY.__dict__.update(registry)
+            for kind, names in ids.items():
+                PRODUCT_IDs[kind].update(names)
+            INTENSITY_MATRIX.__dict__.update(matrix)
+            data = pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, TypeError) as error:
+        logging.warning("The model cache could not be loaded (%s), it is rebuilt", repr(error))
+        PRODUCT_REGISTRY.__init__()
+        INTENSITY_MATRIX.__init__()
+        for kind, names in PRODUCT_IDs.items():
+            names.clear()
+            names.update(previous[kind])
+        return None
+    with contextlib.suppress(OSError):
+        # Marks the model as used, so it is not pruned
+        os.utime(cache_file(key, location))
+    logging.info("Loaded the compiled model from the cache '%s'", cache_file(key, location))
+    return data
+
+
+def store_model(key: str, data: tuple, location: str = CACHE_PATH) -> None:
+    """This function stores the compiled model and removes the ones of the folder that were not
+    used for CACHE_DAYS days. The models of other keys (e.g. other details) are kept."""
+    os.makedirs(location, exist_ok=True)
+    prune_models(location)
+    temp = f"{cache_file(key, location)}.{os.getpid()}.tmp"
+    with open(temp, "wb") as file:
+        pickle.dump(
+            (PRODUCT_REGISTRY.__dict__, PRODUCT_IDs, INTENSITY_MATRIX.__dict__),
+            file,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp, cache_file(key, location))
+    logging.info("Stored the compiled model in the cache '%s'", cache_file(key, location))
+
+
+def prune_models(location: str = CACHE_PATH, days: int = CACHE_DAYS) -> None:
+    """This function removes the compiled models of the folder that were not used for the given
+    number of days. Other processes may remove the same files at the same time."""
+    limit = time.time() - days * 24 * 60 * 60
+    for old in glob.glob(f"{location}/model-*.pkl"):
+        with contextlib.suppress(FileNotFoundError):
+            if os.path.getmtime(old) < limit:
+                os.remove(old)
@@ -0,0 +1,156 @@
+"""
+result_sink.py
+--------------
+
+Author: Benedict Schwark 
+Supervision: Nicolas Alaux
+Other contributors: See README.md
+License: See LICENSE.md
+
+Description: This file deals with the sinks the calculation hands its results to. A scenario is
+calculated year by year and every finished year is passed to the sink, which either keeps it in
+memory or streams it to a file.
+"""
+
+# --------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------
+import logging
+import os
+import pickle
+import re
+from collections.abc import Iterator
+
+# --------------------------------------------------------------------------------------
+# Definitions
+# --------------------------------------------------------------------------------------
+FILE_PATH = "output/stream"
+
+
+# --------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------
+class ResultSink:
+    """This class is the base of the result sinks. A sink is opened once per scenario, gets the
+    results of every year in order and is closed after the last year, or aborted if the
+    calculation fails."""
+
+    def __init__(self, result: dict) -> None:
+        """This function initializes the sink.\n
+        result (dict): The result dictionary of the scenario."""
+        self.result = result
+        self.scenario: str | None = None
+        self.years = 0
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.scenario}, {self.years} years)"
+
+    def open(self, scenario: str) -> None:
+        """This function is called before the first year of a scenario."""
+        self.scenario = scenario
+        self.years = 0
+
+    def add(self, year: int, data: dict) -> None:
+        """This function takes the results of one year (kind -> stage -> ...)."""
+        self.years += 1
+
+    def close(self) -> None:
+        """This function is called after the last year of a scenario."""
+
+    def abort(self) -> None:
+        """This function is called instead of close if the calculation of a scenario fails."""
+
+
+class MemorySink(ResultSink):
+    """This sink collects the results in the result dictionary (kind -> year -> stage -> ...),
+    which is the layout the grapher and the exporters work with."""
+
+    def add(self, year: int, data: dict) -> None:
+        super().add(year, data)
+        for kind, values in data.items():
+            self.result.setdefault(kind, {})[year] = values
+
+
+class StreamSink(ResultSink):
+    """This sink writes every year to a file as soon as it is finished, so the memory of a
+    scenario does not grow with the number of years. The file is written to a temporary name
+    and only renamed when the scenario is complete, an interrupted scenario never leaves a
+    stream behind. After closing, result['stream'] holds the file name."""
+
+    def __init__(self, result: dict, location: str = FILE_PATH) -> None:
+        """This function initializes the sink.\n
+        result (dict): The result dictionary of the scenario.
+        location (str): The folder of the stream files."""
+        super().__init__(result)
+        self.location = location
+        self.file = None
+        self.fileName = ""
+
+    def open(self, scenario: str) -> None:
+        super().open(scenario)
+        os.makedirs(self.location, exist_ok=True)
+        self.fileName = stream_file(scenario, self.location)
+        self.file = open(f"{self.fileName}.{os.getpid()}.tmp", "wb")
+
+    def add(self, year: int, data: dict) -> None:
+        assert self.file is not None, "The stream sink was not opened"
+        super().add(year, data)
+        pickle.dump((year, data), self.file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def close(self) -> None:
+        assert self.file is not None, "The stream sink was not opened"
+        temp = self.file.name
+        self.file.close()
+        self.file = None
+        os.replace(temp, self.fileName)
+        self.result["stream"] = self.fileName
+        logging.info(
+            "Streamed %d years of scenario '%s' to '%s'", self.years, self.scenario, self.fileName
+        )
+
+    def abort(self) -> None:
+        """This function closes and removes the temporary file of a failed scenario."""
+        if self.file is None:
+            return
+        temp = self.file.name
+        self.file.close()
+        self.file = None
+        if os.path.exists(temp):
+            os.remove(temp)
+        logging.info("Removed the stream of the failed scenario '%s'", self.scenario)
+
+
+# --------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------
+def stream_file(scenario: str, location: str = FILE_PATH) -> str:
+    """This function returns the file name of the stream of a scenario."""
+    return f"{location}/{re.sub(r'[^\w\-. ]', '_', scenario)}.pkl"
+
+
+def iter_stream(file_name: str) -> Iterator[tuple[int, dict]]:
+    """This function reads a stream year by year."""
+    with open(file_name, "rb") as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def load_stream(file_names: str | list[str]) -> dict:
+    """This function reads a whole stream back into a result dictionary. A scenario that was
+    forked from others is streamed in parts, which are read one after the other."""
+    sink = MemorySink({})
+    for file_name in [file_names] if isinstance(file_names, str) else file_names:
+        for year, data in iter_stream(file_name):
+            sink.add(year, data)
+    return sink.result
+
+
+def load_result(result: dict) -> dict:
+    """This function returns the results of a scenario, reading them from their stream if the
+    scenario was streamed."""
+    if "stream" in result:
+        return load_stream(result["stream"])
+    return result
@@ -0,0 +1,237 @@
+"""
+table_exporter.py
+-----------------
+
+Author: Benedict Schwark 
+Supervision: Nicolas Alaux
+Other contributors: See README.md
+License: See LICENSE.md
+
+Description: This file deals with the export of the results as one long format table. Every
+value of every scenario, year and stage is one row, so the results can be analysed without
+walking the nested dictionaries again.
+"""
+
+# --------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------
+import csv
+import gzip
+import importlib
+import importlib.util
+import logging
+import os
+from collections.abc import Iterable
+
+import numpy as np
+
+# --------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------
+from ..data_types import GroupedProducts
+
+# --------------------------------------------------------------------------------------
+# Definitions
+# --------------------------------------------------------------------------------------
+FILE_PATH = "output/table"
+
+RESULTS = ("numbers", "volume", "products", "recycling", "energy", "lca", "impacts", "prospectives")
+LEVELS = ("country", "typology", "component", "product")
+TEXT_COLUMNS = ("scenario", "result", "stage") + LEVELS + ("impact", "prospective")
+COLUMNS = (
+    ("scenario", "year", "result", "stage") + LEVELS + ("index", "impact", "prospective", "value")
+)
+FORMATS = ("parquet", "npz", "csv")
+# The order of the values in the collected rows
+ROW = ("scenario", "result", "stage", "impact", "prospective", "year") + LEVELS + ("index", "value")
+PADDING = tuple((0,) * (len(LEVELS) - n) for n in range(len(LEVELS) + 1))
+# pyarrow is optional and slow to import, so it is only looked up here and imported on use
+PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+
+# --------------------------------------------------------------------------------------
+# Classes
+# --------------------------------------------------------------------------------------
+class ResultTable:
+    """This class collects the results as rows of numbers and turns them into columns at the end.
+    The text columns are stored as codes into a list of labels, like a categorical column, so the
+    table stays small."""
+
+    def __init__(self) -> None:
+        """This function initializes the result table."""
+        self.labels: dict[str, list[str]] = {column: [""] for column in TEXT_COLUMNS}
+        self.index: dict[str, dict[str, int]] = {column: {"": 0} for column in TEXT_COLUMNS}
+        self.rows: list[tuple] = []
+
+    def __repr__(self) -> str:
+        return f"ResultTable({len(self)} rows)"
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def code(self, column: str, label) -> int:
+        """This function returns the code of a label and registers unknown labels."""
+        label = str(label)
+        if label not in self.index[column]:
+            self.index[column][label] = len(self.labels[column])
+            self.labels[column].append(label)
+        return self.index[column][label]
+
+    def add(self, prefix: tuple, keys: tuple, index: int, value) -> None:
+        """This function adds one row.\n
+        prefix (tuple): The codes of the scenario, result, stage, impact and prospective and the
+                        year.
+        keys (tuple): The codes of the country, typology, component and product, as far as the
+                      detail of the result goes."""
+        self.rows.append(prefix + keys + PADDING[len(keys)] + (index, float(value)))
+
+    def addLeaf(self, prefix: tuple, keys: tuple, leaf, impacts: tuple = ()) -> None:
+        """This function adds the rows of one leaf of the result dictionaries. The leaves of the
+        impacts are lists with one value per impact category, they are added as one row per
+        category."""
+        if leaf is None:
+            return None
+        if impacts and isinstance(leaf, list):
+            for impact, value in zip(impacts, leaf):
+                self.add(prefix[:3] + (impact,) + prefix[4:], keys, -1, value)
+            return None
+        if isinstance(leaf, GroupedProducts):
+            level, base, padding = LEVELS[len(keys)], prefix + keys, PADDING[len(keys) + 1]
+            self.rows.extend(
+                base + (self.code(level, product),) + padding + (-1, amount)
+                for product, amount in leaf.dictify().items()
+            )
+            return None
+        if isinstance(leaf, (list, tuple)):
+            for index, value in enumerate(leaf):
+                self.add(prefix, keys, index, value)
+            return None
+        self.add(prefix, keys, -1, leaf)
+        return None
+
+    def addResults(
+        self, scenario: str, results: dict, impact: str = "", impacts: list[str] | None = None
+    ) -> None:
+        """This function adds all results of one scenario. The impact is only set for the rows
+        of the lca. If the lca was calculated for several impact categories (impacts), their rows
+        replace the ones of the first category. The lca of additional prospective scenarios
+        (prospectives) is added as lca rows with the prospective set."""
+        codes = tuple(self.code("impact", name) for name in impacts) if impacts else ()
+        for result in RESULTS:
+            if result not in results or not results[result]:
+                continue
+            if result == "lca" and codes and "impacts" in results:
+                continue
+            label = "lca" if result in ("impacts", "prospectives") else result
+            for year, data in results[result].items():
+                by_prospective = data if result == "prospectives" else {"": data}
+                for prospective, stages in by_prospective.items():
+                    for stage, values in stages.items():
+                        prefix = (
+                            self.code("scenario", scenario),
+                            self.code("result", label),
+                            self.code("stage", stage),
+                            self.code("impact", impact if label == "lca" else ""),
+                            self.code("prospective", prospective),
+                            int(year),
+                        )
+                        self.walk(prefix, values, (), codes if result != label else ())
+
+    def walk(self, prefix: tuple, data, keys: tuple, impacts: tuple = ()) -> None:
+        """This function walks through the nested dictionary of one stage."""
+        if not isinstance(data, dict):
+            self.addLeaf(prefix, keys, data, impacts)
+            return None
+        level = LEVELS[len(keys)]
+        for key, value in data.items():
+            self.walk(prefix, value, keys + (self.code(level, key),), impacts)
+        return None
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """This function returns the columns as arrays, the text columns as codes."""
+        data = np.array(self.rows, dtype=np.float64).reshape(len(self.rows), len(ROW))
+        return {
+            column: (
+                data[:, ROW.index(column)]
+                if column == "value"
+                else data[:, ROW.index(column)].astype(np.int32 if column != "year" else np.int64)
+            )
+            for column in COLUMNS
+        }
+
+    def text(self, column: str) -> list[str]:
+        """This function returns a text column with the labels."""
+        labels, position = self.labels[column], ROW.index(column)
+        return [labels[row[position]] for row in self.rows]
+
+
+# --------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------
+def export_table(
+    results: dict[str, dict] | Iterable[tuple[str, dict]],
+    *,
+    impact: str = "",
+    impacts: list[str] | None = None,
+    title: str = "results",
+    location: str = FILE_PATH,
+    format_: str | None = None,
+) -> str:
+    """This function exports the results of all scenarios as one long format table and returns
+    the file name. The results are either a dictionary of the scenarios or an iterable of
+    (scenario, results) pairs, so streamed scenarios can be added one after the other.\n
+    impact (str): The impact category of the lca.
+    impacts (list[str]): The impact categories, if the lca was calculated for several of them.
+                         They also apply to the lca of the prospective scenarios.
+    format_ (str): 'parquet', 'npz' or 'csv'. Defaults to parquet if pyarrow is installed and
+                   to a compressed npz otherwise."""
+    format_ = format_ if format_ else ("parquet" if PARQUET else "npz")
+    assert format_ in FORMATS, f"{format_} is not a valid table format: {FORMATS}"
+    assert format_ != "parquet" or PARQUET, "Parquet needs pyarrow to be installed"
+
+    table = ResultTable()
+    for scenario, data in results.items() if isinstance(results, dict) else results:
+        if data:
+            table.addResults(scenario, data, impact, impacts)
+
+    os.makedirs(location, exist_ok=True)
+    arrays = table.arrays()
+    if format_ == "parquet":
+        pyarrow = importlib.import_module("pyarrow")
+        importlib.import_module("pyarrow.parquet")
+        file_name = f"{location}/{title}.parquet"
+        columns = {
+            column: (
+                pyarrow.DictionaryArray.from_arrays(
+                    arrays[column], pyarrow.array(table.labels[column])
+                )
+                if column in TEXT_COLUMNS
+                else pyarrow.array(arrays[column])
+            )
+            for column in COLUMNS
+        }
+        pyarrow.parquet.write_table(pyarrow.table(columns), file_name, compression="zstd")
+    elif format_ == "npz":
+        file_name = f"{location}/{title}.npz"
+        labels = {
+            f"{column}_labels": np.asarray(table.labels[column], dtype=str)
+            for column in TEXT_COLUMNS
+        }
+        np.savez_compressed(file_name, **arrays, **labels)
+    else:
+        file_name = f"{location}/{title}.csv.gz"
+        with gzip.open(file_name, "wt", newline="", encoding="UTF-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            writer.writerows(
+                zip(
+                    *(
+                        table.text(column)
+                        if column in TEXT_COLUMNS
+                        else [row[ROW.index(column)] for row in table.rows]
+                        for column in COLUMNS
+                    )
+                )
+            )
+    logging.info("Exported %d rows to the result table '%s'", len(table), file_name)
+    return file_name
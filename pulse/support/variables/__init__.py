@@ -41,16 +41,19 @@ from .format import (
     float_dash,
     list_strip,
     distribute_fully,
+    distribute_fully_array,
     percent,
     list_int_komma,
     list_float,
     distribute_in_relation,
+    distribute_in_relation_array,
     remove_available,
     add_available,
     get_share_of_used,
     prime,
 )
 from .reducers import reduce_detail, find_detail, adapt_detail, remove_empty
+from .globals import terminal_width
 
 # --------------------------------------------------------------------------------------------------
 # Classes
@@ -21,7 +21,7 @@ from enum import Enum
 # --------------------------------------------------------------------------------------------------
 # Imports Local Libraries
 # --------------------------------------------------------------------------------------------------
-from .globals import TERMINAL_WIDTH
+from .globals import terminal_width
 
 # --------------------------------------------------------------------------------------------------
 # Definitions
@@ -29,9 +29,10 @@ from .globals import TERMINAL_WIDTH
 def print_list(l: list, centered=True) -> None:
     """This function prints a list as individual lines."""
     print()
+    width = terminal_width()
     for l_ in l:
         if centered:
-            print(l_.center(TERMINAL_WIDTH))
+            print(l_.center(width))
         else:
             print(l_)
     print()
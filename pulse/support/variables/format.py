@@ -8,6 +8,7 @@ Other contributors: See README.md
 License: See LICENSE.md
 
 """
+import numpy as np
 
 
 def int_empty(x) -> int:
@@ -97,6 +98,23 @@ def distribute_fully(total: int, distribution: dict) -> dict:
     return number_distr
 
 
+def distribute_fully_array(total: int, distribution: np.ndarray) -> np.ndarray:
+    """This function is the array version of distribute_fully. The rounding differences are
+    assigned in the same order, so the results are identical."""
+    if total == 0:
+        return np.zeros(len(distribution), dtype=np.int64)
+    number_distr = (distribution * total + 0.5).astype(np.int64)
+    difference = int(number_distr.sum()) - total
+    if not difference:
+        return number_distr
+    ordered = np.argsort(-distribution, kind="stable")
+    multiplier = 1 if difference < 0 else -1
+    rounds, rest = divmod(abs(difference), len(ordered))
+    number_distr += rounds * multiplier
+    number_distr[ordered[:rest]] += multiplier
+    return number_distr
+
+
 def remove_available(to_be_removed, amount) -> tuple[dict | list | int , int | list]:
     """This function removes the availble"""
     assert type(to_be_removed) is type(
@@ -140,6 +158,14 @@ def distribute_in_relation(total: int, reference: dict) -> dict:
     )
 
 
+def distribute_in_relation_array(total: int, reference: np.ndarray) -> np.ndarray:
+    """This function is the array version of distribute_in_relation."""
+    reference_sum = reference.sum()
+    return distribute_fully_array(
+        total=total, distribution=reference / (reference_sum if reference_sum else 1)
+    )
+
+
 def add_available(to_be_added: dict, amount: dict, overflow: list[int]):
     """This function adds the available in amount to to_be_added."""
     return (
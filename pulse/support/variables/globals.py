@@ -9,7 +9,7 @@ License: See LICENSE.md
 
 """
 
-import os
+import shutil
 from enum import Enum
 
 # GLOBAL SWITCHES
@@ -19,12 +19,17 @@ NO_B8 = True
 # GLOBAL VARIABLES THAT ARE USED SYSTEM WIDE AND SHOULD ONLY BE SET ONCE
 INDICATOR = 3
 INDICATOR_NAMES = None
-TERMINAL_WIDTH, _ = os.get_terminal_size()
+TERMINAL_SIZE = (100, 40)  # Used if there is no terminal, e.g. in cron jobs or containers
 PROGRESS_BAR = None
 CURRENT_PROSPECTIVE = None
 VERSION = None
 NUMBERS = range(1)
 
+def terminal_width() -> int:
+    """This function returns the width of the terminal. It is only queried when something gets
+    printed, so importing the model does not need a terminal."""
+    return shutil.get_terminal_size(fallback=TERMINAL_SIZE).columns
+
 # STATIC INFORMATION THAT IS USED SYSTEM WIDE
 PRODUCT_IDs = {"categories":{}, "subcategories":{}, "products":{}}
 
@@ -45,6 +45,9 @@ def reduce_detail(data) -> dict | int:
                 continue
             if not r_:
                 r_ = data_
+            elif isinstance(r_, list):
+                # The values of several impact categories are added one by one
+                r_ = [value + value_ for value, value_ in zip(r_, data_)]
             else:
                 r_ += data_
         return r_
@@ -53,6 +56,9 @@ def reduce_detail(data) -> dict | int:
 
 def adapt_detail(data: dict | int, goal_detail: Detail):
     """This function adapts the detail of a dictionary."""
+    if hasattr(data, "reduce") and hasattr(data, "axes"):
+        # Output matrices change their detail by summing up axes
+        return data.reduce(goal_detail)
     if data == {}:
         return 0
     current_detail = find_detail(data)
@@ -75,11 +81,9 @@ def remove_empty(data):
         _type_: _description_
     """
     if isinstance(data, dict):
-        return {
-            key: remove_empty(data_)
-            for key, data_ in data.items()
-            if remove_empty(data_)
-        }
+        # Every entry is cleaned once, calling it again in the condition is exponential in the depth
+        cleaned = ((key, remove_empty(data_)) for key, data_ in data.items())
+        return {key: data_ for key, data_ in cleaned if data_}
     if isinstance(data, list):
         return data if any(data) else None
     if isinstance(data, int):
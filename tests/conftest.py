@@ -0,0 +1,135 @@
+# --------------------------------------------------------------------------------------------------
+# conftest.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file holds the fixtures of the equivalence tests. The tests compare the array
+#              based kernels with the scalar implementations they replaced, on synthetic products
+#              and lca tables, so they run without the input files and the lca database.
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import numpy as np
+import pytest
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from pulse.support.data_types import GroupedProducts, DenseProducts, LCATable
+from pulse.support.variables import Impact
+
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+# Synthetic product IDs, the categories do not exist in the product list
+CODES = [
+    f"{category}_{subcategory}{designation:02d}"
+    for category in ("TA", "TB", "TC")
+    for subcategory in (1, 2, 3)
+    for designation in range(1, 7)
+]
+YEAR = "2023"
+IMPACTS = len(Impact)
+# The energy carriers of the B6 table
+CARRIERS = ("B6.1", "B6.2 & B6.3", "Final Space Cooling", "Water Use", "Oil", "Gas", "Pellets")
+
+
+# --------------------------------------------------------------------------------------------------
+# Fixtures
+# --------------------------------------------------------------------------------------------------
+@pytest.fixture
+def rng() -> np.random.Generator:
+    """The random numbers of a test, seeded so failures can be reproduced."""
+    return np.random.default_rng(2023)
+
+
+@pytest.fixture
+def make_products(rng):
+    """This fixture returns a function that creates the same random products twice, as grouped
+    products (the scalar implementation) and as dense products. The products are added in a random
+    order and some of them are touched with a quantity of 0."""
+
+    def make(
+        count: int = 8, codes: list[str] | None = None
+    ) -> tuple[GroupedProducts, DenseProducts]:
+        codes = codes if codes else CODES
+        grouped, dense = GroupedProducts("Test", "t"), DenseProducts("Test", "t")
+        for nr in rng.choice(len(codes), size=min(count, len(codes)), replace=False).tolist():
+            amount = 0.0 if rng.random() < 0.1 else float(rng.uniform(0, 50))
+            grouped += (codes[nr], amount)
+            dense += (codes[nr], amount)
+        return grouped, dense
+
+    return make
+
+
+@pytest.fixture
+def make_stock(make_products):
+    """This fixture returns a function that creates a nested dictionary of random products
+    (country -> typology -> component -> products), once with grouped and once with dense
+    products."""
+
+    def make(countries=("AT", "DE"), typologies=2, components=3) -> tuple[dict, dict]:
+        grouped, dense = {}, {}
+        for country in countries:
+            grouped[country], dense[country] = {}, {}
+            for typology in range(typologies):
+                grouped_, dense_ = {}, {}
+                for component in range(components):
+                    grouped_[f"C{component}"], dense_[f"C{component}"] = make_products()
+                grouped[country][f"T{typology}"] = grouped_
+                dense[country][f"T{typology}"] = dense_
+        return grouped, dense
+
+    return make
+
+
+@pytest.fixture
+def tables(rng) -> dict[str, LCATable]:
+    """The lca tables of one year. Some products miss single tables, so the stages have to skip
+    them, and the A5 table holds the loss multipliers of the products."""
+
+    def table(codes, value) -> LCATable:
+        return LCATable.fromDict({YEAR: {code: value() for code in codes}})
+
+    def impacts() -> list[float]:
+        return rng.uniform(0, 5, IMPACTS).tolist()
+
+    codes = {
+        title: [code for code in CODES if rng.random() > 0.1] for title in ("A1", "A4", "C2", "C3")
+    }
+    output = {title: table(codes_, impacts) for title, codes_ in codes.items()}
+    # The A4 stage does not check the A5 table, so only products without A4 data miss it
+    output["A5"] = table(
+        [code for code in CODES if code in codes["A4"] or rng.random() > 0.5],
+        lambda: float(rng.uniform(0, 0.2)),
+    )
+    output["B6"] = table(CARRIERS, impacts)
+    return output
+
+
+@pytest.fixture
+def assert_close():
+    """This fixture returns a function that compares nested dictionaries and lists of numbers,
+    including the order of their keys."""
+
+    def compare(result, expected, path="") -> None:
+        if isinstance(expected, dict):
+            assert isinstance(result, dict), f"{path}: {result!r} is not a dictionary"
+            assert list(result) == list(expected), f"{path}: keys differ"
+            for key, value in expected.items():
+                compare(result[key], value, f"{path}/{key}")
+            return
+        if isinstance(expected, list):
+            assert isinstance(result, list) and len(result) == len(expected), f"{path}: differs"
+            for nr, (value, value_) in enumerate(zip(result, expected)):
+                compare(value, value_, f"{path}[{nr}]")
+            return
+        assert result == pytest.approx(expected, rel=1e-12, abs=1e-12), path
+
+    return compare
@@ -0,0 +1,109 @@
+# --------------------------------------------------------------------------------------------------
+# test_building_number.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file compares the vectorized demolition and distribution with the scalar
+#              implementations they replace
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import copy
+
+import numpy as np
+import pytest
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from pulse.support.data_types.building_number import (
+    BuildingNumber,
+    demolish,
+    STATES,
+    TOTAL,
+    BARE,
+    LIGHT,
+    MEDIUM,
+    DEEP,
+    PROTECTED,
+    HS_OLD,
+    HS_NEW,
+)
+from pulse.support.variables import distribute_fully
+from pulse.support.variables.format import distribute_fully_array
+
+
+# --------------------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------------------
+def building_number(rng, cohorts: int) -> BuildingNumber:
+    """This function creates a building number with random but consistent states, without the
+    construction statistics."""
+    matrix = np.zeros((cohorts, len(STATES)), dtype=np.int64)
+    matrix[:, TOTAL] = rng.integers(0, 400, cohorts)
+    matrix[:, TOTAL][rng.random(cohorts) < 0.1] = 0
+    for row in matrix:
+        row[[BARE, LIGHT, MEDIUM, DEEP]] = rng.multinomial(row[TOTAL], rng.dirichlet((4, 1, 1, 1)))
+        row[PROTECTED] = rng.integers(0, row[TOTAL] // 4 + 1)
+        row[HS_NEW] = rng.integers(0, row[TOTAL] + 1)
+        row[HS_OLD] = row[TOTAL] - row[HS_NEW]
+    number = BuildingNumber.__new__(BuildingNumber)
+    number.cohorts = list(range(1900, 1900 + cohorts))
+    number.initial_cohorts = cohorts
+    number.index = {cohort: row for row, cohort in enumerate(number.cohorts)}
+    number._data = matrix
+    return number
+
+
+def demolish_scalar(number: BuildingNumber, rates) -> list[int]:
+    """This function is the cohort by cohort demolition of StockItem.calcDemolition before it got
+    vectorized."""
+    overhang, total = 0, [0, 0, 0, 0]
+    for cohort, rate in zip(list(number.cohorts), rates):
+        amount = max(number.total[cohort] - number.protected[cohort], 0)
+        demoAmount = int(amount * rate + overhang)
+        overhang = (amount * rate + overhang) % 1
+        total = number.demo(cohort, demoAmount, total)
+    return total
+
+
+# --------------------------------------------------------------------------------------------------
+# Tests
+# --------------------------------------------------------------------------------------------------
+def test_demolish(rng):
+    """All typologies are demolished at once with the same results as one after the other."""
+    numbers = [building_number(rng, int(rng.integers(1, 30))) for _ in range(40)]
+    rates = [rng.uniform(0, 0.3, len(number.cohorts)) for number in numbers]
+    for rate in rates[::5]:
+        # Whole cohorts and more than the bare buildings get demolished
+        rate[rng.random(len(rate)) < 0.3] = 1
+    expected_numbers = copy.deepcopy(numbers)
+    expected = [demolish_scalar(number, rate) for number, rate in zip(expected_numbers, rates)]
+
+    assert demolish(numbers, rates) == expected
+    for number, expected_number in zip(numbers, expected_numbers):
+        np.testing.assert_array_equal(number.matrix, expected_number.matrix)
+        number.check(throw_error=True)
+
+
+def test_demolish_nothing():
+    """No building numbers give no demolitions."""
+    assert demolish([], []) == []
+
+
+@pytest.mark.parametrize("total", [0, 1, 7, 100, 12345])
+def test_distribute_fully_array(rng, total):
+    """The array version distributes the same numbers, also with tied shares."""
+    for size in (1, 3, 10, 40):
+        distribution = rng.dirichlet(np.ones(size))
+        tied = np.round(distribution, 1)
+        for shares in (distribution, tied / tied.sum() if tied.sum() else distribution):
+            expected = distribute_fully(total, dict(enumerate(shares.tolist())))
+            result = distribute_fully_array(total, shares)
+            assert result.tolist() == list(expected.values())
+            assert int(result.sum()) == total
@@ -0,0 +1,74 @@
+# --------------------------------------------------------------------------------------------------
+# test_characterization.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file compares the characterization of whole product flows with the lookup of
+#              every single product in the lca tables
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import pytest
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from pulse.support.data_types import CharacterizationMatrix, OutputMatrix, PRODUCT_REGISTRY
+from pulse.support.calculations.life_cycle_assessment import STAGE_TERMS, stage_lca
+from pulse.support.variables import Detail, Impact
+
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+INDICATORS = (Impact.GWP100, (Impact.GWP100, Impact.CTUE, Impact.WATER_USE))
+
+
+# --------------------------------------------------------------------------------------------------
+# Tests
+# --------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("vector", [False, True])
+def test_from_flows(rng, make_stock, vector):
+    """Stacking the leaves and multiplying them with the coefficients gives the same matrix as
+    going through the products of every leaf."""
+    _, dense = make_stock()
+    size = len(PRODUCT_REGISTRY)
+    coefficients = rng.uniform(0, 2, (size, 3) if vector else size)
+
+    matrix = OutputMatrix.fromFlows(dense, coefficients)
+    for column in range(3) if vector else (None,):
+        coefficients_ = coefficients[:, column] if vector else coefficients
+        expected = OutputMatrix.fromDict(
+            dense,
+            lambda product, amount: amount * coefficients_[PRODUCT_REGISTRY.index(product)],
+        )
+        assert matrix.axes == expected.axes
+        assert matrix.labels == expected.labels
+        assert (matrix.present == expected.present).all()
+        data = matrix.data[..., column] if vector else matrix.data
+        assert data.tolist() == expected.data.tolist()
+
+
+def test_from_flows_fallback(make_stock):
+    """Leaves that are not dense products are left to fromDict."""
+    grouped, _ = make_stock()
+    assert OutputMatrix.fromFlows(grouped) is None
+
+
+@pytest.mark.parametrize("impact", INDICATORS)
+@pytest.mark.parametrize("detail", [Detail.PRODUCT, Detail.TYPOLOGY, Detail.GROUPED])
+@pytest.mark.parametrize("kind", list(STAGE_TERMS))
+def test_stage_terms(make_stock, tables, assert_close, kind, detail, impact):
+    """The combined coefficients of every stage give the same impacts as calc_product_lca, which
+    looks up every product in the tables."""
+    _, dense = make_stock()
+    year = tables["A1"].years[0]
+    characterization = CharacterizationMatrix(tables, year)
+
+    result = stage_lca(dense, kind, year, detail, impact, tables, characterization)
+    expected = stage_lca(dense, kind, year, detail, impact, tables)
+    assert_close(result, expected)
@@ -0,0 +1,79 @@
+# --------------------------------------------------------------------------------------------------
+# test_dense_products.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file compares the dense products and the material flow with the grouped
+#              products they replace
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import pytest
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from pulse.support.data_types import GroupedProducts, DenseProducts, IntensityMatrix, MaterialFlow
+
+
+# --------------------------------------------------------------------------------------------------
+# Tests
+# --------------------------------------------------------------------------------------------------
+def test_arithmetic(rng, make_products):
+    """Adding, subtracting and scaling give the same products in the same order."""
+    grouped, dense = make_products(4)
+    for _ in range(40):
+        other, other_ = make_products(int(rng.integers(1, 10)))
+        operation = rng.integers(3)
+        if operation == 0:
+            grouped += other
+            dense += other_
+        elif operation == 1:
+            grouped -= other
+            dense -= other_
+        else:
+            factor = float(rng.uniform(0, 3))
+            grouped, dense = grouped * factor, dense * factor
+
+    assert list(dense.dictify().items()) == list(grouped.dictify().items())
+    assert dense.products == grouped.products
+    for code in ("TA", "TB_2", "TC_305", "TA_299"):
+        assert dense.getProducts(code) == grouped.getProducts(code)
+
+
+@pytest.mark.parametrize("merges", [0, 3])
+def test_material_flow(rng, make_products, merges):
+    """The terms of a material flow give the same products as adding up the grouped products
+    times their factors one after the other."""
+    intensity = IntensityMatrix()
+    flow = MaterialFlow(intensity)
+    targets = [flow.target() for _ in range(5)]
+    expected = [GroupedProducts("Temp", "t") for _ in targets]
+    variants = [make_products(int(rng.integers(1, 12))) for _ in range(6)]
+
+    for _ in range(30):
+        target = int(rng.choice(targets))
+        grouped, dense = variants[int(rng.integers(len(variants)))]
+        factors = rng.uniform(0, 100, int(rng.integers(1, 4))).tolist()
+        product = grouped
+        for factor in factors:
+            product = product * factor
+        if rng.random() < 0.3:
+            flow.sub(target, dense, *factors)
+            expected[target] -= product
+        else:
+            flow.add(target, dense, *factors)
+            expected[target] += product
+    flow.add(targets[0], None, 1.0)
+
+    for target, source in zip(targets[:merges], targets[-merges:] if merges else []):
+        flow.merge(target, source)
+        expected[target] += expected[source]
+
+    for dense, grouped in zip(flow.calculate(), expected):
+        assert list(dense.dictify().items()) == list(grouped.dictify().items())
@@ -0,0 +1,109 @@
+# --------------------------------------------------------------------------------------------------
+# test_energy_lca.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file compares the characterization of all energy stages at once with looking
+#              up every carrier in the energy table
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import pytest
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from pulse.support.calculations.life_cycle_assessment import characterize, energy_lca, KW_MJ
+from pulse.support.data_types import CharacterizationMatrix
+from pulse.support.variables import adapt_detail, Detail, Impact
+
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+INDICATORS = (Impact.GWP100, (Impact.GWP100, Impact.CTUE, Impact.WATER_USE))
+# The demands of every kind of energy and the heating carriers, which are their own keys
+DEMANDS = {
+    "electricity": ("B6.1", "B6.2"),
+    "heating": ("Oil", "Gas", "Pellets"),
+    "cooling": ("cooling",),
+    "water": ("water",),
+}
+
+
+# --------------------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------------------
+def make_energy(rng) -> dict:
+    """This function creates random energy demands (kind -> country -> typology -> demand). Some
+    typologies do not use every heating carrier."""
+    energy = {}
+    for kind, keys in DEMANDS.items():
+        energy[kind] = {}
+        for country in ("AT", "DE"):
+            energy[kind][country] = {}
+            for typology in ("T0", "T1", "T2"):
+                used = [key for key in keys if kind != "heating" or rng.random() > 0.3]
+                energy[kind][country][typology] = {key: float(rng.uniform(0, 1e4)) for key in used}
+    return energy
+
+
+def energy_lca_scalar(energy: dict, year: str, detail: Detail, impact, tables: dict) -> dict:
+    """This function is the lca of the energy stages before they got characterized at once, one
+    stage and one carrier after the other."""
+    B6 = tables["B6"][year]
+    stages = {
+        "B6.1": ("electricity", lambda data: {
+            "B6.1": characterize(B6["B6.1"], impact, data["B6.1"], KW_MJ)
+        }),
+        "B6.2 & B6.3": ("electricity", lambda data: {
+            "B6.2 & B6.3": characterize(B6["B6.2 & B6.3"], impact, data["B6.2"], KW_MJ)
+        }),
+        "B6 - Heat": ("heating", lambda data: {
+            key: characterize(B6[key], impact, demand, KW_MJ) for key, demand in data.items()
+        }),
+        "B6 - Cool": ("cooling", lambda data: {
+            "Cooling": characterize(B6["Final Space Cooling"], impact, data["cooling"], KW_MJ)
+        }),
+        "B7": ("water", lambda data: {
+            "Water User": characterize(B6["Water Use"], impact, data["water"])
+        }),
+    }
+    return_ = {}
+    for stage, (kind, lca) in stages.items():
+        result = {
+            country: {typology: lca(data) for typology, data in country_data.items()}
+            for country, country_data in energy[kind].items()
+        }
+        return_[stage] = adapt_detail(result, detail)
+    return return_
+
+
+# --------------------------------------------------------------------------------------------------
+# Tests
+# --------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("impact", INDICATORS)
+@pytest.mark.parametrize("detail", [Detail.PRODUCT, Detail.TYPOLOGY, Detail.COUNTRY])
+def test_energy_lca(rng, tables, assert_close, detail, impact):
+    """All energy stages give the same impacts as characterizing every carrier on its own."""
+    energy = make_energy(rng)
+    year = tables["B6"].years[0]
+    characterization = CharacterizationMatrix(tables, year)
+
+    result = energy_lca(energy, year, detail, impact, characterization)
+    assert_close(result, energy_lca_scalar(energy, year, detail, impact, tables))
+
+
+def test_energy_lca_missing_carrier(rng, tables):
+    """A carrier without data in the energy table raises a KeyError, like looking it up does."""
+    energy = make_energy(rng)
+    energy["heating"]["AT"]["T0"]["Coal"] = 1.0
+    year = tables["B6"].years[0]
+    characterization = CharacterizationMatrix(tables, year)
+
+    with pytest.raises(KeyError):
+        energy_lca(energy, year, Detail.PRODUCT, Impact.GWP100, characterization)
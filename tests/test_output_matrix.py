@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------------
+# test_output_matrix.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file compares changing the detail with the axis sums of the output matrix with
+#              the recursive reducers it replaces
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import pytest
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from pulse.support.data_types import adapt_output
+from pulse.support.variables import Detail, adapt_detail, remove_empty
+
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+DETAILS = [Detail.GROUPED, Detail.COUNTRY, Detail.TYPOLOGY, Detail.COMPONENT, Detail.PRODUCT]
+
+
+# --------------------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------------------
+def numbers(rng, vector: bool = False) -> dict:
+    """This function creates country -> typology -> number (or list of numbers) results, like the
+    number stages. The countries list their typologies in another order and some are 0."""
+    typologies = [f"T{nr}" for nr in range(12)]
+    output = {}
+    for country in ("AT", "DE", "IT"):
+        output[country] = {}
+        for typology in rng.permutation(typologies).tolist():
+            if vector:
+                output[country][typology] = rng.integers(0, 50, 4).tolist()
+            else:
+                output[country][typology] = int(rng.integers(0, 50)) * (rng.random() < 0.8)
+    return output
+
+
+def energy(rng) -> dict:
+    """This function creates country -> typology -> carrier -> demand results, like the energy
+    stages. Some typologies have no carriers at all."""
+    output = {}
+    for country in ("AT", "DE"):
+        output[country] = {}
+        for typology in ("T0", "T1", "T2", "T3"):
+            carriers = [carrier for carrier in ("Oil", "Gas", "Pellets") if rng.random() > 0.4]
+            output[country][typology] = {
+                carrier: float(rng.uniform(0, 1e6)) for carrier in carriers
+            }
+    return output
+
+
+# --------------------------------------------------------------------------------------------------
+# Tests
+# --------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("detail", DETAILS)
+@pytest.mark.parametrize("vector", [False, True])
+def test_adapt_numbers(rng, detail, vector):
+    """The numbers are reduced to the same integers, with the keys in the same order."""
+    data = numbers(rng, vector)
+    result = remove_empty(adapt_output(data, detail))
+    expected = remove_empty(adapt_detail(data, detail))
+    assert result == expected
+    assert repr(result) == repr(expected)
+
+
+@pytest.mark.parametrize("detail", DETAILS)
+def test_adapt_energy(rng, assert_close, detail):
+    """The demands are reduced to the same values, typologies without carriers become 0."""
+    for _ in range(5):
+        data = energy(rng)
+        assert_close(adapt_output(data, detail), adapt_detail(data, detail))
+
+
+def test_adapt_empty():
+    """Empty results stay 0 or keep their keys, like before."""
+    for data in ({}, {"AT": {}}, {"AT": {}, "DE": {"T0": 3}}, {"AT": {"T0": {}}}):
+        for detail in DETAILS:
+            assert repr(adapt_output(data, detail)) == repr(adapt_detail(data, detail))
+
+
+def test_remove_empty():
+    """Empty dictionaries, zeros and lists of zeros are removed at every level."""
+    data = {"AT": {"T0": 0, "T1": [0, 0], "T2": [0, 1], "T3": {"C": {}}}, "DE": {"T0": 0.0}}
+    assert remove_empty(data) == {"AT": {"T2": [0, 1]}}
@@ -0,0 +1,152 @@
+# --------------------------------------------------------------------------------------------------
+# test_recycling_matrix.py
+#
+# Author: Benedict Schwark 
+# Supervision: Nicolas Alaux
+# Other contributors: See README.md
+# License: See LICENSE.md
+#
+# Description: This file compares the recycling matrix with matching every product against the
+#              recycling factors
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------------------------
+# Imports Global Libraries
+# --------------------------------------------------------------------------------------------------
+import copy
+
+import pytest
+
+# --------------------------------------------------------------------------------------------------
+# Imports Local Libraries
+# --------------------------------------------------------------------------------------------------
+from pulse.support.calculations.recycling import total_vector
+from pulse.support.data_types import GroupedProducts, RecyclingMatrix
+from pulse.support.variables import adapt_detail, Detail
+
+# --------------------------------------------------------------------------------------------------
+# Global Variables
+# --------------------------------------------------------------------------------------------------
+# Recycled categories, subcategories and single products, like the recycling factors of the model
+FACTORS = {
+    'TA' : {
+        'TA_201': ('TA_216', 0),
+        'TA_204': ('TA_216', 0),
+        'TA_302': ('TA_317', 0),
+        'TA_299': ('TA_216', 0),
+    },
+    'TB_2' : {
+        'TB_201': ('TB_218', 0),
+        'TB_203': ('TB_218', 0),
+        'TB_206': ('TB_218', 0),
+    },
+    'TC_3' : {
+        'TC_301': ('TC_131', 0),
+    },
+    'TC_105' : {
+        'TC_105': (None, 0),
+    },
+    'TC_206' : {
+        'TC_206': (None, 0),
+    },
+}
+
+
+# --------------------------------------------------------------------------------------------------
+# Functions
+# --------------------------------------------------------------------------------------------------
+def leaves(stock: dict) -> list:
+    """This function returns the products of all components of a stock."""
+    return [
+        products
+        for countryData in stock.values()
+        for typoData in countryData.values()
+        for products in typoData.values()
+    ]
+
+
+def scaled(stock: dict, scale: float) -> dict:
+    """This function returns a stock with the products of all components multiplied by a scale."""
+    return {
+        country: {
+            typology: {component: products * scale for component, products in typoData.items()}
+            for typology, typoData in countryData.items()
+        }
+        for country, countryData in stock.items()
+    }
+
+
+def split_scalar(products: GroupedProducts, rate: float) -> tuple[GroupedProducts, GroupedProducts]:
+    """This function is the recycling of calcDemoRecycling before it used the recycling matrix."""
+    rec, out = GroupedProducts("Temp", "t"), GroupedProducts("Temp", "t")
+    for product, quantity in products.dictify().items():
+        if product[:2] in FACTORS or product[:4] in FACTORS or product in FACTORS:
+            rec += (product, quantity * rate)
+            out += (product, quantity * (1 - rate))
+        else:
+            out += (product, quantity)
+    return rec, out
+
+
+def substitute_scalar(construction: dict, demolition: dict) -> list[GroupedProducts]:
+    """This function is the substitution of calcConstructionRecycling before it used the
+    recycling matrix."""
+    con_prods = adapt_detail(copy.deepcopy(construction), Detail.GROUPED)
+    decon_prods = adapt_detail(copy.deepcopy(demolition), Detail.GROUPED)
+
+    reducers = {}
+    for recycledProd, goalProd in FACTORS.items():
+        currentConValue = 0
+        for prod in goalProd:
+            currentConValue += sum(con_prods.getProducts(prod).values())
+        currentDeconValue = sum(decon_prods.getProducts(recycledProd).values())
+        if currentConValue == 0:
+            reducers[recycledProd] = 0
+        else:
+            reducers[recycledProd] = min(currentDeconValue / currentConValue, 1)
+
+    output = []
+    for compData in leaves(construction):
+        products = GroupedProducts("Temp", "t")
+        for product, quantity in compData.dictify().items():
+            for recycledProd, goalProd in FACTORS.items():
+                if product in goalProd:
+                    products += (product, quantity * (1 - reducers[recycledProd]))
+                    products += (goalProd[product][0] or product, quantity * reducers[recycledProd])
+                    break
+            else:
+                products += (product, quantity)
+        output.append(products)
+    return output
+
+
+# --------------------------------------------------------------------------------------------------
+# Tests
+# --------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("rate", [0.0, 0.35, 1.0])
+def test_split(make_stock, assert_close, rate):
+    """The recycled and the remaining products of every component are the same as matching every
+    product against the recycling factors."""
+    grouped, dense = make_stock()
+    recycled, remaining = RecyclingMatrix(FACTORS).split(leaves(dense), rate)
+
+    for products, rec, out in zip(leaves(grouped), recycled, remaining):
+        rec_, out_ = split_scalar(products, rate)
+        assert_close(rec.dictify(), rec_.dictify())
+        assert_close(out.dictify(), out_.dictify())
+
+
+@pytest.mark.parametrize("scale", [0.05, 1.0, 20.0])
+def test_substitute(make_stock, assert_close, scale):
+    """The construction products are substituted with the same shares as matching every product
+    against the recycling factors, for demolitions that cover few, some or all of them."""
+    grouped, dense = make_stock(typologies=3)
+    demolition, demolition_ = (scaled(stock, scale) for stock in make_stock(countries=("AT",)))
+
+    matrix = RecyclingMatrix(FACTORS)
+    reducers = matrix.reducers(total_vector(dense), total_vector(demolition_))
+    assert ((reducers >= 0) & (reducers <= 1)).all()
+
+    expected = substitute_scalar(grouped, demolition)
+    for products, products_ in zip(matrix.substitute(leaves(dense), reducers), expected):
+        assert_close(products.dictify(), products_.dictify())